@@ -0,0 +1,358 @@
+"""Typed arrays for TAB values.
+
+A TypedArray keeps its elements in one contiguous buffer: a NumPy array
+when NumPy is installed, an array.array otherwise. IN elements are 64-bit
+integers, IR elements doubles and BINARY elements bytes, so large numeric
+arrays never hold one Python object per element. STR elements have no
+fixed size and stay in a list.
+
+Indices are bounds-checked and stored values must match the element type
+with the rules of declarations: an IN is an int, an IR an int or a float.
+
+Arithmetic (+ - * /) and comparisons between a TAB and a TAB of the same
+size or a scalar are elementwise and produce a new TAB. They run as one
+NumPy ufunc call, or as map() over the buffers feeding a new array.array,
+never as a loop of the interpreter. IN elements are 64-bit: a result that
+does not fit raises OverflowError with either backend, and sum returns
+the exact total. The reductions sum, min, max and len are Rexi builtins
+(REDUCTIONS).
+"""
+import array
+import operator
+from itertools import repeat
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Element type -> (array typecode, Python type of the elements, accepted values)
+ELEMENT_TYPES = {
+    'IN': ('q', int, int),
+    'IR': ('d', float, (int, float)),
+    'BINARY': ('b', bool, bool),
+    'STR': (None, str, str),
+}
+
+NUMPY_TYPES = {'q': 'int64', 'd': 'float64', 'b': 'bool'}
+
+# Elementwise operators: Python function and NumPy ufunc
+ARITHMETIC = {
+    '+': (operator.add, 'add'),
+    '-': (operator.sub, 'subtract'),
+    '*': (operator.mul, 'multiply'),
+    '/': (operator.truediv, 'true_divide'),
+}
+COMPARISONS = {
+    '>': (operator.gt, 'greater'),
+    '<': (operator.lt, 'less'),
+    '>=': (operator.ge, 'greater_equal'),
+    '<=': (operator.le, 'less_equal'),
+    '==': (operator.eq, 'equal'),
+    '!=': (operator.ne, 'not_equal'),
+}
+OPERATORS = {**ARITHMETIC, **COMPARISONS}
+
+
+def _element_type(element_type):
+    if element_type not in ELEMENT_TYPES:
+        raise TypeError(f"Unknown TAB element type {element_type}")
+    return ELEMENT_TYPES[element_type]
+
+
+def _scalar_type(value):
+    """Element type matching a scalar operand, or None"""
+    if isinstance(value, bool):
+        return 'BINARY'
+    if isinstance(value, int):
+        return 'IN'
+    if isinstance(value, float):
+        return 'IR'
+    if isinstance(value, str):
+        return 'STR'
+    return None
+
+
+def result_type(symbol, left, right):
+    """Element type of an elementwise operation between element types"""
+    if symbol in COMPARISONS:
+        if (left == 'STR') != (right == 'STR'):
+            raise TypeError(f"Cannot compare {left} and {right} elements")
+        return 'BINARY'
+    if left not in ('IN', 'IR') or right not in ('IN', 'IR'):
+        raise TypeError(f"Unsupported element types for {symbol}: {left} and {right}")
+    if symbol == '/' or 'IR' in (left, right):
+        return 'IR'
+    return 'IN'
+
+
+# Bounds of a TAB<IN> element
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+def _int64_overflows(ufunc, left, right, result):
+    """Whether an int64 NumPy add, subtract or multiply wrapped around"""
+    if ufunc == 'add':
+        # Operands of the same sign, result of the other
+        return bool(numpy.any((left ^ result) & (right ^ result) < 0))
+    if ufunc == 'subtract':
+        return bool(numpy.any((left ^ right) & (left ^ result) < 0))
+    # Products near 2 ** 63 in floating point are checked exactly
+    approximate = numpy.multiply(numpy.asarray(left, dtype='float64'),
+                                 numpy.asarray(right, dtype='float64'))
+    suspects = numpy.flatnonzero(numpy.abs(approximate) >= 2.0 ** 62)
+    if not len(suspects):
+        return False
+    lefts = numpy.broadcast_to(left, result.shape)[suspects].tolist()
+    rights = numpy.broadcast_to(right, result.shape)[suspects].tolist()
+    return any(not INT64_MIN <= a * b <= INT64_MAX for a, b in zip(lefts, rights))
+
+
+def _buffer(typecode, values):
+    """Contiguous buffer of a typecode filled from an iterable"""
+    if typecode is None:
+        return list(values)
+    if numpy is not None:
+        return numpy.fromiter(values, dtype=NUMPY_TYPES[typecode])
+    return array.array(typecode, values)
+
+
+class TypedArray:
+    """Fixed-size array of IN, IR, BINARY or STR values"""
+    __slots__ = ('element_type', 'data', 'convert', 'accepted')
+
+    # Mutable: never a dictionary key (memoization skips calls on arrays)
+    __hash__ = None
+
+    def __init__(self, element_type, data):
+        _, self.convert, self.accepted = _element_type(element_type)
+        self.element_type = element_type
+        self.data = data
+
+    @classmethod
+    def zeros(cls, element_type, size):
+        """Array of size default values (0, 0.0, NO or "")"""
+        typecode = _element_type(element_type)[0]
+        if not isinstance(size, int) or isinstance(size, bool) or size < 0:
+            raise ValueError(f"Invalid TAB size {size!r}")
+        if typecode is None:
+            return cls(element_type, [''] * size)
+        if numpy is not None:
+            return cls(element_type, numpy.zeros(size, dtype=NUMPY_TYPES[typecode]))
+        return cls(element_type, array.array(typecode, [0]) * size)
+
+    @classmethod
+    def from_values(cls, element_type, values):
+        """Array holding values, each checked against the element type"""
+        typecode, _, accepted = _element_type(element_type)
+        if isinstance(values, TypedArray):
+            if values.element_type == element_type:
+                return values
+            # Only IN -> IR widens without checking each element
+            if not (element_type == 'IR' and values.element_type == 'IN'):
+                raise TypeError(f"TAB<{values.element_type}> is not a TAB<{element_type}>")
+            if numpy is not None:
+                return cls(element_type, values.data.astype(NUMPY_TYPES[typecode]))
+            return cls(element_type, array.array(typecode, values.data))
+        def checked():
+            # Checked while the buffer is filled: no intermediate list
+            for value in values:
+                if not isinstance(value, accepted):
+                    raise TypeError(f"TAB<{element_type}> elements must be of type {element_type}")
+                yield value
+        try:
+            return cls(element_type, _buffer(typecode, checked()))
+        except OverflowError:
+            raise OverflowError(f"Value too large for a TAB<{element_type}> element") from None
+
+    @classmethod
+    def from_literal(cls, values):
+        """Array of a literal [a, b, ...], its element type inferred from the values"""
+        if all(isinstance(value, bool) for value in values) and values:
+            return cls.from_values('BINARY', values)
+        if all(isinstance(value, str) for value in values) and values:
+            return cls.from_values('STR', values)
+        if all(isinstance(value, int) and not isinstance(value, bool) for value in values):
+            return cls.from_values('IN', values)
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+            return cls.from_values('IR', values)
+        raise TypeError("TAB elements must all have the same type")
+
+    def check_index(self, index):
+        if not isinstance(index, int) or isinstance(index, bool):
+            raise TypeError(f"TAB index must be of type IN, got {index!r}")
+        if not 0 <= index < len(self.data):
+            raise IndexError(f"TAB index {index} out of range (size {len(self.data)})")
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        self.check_index(index)
+        return self.convert(self.data[index])
+
+    def __setitem__(self, index, value):
+        self.check_index(index)
+        if not isinstance(value, self.accepted):
+            raise TypeError(f"TAB<{self.element_type}> elements must be of type {self.element_type}")
+        try:
+            self.data[index] = value
+        except OverflowError:
+            raise OverflowError(f"Value too large for a TAB<{self.element_type}> element") from None
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def tolist(self):
+        """Elements as Python values"""
+        values = self.data.tolist() if not isinstance(self.data, list) else list(self.data)
+        if self.element_type == 'BINARY' and numpy is None:
+            return [bool(value) for value in values]
+        return values
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    __str__ = __repr__
+
+    def __bool__(self):
+        raise TypeError("The truth value of a TAB is ambiguous, reduce it with min or max")
+
+    # --- Elementwise operations --- #
+
+    def elementwise(self, symbol, other, reflected=False):
+        """New array of self <symbol> other, other a TAB or a scalar"""
+        function, ufunc = OPERATORS[symbol]
+        if isinstance(other, TypedArray):
+            if len(other.data) != len(self.data):
+                raise ValueError(f"TAB sizes differ ({len(self.data)} and {len(other.data)})")
+            other_type, operand = other.element_type, other.data
+        else:
+            other_type, operand = _scalar_type(other), other
+            if other_type is None:
+                return NotImplemented
+        if reflected:
+            element_type = result_type(symbol, other_type, self.element_type)
+        else:
+            element_type = result_type(symbol, self.element_type, other_type)
+        typecode = ELEMENT_TYPES[element_type][0]
+
+        if numpy is not None and 'STR' not in (self.element_type, other_type):
+            left, right = (operand, self.data) if reflected else (self.data, operand)
+            # As for Python floats: only a zero divisor is an error, inf - inf is nan
+            if symbol == '/' and numpy.any(numpy.equal(right, 0)):
+                raise ZeroDivisionError("division by zero")
+            try:
+                with numpy.errstate(all='ignore'):
+                    data = getattr(numpy, ufunc)(left, right)
+            except OverflowError:
+                # A scalar operand beyond 64 bits
+                raise OverflowError(f"Value too large for a TAB<{element_type}> element") from None
+            if element_type == 'IN' and _int64_overflows(ufunc, left, right, data):
+                raise OverflowError(f"Value too large for a TAB<{element_type}> element")
+            return TypedArray(element_type, data.astype(NUMPY_TYPES[typecode], copy=False))
+
+        if not isinstance(other, TypedArray):
+            operand = repeat(operand)
+        left, right = (operand, self.data) if reflected else (self.data, operand)
+        try:
+            return TypedArray(element_type, _buffer(typecode, map(function, left, right)))
+        except OverflowError:
+            raise OverflowError(f"Value too large for a TAB<{element_type}> element") from None
+
+    def __add__(self, other):
+        return self.elementwise('+', other)
+
+    def __radd__(self, other):
+        return self.elementwise('+', other, reflected=True)
+
+    def __sub__(self, other):
+        return self.elementwise('-', other)
+
+    def __rsub__(self, other):
+        return self.elementwise('-', other, reflected=True)
+
+    def __mul__(self, other):
+        return self.elementwise('*', other)
+
+    def __rmul__(self, other):
+        return self.elementwise('*', other, reflected=True)
+
+    def __truediv__(self, other):
+        return self.elementwise('/', other)
+
+    def __rtruediv__(self, other):
+        return self.elementwise('/', other, reflected=True)
+
+    # A scalar on the left is handled by the reflected comparison (3 < t is t > 3)
+    def __gt__(self, other):
+        return self.elementwise('>', other)
+
+    def __lt__(self, other):
+        return self.elementwise('<', other)
+
+    def __ge__(self, other):
+        return self.elementwise('>=', other)
+
+    def __le__(self, other):
+        return self.elementwise('<=', other)
+
+    def __eq__(self, other):
+        return self.elementwise('==', other)
+
+    def __ne__(self, other):
+        return self.elementwise('!=', other)
+
+
+# --- Reductions --- #
+
+def _numeric(name, values):
+    if not isinstance(values, TypedArray) or values.element_type == 'STR':
+        raise TypeError(f"{name} expects a numeric TAB")
+    return values
+
+
+def tab_sum(values):
+    """Sum of the elements (the number of YES of a TAB<BINARY>)"""
+    values = _numeric('sum', values)
+    data = values.data
+    if numpy is None:
+        total = sum(data)
+    elif values.element_type == 'IN' and len(data) and \
+            max(-int(data.min()), int(data.max())) * len(data) > INT64_MAX:
+        # The int64 sum could wrap: exact sum of Python ints, as without NumPy
+        total = sum(data.tolist())
+    else:
+        total = data.sum()
+    return float(total) if values.element_type == 'IR' else int(total)
+
+
+def tab_min(values):
+    values = _numeric('min', values)
+    if not len(values.data):
+        raise ValueError("min of an empty TAB")
+    return values.convert(values.data.min() if numpy is not None else min(values.data))
+
+
+def tab_max(values):
+    values = _numeric('max', values)
+    if not len(values.data):
+        raise ValueError("max of an empty TAB")
+    return values.convert(values.data.max() if numpy is not None else max(values.data))
+
+
+def tab_len(values):
+    """Number of elements of a TAB, or of characters of a STR"""
+    if not isinstance(values, (TypedArray, str)):
+        raise TypeError("len expects a TAB or a STR")
+    return len(values)
+
+
+# Builtin functions of Rexi programs; a user function of the same name wins
+REDUCTIONS = {
+    'sum': tab_sum,
+    'min': tab_min,
+    'max': tab_max,
+    'len': tab_len,
+}
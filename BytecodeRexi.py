@@ -0,0 +1,315 @@
+"""Binary .rexic format for the three-address code of CompilerRexi.
+
+A .rexic file holds compiled code that can be loaded without lexing,
+parsing or code generation:
+
+    header        magic b'REXC', format version, section counts
+    constants     values of LOAD_CONST (int, float, str, bool, None)
+    names         variables, temporaries and functions
+    lists         argument and parameter lists, as name indices
+    labels        label name (as a name index) and offset of its LABEL
+    instructions  fixed-size records: one opcode byte, then for each of
+                  arg1, arg2 and result a tag byte and a 32-bit index
+
+Instructions have a fixed size, so Reader decodes them on demand from a
+memory map and only the pools are read when the file is opened.
+"""
+import mmap
+import os
+import struct
+import sys
+
+import CompilerRexi
+
+MAGIC = b'REXC'
+FORMAT_VERSION = 1
+
+# Opcode byte of each instruction; new opcodes are only ever appended
+OPCODES = [
+    'LOAD_CONST', 'LOAD', 'ASSIGN', 'DECLARE', 'LABEL', 'JUMP', 'JUMPIF',
+    'CALL', 'RETURN', 'OUTPUT', 'ARRAY_ACCESS', 'FUNCTION', 'END_FUNCTION',
+    '+', '-', '*', '/', '>', '<', '>=', '<=', '==', '!=',
+    'NEW_ARRAY', 'ARRAY_STORE',
+    'ADD_INT', 'ADD_FLOAT', 'SUB_INT', 'SUB_FLOAT', 'MUL_INT', 'MUL_FLOAT',
+    'DIV_INT', 'DIV_FLOAT', 'LT_INT', 'LT_FLOAT', 'GT_INT', 'GT_FLOAT',
+    'LE_INT', 'LE_FLOAT', 'GE_INT', 'GE_FLOAT', 'EQ_INT', 'EQ_FLOAT',
+    'NE_INT', 'NE_FLOAT',
+]
+OPCODE_NUMBERS = {op: number for number, op in enumerate(OPCODES)}
+
+# Operand tags
+OPERAND_NONE = 0
+OPERAND_CONST = 1
+OPERAND_NAME = 2
+OPERAND_LIST = 3
+OPERAND_LABEL = 4
+
+# Constant tags
+CONST_NONE = 0
+CONST_FALSE = 1
+CONST_TRUE = 2
+CONST_INT = 3
+CONST_BIGINT = 4
+CONST_FLOAT = 5
+CONST_STR = 6
+
+HEADER = struct.Struct('<4sHHIIIII')
+INSTRUCTION = struct.Struct('<BBIBIBI')
+U32 = struct.Struct('<I')
+I64 = struct.Struct('<q')
+F64 = struct.Struct('<d')
+LABEL_ENTRY = struct.Struct('<II')
+
+# Operands that name a label rather than a variable
+LABEL_OPERANDS = {('LABEL', 1), ('JUMP', 1), ('JUMPIF', 2)}
+
+
+class Writer:
+    """Encodes a list of instructions into the .rexic format"""
+
+    def __init__(self):
+        self.constants = []
+        self.constant_index = {}
+        self.names = []
+        self.name_index = {}
+        self.lists = []
+        self.labels = {}
+        self.label_offsets = {}
+        self.instructions = []
+
+    def add_constant(self, value):
+        # True == 1 == 1.0, so the key must include the type
+        key = (type(value), value)
+        index = self.constant_index.get(key)
+        if index is None:
+            index = self.constant_index[key] = len(self.constants)
+            self.constants.append(value)
+        return index
+
+    def add_name(self, name):
+        index = self.name_index.get(name)
+        if index is None:
+            index = self.name_index[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def add_label(self, label):
+        index = self.labels.get(label)
+        if index is None:
+            index = self.labels[label] = len(self.labels)
+            self.add_name(label)
+        return index
+
+    def operand(self, op, field, value):
+        if value is None:
+            return OPERAND_NONE, 0
+        if (op, field) in LABEL_OPERANDS:
+            return OPERAND_LABEL, self.add_label(value)
+        if op == 'LOAD_CONST' and field == 1:
+            return OPERAND_CONST, self.add_constant(value)
+        if isinstance(value, (list, tuple)):
+            self.lists.append([self.add_name(name) for name in value])
+            return OPERAND_LIST, len(self.lists) - 1
+        if isinstance(value, str):
+            return OPERAND_NAME, self.add_name(value)
+        return OPERAND_CONST, self.add_constant(value)
+
+    def add(self, instruction):
+        op = instruction[0]
+        if op not in OPCODE_NUMBERS:
+            raise Exception(f"Unknown instruction {op}")
+        if op == 'LABEL':
+            self.label_offsets[self.add_label(instruction[1])] = len(self.instructions)
+        record = [OPCODE_NUMBERS[op]]
+        for field in (1, 2, 3):
+            record.extend(self.operand(op, field, instruction[field]))
+        self.instructions.append(INSTRUCTION.pack(*record))
+
+    def encode_constant(self, value):
+        if value is None:
+            return bytes([CONST_NONE])
+        if value is True or value is False:
+            return bytes([CONST_TRUE if value else CONST_FALSE])
+        if isinstance(value, int):
+            if -2 ** 63 <= value < 2 ** 63:
+                return bytes([CONST_INT]) + I64.pack(value)
+            return bytes([CONST_BIGINT]) + self.encode_string(str(value))
+        if isinstance(value, float):
+            return bytes([CONST_FLOAT]) + F64.pack(value)
+        if isinstance(value, str):
+            return bytes([CONST_STR]) + self.encode_string(value)
+        raise Exception(f"Cannot serialize constant {value!r}")
+
+    def encode_string(self, value):
+        data = value.encode('utf-8')
+        return U32.pack(len(data)) + data
+
+    def to_bytes(self, code):
+        for instruction in code:
+            self.add(instruction)
+        parts = [HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(self.constants), len(self.names),
+                             len(self.lists), len(self.labels), len(self.instructions))]
+        parts.extend(self.encode_constant(value) for value in self.constants)
+        parts.extend(self.encode_string(name) for name in self.names)
+        for indices in self.lists:
+            parts.append(U32.pack(len(indices)) + struct.pack(f'<{len(indices)}I', *indices))
+        for label, index in self.labels.items():
+            # Jumps to a missing label stay detectable by the loader
+            parts.append(LABEL_ENTRY.pack(self.name_index[label], self.label_offsets.get(index, 0xFFFFFFFF)))
+        parts.extend(self.instructions)
+        return b''.join(parts)
+
+
+def dumps(code):
+    """Encode a list of instructions into .rexic bytes"""
+    return Writer().to_bytes(code)
+
+
+def write(code, path):
+    """Write a list of instructions to a .rexic file"""
+    data = dumps(code)
+    with open(path, 'wb') as file:
+        file.write(data)
+    return len(data)
+
+
+class Reader:
+    """Decodes .rexic data; instructions are decoded on access"""
+
+    def __init__(self, data):
+        self.data = data
+        magic, version, _, constants, names, lists, labels, count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise Exception("Not a compiled Rexi file")
+        if version != FORMAT_VERSION:
+            raise Exception(f"Unsupported .rexic format version {version}")
+        self.offset = HEADER.size
+        self.constants = [self.read_constant() for _ in range(constants)]
+        self.names = [self.read_string() for _ in range(names)]
+        self.lists = [self.read_list() for _ in range(lists)]
+        self.labels = []
+        self.label_offsets = {}
+        for _ in range(labels):
+            name, position = LABEL_ENTRY.unpack_from(data, self.offset)
+            self.offset += LABEL_ENTRY.size
+            self.labels.append(self.names[name])
+            if position != 0xFFFFFFFF:
+                self.label_offsets[self.names[name]] = position
+        self.start = self.offset
+        self.count = count
+        if len(data) < self.start + count * INSTRUCTION.size:
+            raise Exception("Truncated compiled Rexi file")
+
+    def read_string(self):
+        length, = U32.unpack_from(self.data, self.offset)
+        start = self.offset + U32.size
+        self.offset = start + length
+        return bytes(self.data[start:self.offset]).decode('utf-8')
+
+    def read_list(self):
+        length, = U32.unpack_from(self.data, self.offset)
+        indices = struct.unpack_from(f'<{length}I', self.data, self.offset + U32.size)
+        self.offset += U32.size * (length + 1)
+        return indices
+
+    def read_constant(self):
+        tag = self.data[self.offset]
+        self.offset += 1
+        if tag == CONST_NONE:
+            return None
+        if tag in (CONST_TRUE, CONST_FALSE):
+            return tag == CONST_TRUE
+        if tag == CONST_INT:
+            value, = I64.unpack_from(self.data, self.offset)
+            self.offset += I64.size
+            return value
+        if tag == CONST_FLOAT:
+            value, = F64.unpack_from(self.data, self.offset)
+            self.offset += F64.size
+            return value
+        if tag == CONST_BIGINT:
+            return int(self.read_string())
+        if tag == CONST_STR:
+            return self.read_string()
+        raise Exception(f"Unknown constant tag {tag}")
+
+    def operand(self, tag, index):
+        if tag == OPERAND_NONE:
+            return None
+        if tag == OPERAND_NAME:
+            return self.names[index]
+        if tag == OPERAND_CONST:
+            return self.constants[index]
+        if tag == OPERAND_LABEL:
+            return self.labels[index]
+        return [self.names[name] for name in self.lists[index]]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, position):
+        if not 0 <= position < self.count:
+            raise IndexError(position)
+        op, tag1, index1, tag2, index2, tag3, index3 = INSTRUCTION.unpack_from(
+            self.data, self.start + position * INSTRUCTION.size)
+        return (OPCODES[op], self.operand(tag1, index1), self.operand(tag2, index2),
+                self.operand(tag3, index3))
+
+    def __iter__(self):
+        operand = self.operand
+        for op, tag1, index1, tag2, index2, tag3, index3 in INSTRUCTION.iter_unpack(
+                self.data[self.start:self.start + self.count * INSTRUCTION.size]):
+            yield (OPCODES[op], operand(tag1, index1), operand(tag2, index2), operand(tag3, index3))
+
+    def instructions(self):
+        return list(self)
+
+
+class FileReader(Reader):
+    """Reader over a memory-mapped .rexic file"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            super().__init__(self.map)
+        except Exception:
+            self.map.close()
+            raise
+
+    def close(self):
+        self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def loads(data):
+    """Decode .rexic bytes into a list of instructions"""
+    return Reader(data).instructions()
+
+
+def read(path):
+    """Read a .rexic file into a list of instructions"""
+    with FileReader(path) as reader:
+        return reader.instructions()
+
+
+def precompile(source_path, output_path=None, passes=()):
+    """Compile a .rexi script to a .rexic file next to it"""
+    if output_path is None:
+        output_path = os.path.splitext(source_path)[0] + '.rexic'
+    with open(source_path, encoding='utf-8') as file:
+        code = CompilerRexi.compile_code(file.read(), passes)
+    if isinstance(code, str):
+        raise Exception(code)
+    write(code, output_path)
+    return output_path
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        print(precompile(path))
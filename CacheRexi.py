@@ -0,0 +1,201 @@
+"""Persistent compilation cache, in the spirit of __pycache__.
+
+Compiled code is stored in the .rexic format under a cache directory, in
+a file named after a hash of the source text, the compiler version, the
+compilation passes and the typed flag. A later compilation of the same source loads that
+file instead of lexing, parsing and generating code again.
+
+Entries are written to a temporary file and renamed, so a concurrent
+reader never sees a partial entry. The directory is bounded in size: the
+least recently used entries (by modification time, refreshed on every
+hit) are evicted first.
+
+A pass is identified by its module and qualified name when it is a
+function, and by its cache_key attribute when it is a pass object such as
+OptimizerRexi.Optimizer, which includes its settings. Code compiled with
+a pass that has neither (a lambda, an object without cache_key) is not
+cached: it could not be told apart from the code of another pass.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+
+import BytecodeRexi
+import CompilerRexi
+
+DEFAULT_DIRECTORY = os.environ.get(
+    'REXI_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'rexi'))
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+SUFFIX = '.rexic'
+
+
+def pass_name(compiler_pass):
+    """Identify a compilation pass for the cache key, or None if it cannot be"""
+    key = getattr(compiler_pass, 'cache_key', None)
+    if key is not None:
+        return key
+    name = getattr(compiler_pass, '__qualname__', None)
+    module = getattr(compiler_pass, '__module__', None)
+    # An instance without cache_key, or a lambda or nested function
+    if name is None or module is None or '<' in name:
+        return None
+    return f"{module}.{name}"
+
+
+def pass_names(passes):
+    """Identify compilation passes for the cache key, or None if one cannot be"""
+    names = [pass_name(compiler_pass) for compiler_pass in passes]
+    if None in names:
+        return None
+    return ','.join(names)
+
+
+class CompilationCache:
+    """On-disk cache of compiled code keyed by source hash"""
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+        self.lock = threading.Lock()
+
+    def key(self, source_code, passes=(), typed=False):
+        """Hash of an entry, or None when the passes cannot be identified"""
+        names = pass_names(passes)
+        if names is None:
+            return None
+        digest = hashlib.sha256()
+        for part in (CompilerRexi.COMPILER_VERSION, str(BytecodeRexi.FORMAT_VERSION),
+                     names, 'typed' if typed else 'generic', source_code):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def get(self, source_code, passes=(), typed=False):
+        """Cached code for a source, or None"""
+        key = self.key(source_code, passes, typed)
+        if key is None:
+            return None
+        path = self.path(key)
+        try:
+            code = BytecodeRexi.read(path)
+        except FileNotFoundError:
+            code = None
+        except Exception:
+            # Corrupted or from another format version: recompile
+            self.remove(path)
+            code = None
+        with self.lock:
+            self.stats['hits' if code is not None else 'misses'] += 1
+        if code is not None:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return code
+
+    def put(self, source_code, code, passes=(), typed=False):
+        key = self.key(source_code, passes, typed)
+        if key is None:
+            return
+        data = BytecodeRexi.dumps(code)
+        os.makedirs(self.directory, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, self.path(key))
+        except BaseException:
+            self.remove(temp_path)
+            raise
+        with self.lock:
+            self.stats['writes'] += 1
+        self.evict()
+
+    def compile(self, source_code, passes=(), typed=False):
+        """compile_code() through the cache"""
+        code = self.get(source_code, passes, typed)
+        if code is None:
+            code = CompilerRexi.compile_code(source_code, passes, typed)
+            # Compilation errors are not cached
+            if not isinstance(code, str):
+                try:
+                    self.put(source_code, code, passes, typed)
+                except OSError:
+                    # A read-only or full disk only costs the cache
+                    pass
+        return code
+
+    def entries(self):
+        """(modification time, size, path) of every cache entry"""
+        entries = []
+        try:
+            scan = os.scandir(self.directory)
+        except FileNotFoundError:
+            return entries
+        with scan:
+            for entry in scan:
+                if entry.name.endswith(SUFFIX):
+                    try:
+                        info = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((info.st_mtime, info.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self.remove(path)
+            total -= size
+            with self.lock:
+                self.stats['evictions'] += 1
+
+    def clear(self):
+        for _, _, path in self.entries():
+            self.remove(path)
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def report(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        ratio = 100.0 * self.stats['hits'] / lookups if lookups else 0.0
+        return (f"{self.stats['hits']} hits, {self.stats['misses']} misses ({ratio:.0f}% hit rate), "
+                f"{self.stats['evictions']} evictions")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Process-wide compilation cache in the default directory"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CompilationCache()
+    return _cache
+
+
+def compile_cached(source_code, passes=(), typed=False):
+    """compile_code() through the process-wide cache"""
+    return get_cache().compile(source_code, passes, typed)
@@ -0,0 +1,374 @@
+"""Compilation de l'arbre syntaxique de InterpreterRexi en fermetures Python.
+
+L'arbre est traduit une seule fois en fermetures imbriquées : chaque
+variable reçoit un indice dans un tableau (frame), les constantes sont
+intégrées directement dans les fermetures et les opérations dont les deux
+opérandes sont constants sont calculées à la compilation. L'exécution ne
+passe plus par le dispatch des visiteurs de Interpreter.
+
+Les tableaux TAB et les réductions prédéfinies (sum, min, max, len) sont
+compilés. Un programme qui déclare des fonctions, ou contient un autre
+nœud sans traduction, est exécuté par Interpreter : le résultat est
+toujours celui de execute_rexi.
+"""
+import InterpreterRexi
+from ArrayRexi import REDUCTIONS, TypedArray
+
+# Valeur d'une variable pas encore déclarée
+_UNSET = object()
+
+# Vérifications de type des déclarations, identiques à visit_Declaration
+TYPE_CHECKS = {
+    'IN': int,
+    'IR': (int, float),
+    'STR': str,
+    'BINARY': bool,
+}
+
+_CONSTANT_NODES = (InterpreterRexi.Num, InterpreterRexi.String, InterpreterRexi.Boolean)
+
+
+class Unsupported(Exception):
+    """Nœud sans traduction en fermeture : le programme passe par Interpreter"""
+
+
+class CompiledProgram:
+    """Programme compilé, exécutable autant de fois que nécessaire"""
+
+    def __init__(self, body, names):
+        self.body = body
+        self.names = names
+
+    def run(self, output=None):
+        """Exécute le programme et retourne les sorties et les variables"""
+        frame = [_UNSET] * len(self.names)
+        if output is None:
+            output = []
+        self.body(frame, output)
+        return {
+            'output': output,
+            'variables': {
+                name: value for name, value in zip(self.names, frame) if value is not _UNSET
+            },
+        }
+
+
+class InterpretedProgram:
+    """Programme exécuté par Interpreter, avec la même interface que CompiledProgram"""
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    def run(self, output=None):
+        interpreter = InterpreterRexi.Interpreter(output=output)
+        interpreter.interpret(self.tree)
+        return {
+            'output': interpreter.output_buffer,
+            'variables': interpreter.variables,
+        }
+
+
+class ClosureCompiler:
+    def __init__(self):
+        self.slots = {}
+        # Variables déclarées sur tous les chemins menant au point courant
+        self.declared = set()
+
+    def slot(self, name):
+        """Indice de la variable dans le frame"""
+        index = self.slots.get(name)
+        if index is None:
+            index = self.slots[name] = len(self.slots)
+        return index
+
+    def compile(self, tree):
+        """Compile l'arbre complet en un CompiledProgram"""
+        body = self.compile_statement(tree)
+        names = [None] * len(self.slots)
+        for name, index in self.slots.items():
+            names[index] = name
+        return CompiledProgram(body, names)
+
+    def compile_statement(self, node):
+        method = getattr(self, f'statement_{type(node).__name__}', None)
+        if method is None:
+            # Expression utilisée comme instruction
+            expression = self.compile_expression(node)
+            return lambda frame, output: expression(frame)
+        return method(node)
+
+    def compile_expression(self, node):
+        if isinstance(node, _CONSTANT_NODES):
+            value = node.value
+            return lambda frame: value
+        method = getattr(self, f'expression_{type(node).__name__}', None)
+        if method is None:
+            raise Unsupported(f'Pas de méthode visit_{type(node).__name__}')
+        return method(node)
+
+    # --- Instructions --- #
+
+    def statement_Block(self, node):
+        statements = tuple(self.compile_statement(statement) for statement in node.statements)
+        if len(statements) == 1:
+            return statements[0]
+
+        def block(frame, output):
+            for statement in statements:
+                statement(frame, output)
+        return block
+
+    def statement_Declaration(self, node):
+        name = node.var_node.value
+        value = self.compile_expression(node.value_node)
+        index = self.slot(name)
+        self.declared.add(name)
+        type_name = node.type_node.value
+        message = f"La variable {name} doit être de type {type_name}"
+        if type_name.startswith('TAB'):
+            def array_declaration(frame, output):
+                # Comme visit_Declaration : un TAB<IN> devient un TAB<IR> si besoin
+                result = InterpreterRexi.conform_array(type_name, value(frame))
+                if result is None:
+                    raise TypeError(message)
+                frame[index] = result
+            return array_declaration
+
+        expected = TYPE_CHECKS.get(type_name)
+        if expected is None:
+            def declaration(frame, output):
+                frame[index] = value(frame)
+            return declaration
+
+        def checked_declaration(frame, output):
+            result = value(frame)
+            if not isinstance(result, expected):
+                raise TypeError(message)
+            frame[index] = result
+        return checked_declaration
+
+    def statement_ArrayDeclaration(self, node):
+        element_type = node.element_type
+        size = self.compile_expression(node.size_node)
+        index = self.slot(node.var_node.value)
+        self.declared.add(node.var_node.value)
+
+        def array_declaration(frame, output):
+            frame[index] = TypedArray.zeros(element_type, size(frame))
+        return array_declaration
+
+    def statement_ArrayAssign(self, node):
+        array = self.compile_expression(node.target.array)
+        index = self.compile_expression(node.target.index)
+        value = self.compile_expression(node.right)
+
+        def array_assign(frame, output):
+            # Type de l'élément vérifié par TypedArray.__setitem__
+            target = array(frame)
+            position = index(frame)
+            target[position] = value(frame)
+        return array_assign
+
+    def statement_Assign(self, node):
+        name = node.left.value
+        value = self.compile_expression(node.right)
+        index = self.slot(name)
+        reassigned_array = InterpreterRexi.reassigned_array
+        if name in self.declared:
+            def assign(frame, output):
+                current = frame[index]
+                if type(current) is TypedArray:
+                    # Un TAB garde son type déclaré, comme dans Interpreter
+                    frame[index] = reassigned_array(name, current, value(frame))
+                else:
+                    frame[index] = value(frame)
+            return assign
+
+        message = f'Variable {name} non déclarée'
+
+        def checked_assign(frame, output):
+            current = frame[index]
+            if current is _UNSET:
+                raise NameError(message)
+            if type(current) is TypedArray:
+                frame[index] = reassigned_array(name, current, value(frame))
+            else:
+                frame[index] = value(frame)
+        return checked_assign
+
+    def statement_IfStatement(self, node):
+        condition = self.compile_expression(node.condition)
+        before = self.declared
+        self.declared = set(before)
+        if_block = self.compile_statement(node.if_block)
+        after_if = self.declared
+        if node.else_block:
+            self.declared = set(before)
+            else_block = self.compile_statement(node.else_block)
+            # Seules les déclarations faites dans les deux branches sont sûres
+            self.declared = after_if & self.declared
+
+            def if_else(frame, output):
+                if condition(frame):
+                    if_block(frame, output)
+                else:
+                    else_block(frame, output)
+            return if_else
+
+        self.declared = before
+
+        def if_only(frame, output):
+            if condition(frame):
+                if_block(frame, output)
+        return if_only
+
+    def statement_WhileLoop(self, node):
+        condition = self.compile_expression(node.condition)
+        before = self.declared
+        self.declared = set(before)
+        body = self.compile_statement(node.body)
+        # Le corps peut ne jamais s'exécuter : ses déclarations ne sont pas sûres
+        self.declared = before
+
+        def while_loop(frame, output):
+            while condition(frame):
+                body(frame, output)
+        return while_loop
+
+    def statement_ForLoop(self, node):
+        init = self.compile_statement(node.init)
+        condition = self.compile_expression(node.condition)
+        before = self.declared
+        self.declared = set(before)
+        body = self.compile_statement(node.body)
+        update = self.compile_statement(node.update)
+        self.declared = before
+
+        def for_loop(frame, output):
+            init(frame, output)
+            while condition(frame):
+                body(frame, output)
+                update(frame, output)
+        return for_loop
+
+    def statement_OutputStatement(self, node):
+        expression = self.compile_expression(node.expression)
+
+        def output_statement(frame, output):
+            output.append(str(expression(frame)))
+        return output_statement
+
+    # --- Expressions --- #
+
+    def expression_Variable(self, node):
+        index = self.slot(node.value)
+        if node.value in self.declared:
+            return lambda frame: frame[index]
+
+        message = f'Variable {node.value} non définie'
+
+        def checked_variable(frame):
+            value = frame[index]
+            if value is _UNSET:
+                raise NameError(message)
+            return value
+        return checked_variable
+
+    def expression_ArrayLiteral(self, node):
+        elements = tuple(self.compile_expression(element) for element in node.elements)
+        element_type = node.element_type
+        if element_type is not None:
+            return lambda frame: TypedArray.from_values(
+                element_type, [element(frame) for element in elements])
+        return lambda frame: TypedArray.from_literal([element(frame) for element in elements])
+
+    def expression_ArrayAccess(self, node):
+        array = self.compile_expression(node.array)
+        index = self.compile_expression(node.index)
+
+        def array_access(frame):
+            target = array(frame)
+            return target[index(frame)]
+        return array_access
+
+    def expression_FunctionCall(self, node):
+        # Seules les réductions prédéfinies ; une fonction Rexi (déclarée
+        # dans le programme) fait passer le programme par Interpreter
+        reduction = REDUCTIONS.get(node.name)
+        if reduction is None:
+            raise Unsupported(f'Fonction {node.name} non compilée')
+        if len(node.args) != 1:
+            message = f'La fonction {node.name} attend 1 argument, {len(node.args)} donnés'
+
+            def wrong_call(frame):
+                raise TypeError(message)
+            return wrong_call
+        argument = self.compile_expression(node.args[0])
+        return lambda frame: reduction(argument(frame))
+
+    def expression_BinOp(self, node):
+        apply = node.apply
+        left, right = node.left, node.right
+        left_constant = isinstance(left, _CONSTANT_NODES)
+        right_constant = isinstance(right, _CONSTANT_NODES)
+        if left_constant and right_constant:
+            try:
+                value = apply(left.value, right.value)
+            except Exception:
+                # L'erreur (division par zéro...) est levée à l'exécution
+                pass
+            else:
+                return lambda frame: value
+
+        # Opérandes spécialisés : constante intégrée ou lecture directe du frame
+        if right_constant:
+            constant = right.value
+            if self.is_declared_variable(left):
+                index = self.slot(left.value)
+                return lambda frame: apply(frame[index], constant)
+            left_value = self.compile_expression(left)
+            return lambda frame: apply(left_value(frame), constant)
+        if left_constant:
+            constant = left.value
+            right_value = self.compile_expression(right)
+            return lambda frame: apply(constant, right_value(frame))
+        if self.is_declared_variable(left) and self.is_declared_variable(right):
+            left_index = self.slot(left.value)
+            right_index = self.slot(right.value)
+            return lambda frame: apply(frame[left_index], frame[right_index])
+        left_value = self.compile_expression(left)
+        right_value = self.compile_expression(right)
+        return lambda frame: apply(left_value(frame), right_value(frame))
+
+    def is_declared_variable(self, node):
+        return isinstance(node, InterpreterRexi.Variable) and node.value in self.declared
+
+
+def compile_tree(tree):
+    """Compile un arbre produit par InterpreterRexi.Parser, ou le confie à
+    Interpreter s'il contient des nœuds sans traduction (fonctions...)"""
+    try:
+        return ClosureCompiler().compile(tree)
+    except Unsupported:
+        return InterpretedProgram(tree)
+
+
+def compile_source(source_code):
+    """Analyse et compile un programme Rexi"""
+    lexer = InterpreterRexi.Lexer(source_code)
+    parser = InterpreterRexi.Parser(lexer)
+    return compile_tree(parser.parse())
+
+
+def execute(source_code, output=None):
+    """Équivalent de execute_rexi passant par la compilation en fermetures"""
+    try:
+        return compile_source(source_code).run(output)
+    except RecursionError:
+        return {
+            'error': 'Profondeur de récursion maximale dépassée'
+        }
+    except Exception as e:
+        return {
+            'error': str(e)
+        }
@@ -1,5 +1,12 @@
+import threading
+
 from ply import lex, yacc
 
+import TokenizerRexi
+
+# Bumped whenever the generated code changes, to invalidate cached compilations
+COMPILER_VERSION = '1.2'
+
 # --- Lexical Analysis ---
 tokens = (
     # Keywords
@@ -36,23 +43,8 @@ t_RBRACKET = r'\]'
 t_SEMICOLON = r';'
 t_COMMA = r','
 
-# Keywords
-reserved = {
-    'if': 'IF',
-    'then': 'THEN',
-    'else': 'ELSE',
-    'end': 'END',
-    'while': 'WHILE',
-    'for': 'FOR',
-    'function': 'FUNCTION',
-    'return': 'RETURN',
-    'output': 'OUTPUT',
-    'IN': 'TYPE',
-    'IR': 'TYPE',
-    'STR': 'TYPE',
-    'BINARY': 'TYPE',
-    'TAB': 'TYPE',
-}
+# Keywords, shared with the streaming tokenizer
+reserved = TokenizerRexi.RESERVED
 
 precedence = (
     ('left', 'PLUS', 'MINUS'),
@@ -100,17 +92,21 @@ def t_error(t):
     print(f"Illegal character '{t.value[0]}' at line {t.lineno}")
     t.lexer.skip(1)
 
-# Base Node class
+# Base Node class; nodes list their attributes in __slots__ (no per-instance dict)
 class Node:
-    pass
+    __slots__ = ()
 
 # Program node
 class Program(Node):
+    __slots__ = ('declarations',)
+
     def __init__(self, declarations):
         self.declarations = declarations
 
 # Function node
 class Function(Node):
+    __slots__ = ('name', 'params', 'return_type', 'body')
+
     def __init__(self, name, params, return_type, body):
         self.name = name
         self.params = params
@@ -119,11 +115,15 @@ class Function(Node):
 
 # Statement nodes
 class WhileLoop(Node):
+    __slots__ = ('condition', 'body')
+
     def __init__(self, condition, body):
         self.condition = condition
         self.body = body
 
 class ForLoop(Node):
+    __slots__ = ('init', 'condition', 'update', 'body')
+
     def __init__(self, init, condition, update, body):
         self.init = init
         self.condition = condition
@@ -131,23 +131,37 @@ class ForLoop(Node):
         self.body = body
 
 class IfStatement(Node):
+    __slots__ = ('condition', 'if_body', 'else_body')
+
     def __init__(self, condition, if_body, else_body=None):
         self.condition = condition
         self.if_body = if_body
         self.else_body = else_body
 
 class Return(Node):
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+class Output(Node):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
 # Declaration nodes
 class VarDeclaration(Node):
+    __slots__ = ('type_node', 'name', 'value')
+
     def __init__(self, type_node, name, value):
         self.type_node = type_node
         self.name = name
         self.value = value
 
 class ArrayDecl(Node):
+    __slots__ = ('type_node', 'name', 'size')
+
     def __init__(self, type_node, name, size):
         self.type_node = type_node
         self.name = name
@@ -155,40 +169,56 @@ class ArrayDecl(Node):
 
 # Expression nodes
 class Assignment(Node):
+    __slots__ = ('name', 'value')
+
     def __init__(self, name, value):
         self.name = name
         self.value = value
 
 class BinOp(Node):
+    __slots__ = ('left', 'op', 'right')
+
     def __init__(self, left, op, right):
         self.left = left
         self.op = op
         self.right = right
 
 class ArrayAccess(Node):
+    __slots__ = ('array_name', 'index')
+
     def __init__(self, array_name, index):
         self.array_name = array_name
         self.index = index
 
 class FunctionCall(Node):
+    __slots__ = ('name', 'args')
+
     def __init__(self, name, args):
         self.name = name
         self.args = args
 
 # Value nodes
 class Number(Node):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
 class String(Node):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
 class Boolean(Node):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
 class Identifier(Node):
+    __slots__ = ('name',)
+
     def __init__(self, name):
         self.name = name
 
@@ -197,6 +227,9 @@ class SymbolTable:
     def __init__(self):
         # Initialize with global scope
         self.scopes = [{}]
+        # Name -> stack of (depth, slot) of its declarations, innermost last,
+        # so lookups do not scan the scopes
+        self.index = {}
 
     def enter_scope(self):
         """Create a new scope"""
@@ -205,21 +238,31 @@ class SymbolTable:
     def exit_scope(self):
         """Exit the current scope"""
         if len(self.scopes) > 1:  # Prevent exiting global scope
-            self.scopes.pop()
+            for name in self.scopes.pop():
+                declarations = self.index[name]
+                declarations.pop()
+                if not declarations:
+                    del self.index[name]
 
     def declare(self, name, info):
         """Declare a new symbol in current scope"""
-        if name in self.scopes[-1]:
+        scope = self.scopes[-1]
+        if name in scope:
             raise Exception(f"Symbol '{name}' already declared in current scope")
-        self.scopes[-1][name] = info
+        self.index.setdefault(name, []).append((len(self.scopes) - 1, len(scope)))
+        scope[name] = info
+
+    def resolve(self, name):
+        """Slot (depth, index) of a symbol in the innermost scope declaring it"""
+        declarations = self.index.get(name)
+        return declarations[-1] if declarations else None
 
     def lookup(self, name):
         """Look up a symbol in all accessible scopes"""
-        # Search from innermost to outermost scope
-        for scope in reversed(self.scopes):
-            if name in scope:
-                return scope[name]
-        return None
+        declarations = self.index.get(name)
+        if not declarations:
+            return None
+        return self.scopes[declarations[-1][0]][name]
 
     def lookup_in_current_scope(self, name):
         """Look up a symbol only in the current scope"""
@@ -227,12 +270,11 @@ class SymbolTable:
 
     def update(self, name, info):
         """Update a symbol's information"""
-        # Search from innermost to outermost scope
-        for scope in reversed(self.scopes):
-            if name in scope:
-                scope[name] = info
-                return True
-        raise Exception(f"Symbol '{name}' not found")
+        declarations = self.index.get(name)
+        if not declarations:
+            raise Exception(f"Symbol '{name}' not found")
+        self.scopes[declarations[-1][0]][name] = info
+        return True
 
     def get_current_scope(self):
         """Get the current scope dictionary"""
@@ -258,7 +300,9 @@ def p_declarations(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[2]]
+        # Left recursion: extend the list in place instead of copying it
+        p[1].append(p[2])
+        p[0] = p[1]
 
 def p_declaration(p):
     """declaration : var_declaration
@@ -289,7 +333,8 @@ def p_param_list_not_empty(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 
 def p_param(p):
     """param : TYPE ID"""
@@ -310,7 +355,8 @@ def p_statement_list(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[2]]
+        p[1].append(p[2])
+        p[0] = p[1]
 
 def p_statement(p):
     """statement : var_declaration
@@ -407,10 +453,12 @@ def p_factor(p):
         elif isinstance(p[1], bool):
             p[0] = Boolean(p[1])
         elif isinstance(p[1], str):
-            if p[1] in ['true', 'false', 'YES', 'NO']:
+            if p.slice[1].type == 'STRING':
+                p[0] = String(p[1])
+            elif p[1] in ['true', 'false', 'YES', 'NO']:
                 p[0] = Boolean(p[1] in ['true', 'YES'])
             else:
-                p[0] = String(p[1]) if p[1].startswith('"') else Identifier(p[1])
+                p[0] = Identifier(p[1])
         else:
             p[0] = p[1]
     else:
@@ -435,7 +483,8 @@ def p_arg_list_not_empty(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 
 def p_return_statement(p):
     """return_statement : RETURN expression SEMICOLON"""
@@ -443,20 +492,84 @@ def p_return_statement(p):
 
 def p_output_statement(p):
     """output_statement : OUTPUT expression SEMICOLON"""
-    p[0] = Return(p[2])
+    p[0] = Output(p[2])
 
 def p_error(p):
     if p:
         print(f"Syntax error at '{p.value}', line {p.lineno}")
+        # Token sources that collect errors (IncrementalRexi) get the token
+        errors = getattr(p.lexer, 'syntax_errors', None)
+        if errors is not None:
+            errors.append(p)
     else:
         print("Syntax error at EOF")
 
+# --- Dispatch table for the code generator --- #
+class _DispatchTable(dict):
+    """Maps each node type to the generate_<type> method of a class"""
+
+    def __init__(self, owner):
+        super().__init__()
+        self.owner = owner
+
+    def __missing__(self, node_type):
+        # Resolved on the first node of this type, then served from the dict
+        method_name = f'generate_{node_type.__name__.lower()}'
+        method = getattr(self.owner, method_name, self.owner.generic_generate)
+        self[node_type] = method
+        return method
+
+
+# --- Typed instruction selection --- #
+# Operand kind of IN/IR operands: INT when both are IN, FLOAT otherwise
+TYPED_OPERATIONS = {
+    ('+', 'INT'): 'ADD_INT', ('+', 'FLOAT'): 'ADD_FLOAT',
+    ('-', 'INT'): 'SUB_INT', ('-', 'FLOAT'): 'SUB_FLOAT',
+    ('*', 'INT'): 'MUL_INT', ('*', 'FLOAT'): 'MUL_FLOAT',
+    ('/', 'INT'): 'DIV_INT', ('/', 'FLOAT'): 'DIV_FLOAT',
+    ('<', 'INT'): 'LT_INT', ('<', 'FLOAT'): 'LT_FLOAT',
+    ('>', 'INT'): 'GT_INT', ('>', 'FLOAT'): 'GT_FLOAT',
+    ('<=', 'INT'): 'LE_INT', ('<=', 'FLOAT'): 'LE_FLOAT',
+    ('>=', 'INT'): 'GE_INT', ('>=', 'FLOAT'): 'GE_FLOAT',
+    ('==', 'INT'): 'EQ_INT', ('==', 'FLOAT'): 'EQ_FLOAT',
+    ('!=', 'INT'): 'NE_INT', ('!=', 'FLOAT'): 'NE_FLOAT',
+}
+
+NUMERIC_TYPES = ('IN', 'IR')
+
+
+def operation_type(op, left, right):
+    """Static type of the result of a binary operation on IN/IR operands"""
+    if op in ('+', '-', '*'):
+        return 'IR' if 'IR' in (left, right) else 'IN'
+    if op == '/':
+        return 'IR'
+    return 'BINARY'
+
+
 # --- Code Generator amélioré --- #
 class CodeGenerator:
-    def __init__(self):
+    """Generates three-address code from the AST.
+
+    With typed=True, the declared IN/IR types of variables, parameters,
+    arrays and function results are tracked through expressions, and
+    binary operations on numbers become typed instructions (ADD_INT,
+    LT_FLOAT...). Operations on other or unknown types stay generic.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = _DispatchTable(cls)
+
+    def __init__(self, typed=False):
         self.code = []
         self.temp_counter = 0
         self.label_counter = 0
+        self.typed = typed
+        # Declared types of variables and static types of temporaries
+        self.symbols = SymbolTable()
+        self.temp_types = {}
+        self.return_types = {}
 
     def generate_temp(self):
         self.temp_counter += 1
@@ -472,27 +585,49 @@ class CodeGenerator:
         return result_
 
     def generate_code(self, node):
-        method_name = f'generate_{type(node).__name__.lower()}'
-        if hasattr(self, method_name):
-            return getattr(self, method_name)(node)
+        return self._dispatch[type(node)](self, node)
+
+    def generic_generate(self, node):
         raise Exception(f"No visitor for {type(node).__name__}")
 
+    def declare_type(self, name, type_name):
+        if name in self.symbols.get_current_scope():
+            self.symbols.update(name, type_name)
+        else:
+            self.symbols.declare(name, type_name)
+
+    def typed_temp(self, type_name):
+        temp = self.generate_temp()
+        if self.typed:
+            self.temp_types[temp] = type_name
+        return temp
+
     def generate_program(self, node):
+        # Functions may be called before their declaration
+        self.return_types = {
+            decl.name: decl.return_type for decl in node.declarations if isinstance(decl, Function)
+        }
         for decl in node.declarations:
             self.generate_code(decl)
         return self.code
 
     def generate_function(self, node):
-        # Function label
-        func_label = self.emit('LABEL', node.name)
+        # Function header: name and parameter names, in call order
+        params = [name for _, name in node.params]
+        self.emit('FUNCTION', node.name, params)
+        self.symbols.enter_scope()
+        for type_name, name in node.params:
+            self.declare_type(name, type_name)
 
         # Generate code for function body
         for stmt in node.body:
             self.generate_code(stmt)
+        self.symbols.exit_scope()
 
         # Add return if not present
         self.emit('RETURN', None)
-        return func_label
+        self.emit('END_FUNCTION', node.name)
+        return node.name
 
     def generate_functioncall(self, node):
         # Generate code for arguments
@@ -502,11 +637,12 @@ class CodeGenerator:
             args.append(arg_temp)
 
         # Call function and store result
-        result = self.generate_temp()
+        result = self.typed_temp(self.return_types.get(node.name))
         self.emit('CALL', node.name, args, result)
         return result
 
     def generate_vardeclaration(self, node):
+        self.declare_type(node.name, node.type_node)
         if node.value:
             value = self.generate_code(node.value)
             self.emit('ASSIGN', value, None, node.name)
@@ -514,17 +650,50 @@ class CodeGenerator:
             self.emit('DECLARE', node.name, node.type_node)
         return node.name
 
+    def generate_arraydecl(self, node):
+        self.declare_type(node.name, f'TAB<{node.type_node}>')
+        self.emit('NEW_ARRAY', node.type_node, node.size, node.name)
+        return node.name
+
     def generate_assignment(self, node):
         value = self.generate_code(node.value)
+        if isinstance(node.name, ArrayAccess):
+            # Element store: the array variable itself is not reassigned
+            index = self.generate_code(node.name.index)
+            self.emit('ARRAY_STORE', value, index, node.name.array_name)
+            return node.name.array_name
         self.emit('ASSIGN', value, None, node.name)
         return node.name
 
     def generate_binop(self, node):
-        left = self.generate_code(node.left)
-        right = self.generate_code(node.right)
+        # Post-order walk with an explicit stack: long operator chains
+        # (a + b + c + ...) do not recurse on the Python stack
+        results = []
+        stack = [(node, False)]
+        while stack:
+            current, operands_done = stack.pop()
+            if type(current) is not BinOp:
+                results.append(self.generate_code(current))
+            elif operands_done:
+                right = results.pop()
+                left = results.pop()
+                results.append(self.generate_operation(current.op, left, right))
+            else:
+                stack.append((current, True))
+                stack.append((current.right, False))
+                stack.append((current.left, False))
+        return results[0]
+
+    def generate_operation(self, op, left, right):
         result = self.generate_temp()
-        self.emit(node.op, left, right, result)
-        return result
+        if self.typed:
+            left_type = self.temp_types.get(left)
+            right_type = self.temp_types.get(right)
+            if left_type in NUMERIC_TYPES and right_type in NUMERIC_TYPES:
+                kind = 'INT' if left_type == right_type == 'IN' else 'FLOAT'
+                self.temp_types[result] = operation_type(op, left_type, right_type)
+                return self.emit(TYPED_OPERATIONS[op, kind], left, right, result)
+        return self.emit(op, left, right, result)
 
     def generate_ifstatement(self, node):
         cond = self.generate_code(node.condition)
@@ -564,6 +733,24 @@ class CodeGenerator:
         self.emit('LABEL', end_label)
         return None
 
+    def generate_forloop(self, node):
+        start_label = self.generate_label()
+        end_label = self.generate_label()
+
+        self.generate_code(node.init)
+        self.emit('LABEL', start_label)
+        cond = self.generate_code(node.condition)
+        self.emit('JUMPIF', cond, end_label)
+
+        # Generate loop body, then the update step
+        for stmt in node.body:
+            self.generate_code(stmt)
+        self.generate_code(node.update)
+
+        self.emit('JUMP', start_label)
+        self.emit('LABEL', end_label)
+        return None
+
     def generate_return(self, node):
         if node.value:
             value = self.generate_code(node.value)
@@ -572,53 +759,151 @@ class CodeGenerator:
             self.emit('RETURN', None)
         return None
 
+    def generate_output(self, node):
+        value = self.generate_code(node.value)
+        self.emit('OUTPUT', value)
+        return None
+
     def generate_number(self, node):
-        temp = self.generate_temp()
+        if isinstance(node.value, bool):
+            temp = self.typed_temp('BINARY')
+        else:
+            temp = self.typed_temp('IR' if isinstance(node.value, float) else 'IN')
         self.emit('LOAD_CONST', node.value, None, temp)
         return temp
 
     def generate_string(self, node):
-        temp = self.generate_temp()
+        temp = self.typed_temp('STR')
         self.emit('LOAD_CONST', node.value, None, temp)
         return temp
 
     def generate_boolean(self, node):
-        temp = self.generate_temp()
+        temp = self.typed_temp('BINARY')
         self.emit('LOAD_CONST', node.value, None, temp)
         return temp
 
     def generate_identifier(self, node):
-        temp = self.generate_temp()
+        temp = self.typed_temp(self.symbols.lookup(node.name))
         self.emit('LOAD', node.name, None, temp)
         return temp
 
     def generate_arrayaccess(self, node):
         index = self.generate_code(node.index)
-        result = self.generate_temp()
+        array_type = self.symbols.lookup(node.array_name) or ''
+        result = self.typed_temp(array_type[4:-1] if array_type.startswith('TAB<') else None)
         self.emit('ARRAY_ACCESS', node.array_name, index, result)
         return result
 
 
-# --- Main compilation function ---
-def compile_code(source_code):
+CodeGenerator._dispatch = _DispatchTable(CodeGenerator)
+
+
+# --- Streaming token source for the parser --- #
+class TokenStreamLexer:
+    """PLY lexer interface over TokenizerRexi.tokenize (source string or file)"""
+
+    def __init__(self, source):
+        self.tokens = TokenizerRexi.tokenize(source)
+        self.lineno = 1
+
+    def token(self):
+        for tok in self.tokens:
+            if tok.type == 'ILLEGAL':
+                print(f"Illegal character '{tok.value}' at line {tok.line}")
+                continue
+            lex_token = lex.LexToken()
+            lex_token.type = tok.type
+            lex_token.value = tok.value
+            lex_token.lineno = self.lineno = tok.line
+            lex_token.lexpos = tok.offset
+            return lex_token
+        return None
+
+
+# --- Compiler session --- #
+class CompilerSession:
+    """Holds a lexer and an LALR parser built once and reused across compilations"""
+
+    def __init__(self, debug=False, write_tables=False):
+        # Building the lexer compiles the master regex; building the parser
+        # loads parsetab.py (or regenerates the tables in memory when stale)
+        self.lexer = lex.lex()
+        self.parser = yacc.yacc(debug=debug, write_tables=write_tables)
+        # PLY lexer and parser objects keep per-parse state
+        self.lock = threading.Lock()
+
+    def parse(self, source_code):
+        """Parse source code with the cached lexer and parser"""
+        with self.lock:
+            self.lexer.lineno = 1
+            self.lexer.input(source_code)
+            return self.parser.parse(lexer=self.lexer)
+
+    def parse_stream(self, source):
+        """Parse a source string or a text file object read in chunks"""
+        return self.parse_lexer(TokenStreamLexer(source))
+
+    def parse_lexer(self, lexer):
+        """Parse the tokens of any object with a PLY token() method"""
+        with self.lock:
+            return self.parser.parse(lexer=lexer)
+
+
+def parse_tables_current():
+    """Whether parsetab.py was generated for the current grammar.
+
+    When it is not, every process rebuilds the LALR tables in memory. Run
+    CompilerSession(debug=True, write_tables=True) to regenerate parsetab.py
+    and parser.out after changing the grammar.
+    """
     try:
-        # Initialize lexer and parser
-        lexer = lex.lex()
-        parser = yacc.yacc()
+        import parsetab
+    except ImportError:
+        return False
+    grammar = yacc.ParserReflect(globals())
+    grammar.get_all()
+    return getattr(parsetab, '_lr_signature', None) == grammar.signature()
 
-        # Lexical and Syntax Analysis
-        ast = parser.parse(source_code, lexer=lexer)
-        if not ast:
-            raise Exception("Parsing failed to produce an AST")
-        # Code Generation
-        code_generator = CodeGenerator()
-        generated_code = code_generator.generate_code(ast)
 
-        return generated_code
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide compiler session, building it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = CompilerSession()
+    return _session
+
+
+# --- Main compilation function ---
+def compile_code(source_code, passes=(), typed=False):
+    try:
+        # Lexical and Syntax Analysis
+        ast = get_session().parse(source_code)
+        return compile_tree(ast, passes, typed)
 
     except Exception as e:
         return f"Compilation error: {str(e)}"
 
+
+def compile_tree(ast, passes=(), typed=False):
+    """Generate code for a parsed program; raises on errors"""
+    if not ast:
+        raise Exception("Parsing failed to produce an AST")
+    # Code Generation
+    code_generator = CodeGenerator(typed)
+    generated_code = code_generator.generate_code(ast)
+
+    # Optional pipeline stages over the generated code (optimizer...)
+    for compiler_pass in passes:
+        generated_code = compiler_pass(generated_code)
+
+    return generated_code
+
 # Test the compiler
 test_program = """
 function calculate(IN x, IN y) IN {
@@ -632,8 +917,11 @@ IN sum = calculate(a, b);
 output sum;
 """
 def Run(source_code):
-    out = ""
-    result = compile_code(source_code)
-    for instruction in result:
-        out += f"{instruction}\n"
-    return out
+    return listing(compile_code(source_code))
+
+
+def listing(result):
+    """Text of a compilation result: one instruction per line, or the error"""
+    if isinstance(result, str):
+        return f"{result}\n"
+    return "".join(f"{instruction}\n" for instruction in result)
@@ -0,0 +1,297 @@
+"""Incremental parsing of an editor buffer.
+
+A Document splits its text into top-level declarations (statements,
+variable and function declarations) and keeps, for each one, its source
+span, its tokens and its parsed subtree. An edit is given as a text
+change delta: the offsets of the replaced range and the new text. Only
+the declarations that the edited lines touch are lexed and parsed again;
+the other ones are reused, with their span shifted.
+
+A declaration ends at the ';' of a simple statement, at the '}' closing
+the block of a function, while or for, or at the 'end' of an if, at
+bracket depth zero. Lexing restarts at a declaration boundary, so the
+tokens of the untouched declarations stay valid. The one exception is an
+unterminated string, which may swallow the rest of the text: from the
+declaration that holds it, the text is lexed up to the end.
+
+    document = Document(source_code)
+    document.edit(start, end, "new text")
+    code = document.compile()
+"""
+from ply import lex
+
+import CompilerRexi
+import TokenizerRexi
+
+# Token types that open and close a bracket level
+OPENING = frozenset(('LPAREN', 'LBRACE', 'LBRACKET'))
+CLOSING = frozenset(('RPAREN', 'RBRACE', 'RBRACKET'))
+# Last token of a declaration, by its first token
+BLOCK_STATEMENTS = frozenset(('FUNCTION', 'WHILE', 'FOR'))
+
+
+def closing_token(first):
+    if first == 'IF':
+        return 'END'
+    if first in BLOCK_STATEMENTS:
+        return 'RBRACE'
+    return 'SEMICOLON'
+
+
+def text_change(old, new):
+    """Smallest delta (start, end, text) turning old into new"""
+    limit = min(len(old), len(new))
+    # Common prefix and suffix, compared by halving slices
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[:middle] == new[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    prefix = low
+    low, high = 0, limit - prefix
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[len(old) - middle:] == new[len(new) - middle:]:
+            low = middle
+        else:
+            high = middle - 1
+    suffix = low
+    return prefix, len(old) - suffix, new[prefix:len(new) - suffix]
+
+
+class Segment:
+    """A top-level declaration: source span, tokens and parsed subtree.
+
+    Tokens are (type, value, line, offset) tuples relative to the first
+    line and the first character of the declaration. node is None when
+    the declaration has syntax errors, listed in errors as (relative line,
+    token value) pairs (the value is None for an unexpected end), or when
+    it only holds illegal characters.
+    unterminated tells whether it holds a '"' that no other one closes.
+    """
+
+    __slots__ = ('start', 'end', 'line', 'tokens', 'node', 'errors', 'unterminated')
+
+    def __init__(self, start, end, line, tokens):
+        self.start = start
+        self.end = end
+        self.line = line
+        self.tokens = tokens
+        self.node = None
+        self.errors = []
+        self.unterminated = any(token[0] == 'ILLEGAL' and token[1] == '"' for token in tokens)
+
+    def key(self):
+        """Token content, independent of the position of the declaration"""
+        return tuple((token[0], token[1]) for token in self.tokens)
+
+    def __repr__(self):
+        return f"Segment({self.start}:{self.end}, line {self.line}, {len(self.tokens)} tokens)"
+
+
+class SegmentLexer:
+    """PLY lexer interface over the cached tokens of a segment"""
+
+    def __init__(self, segment):
+        self.segment = segment
+        self.position = 0
+        self.lineno = segment.line
+        # Filled by CompilerRexi.p_error
+        self.syntax_errors = []
+
+    def token(self):
+        tokens = self.segment.tokens
+        while self.position < len(tokens):
+            type_, value, line, offset = tokens[self.position]
+            self.position += 1
+            self.lineno = self.segment.line + line
+            if type_ == 'ILLEGAL':
+                print(f"Illegal character '{value}' at line {self.lineno}")
+                continue
+            lex_token = lex.LexToken()
+            lex_token.type = type_
+            lex_token.value = value
+            lex_token.lineno = self.lineno
+            lex_token.lexpos = self.segment.start + offset
+            return lex_token
+        return None
+
+
+class Document:
+    """Source text kept parsed declaration by declaration"""
+
+    def __init__(self, text="", session=None):
+        self.session = session or CompilerRexi.get_session()
+        self.text = ""
+        self.segments = []
+        # Whether the last declaration is complete
+        self.closed = True
+        self.stats = {'edits': 0, 'lexed': 0, 'parsed': 0, 'reused': 0}
+        if text:
+            self.edit(0, 0, text)
+
+    def update(self, text):
+        """Bring the document to a new text, as one edit of the changed range"""
+        if text != self.text:
+            self.edit(*text_change(self.text, text))
+
+    def offset(self, line, column):
+        """Offset of a 1-based line and 0-based column, as editors number them"""
+        position = 0
+        for _ in range(line - 1):
+            position = self.text.index('\n', position) + 1
+        return position + column
+
+    def edit(self, start, end, text):
+        """Replace text[start:end] and reparse the declarations it touches"""
+        old = self.text
+        if not 0 <= start <= end <= len(old):
+            raise IndexError(f"Edit range {start}:{end} outside of the document")
+        segments = self.segments
+        count = len(segments)
+        # Touched declarations, ends included: an edit next to a token may extend it
+        first = 0
+        while first < count and segments[first].end < start:
+            first += 1
+        # Text added after an unfinished last declaration continues it
+        if first == count and count and not self.closed:
+            first -= 1
+        last = first
+        while last < count and segments[last].start <= end:
+            last += 1
+        # A string left open before the edit may now be closed by it
+        for index in range(first):
+            if segments[index].unterminated:
+                first, last = index, count
+                break
+
+        self.text = new = old[:start] + text + old[end:]
+        shift = len(text) - (end - start)
+        line_shift = text.count('\n') - old.count('\n', start, end)
+        region_start = segments[first - 1].end if first else 0
+        while True:
+            # A comment opened in the region ends with its line: stop after a line break
+            while last < count and old.find(
+                    '\n', max(end, segments[last - 1].end) if last else end, segments[last].start) < 0:
+                last += 1
+            region_end = segments[last].start + shift if last < count else len(new)
+            replacement, complete = self.lex(region_start, region_end)
+            # Lex further when a declaration runs into the next one
+            if complete or last == count:
+                break
+            last = last + 1 if complete is not None else count
+        if last == count:
+            self.closed = complete
+
+        # Subtrees of the replaced declarations, reused when their tokens are unchanged
+        previous = {segment.key(): segment.node for segment in segments[first:last]}
+        for segment in replacement:
+            node = previous.get(segment.key())
+            if node is None:
+                node = self.parse(segment)
+            else:
+                self.stats['reused'] += 1
+            segment.node = node
+        for segment in segments[last:]:
+            segment.start += shift
+            segment.end += shift
+            segment.line += line_shift
+        segments[first:last] = replacement
+        self.stats['edits'] += 1
+        self.stats['reused'] += len(segments) - len(replacement)
+        return replacement
+
+    def lex(self, region_start, region_end):
+        """Split text[region_start:region_end] into segments.
+
+        Also reports whether the last declaration is complete: True or
+        False, or None when an unterminated string needs the rest of the text.
+        """
+        text = self.text
+        region = text[region_start:region_end]
+        base_line = text.count('\n', 0, region_start) + 1
+        self.stats['lexed'] += len(region)
+        segments = []
+        current = []
+        depth = 0
+        closer = None
+        complete = True
+        for token in TokenizerRexi.tokenize(region):
+            if token.type == 'ILLEGAL' and token.value == '"' and region_end < len(text):
+                return [], None
+            # Illegal characters are skipped by the parser
+            if closer is None and token.type != 'ILLEGAL':
+                closer = closing_token(token.type)
+            current.append(token)
+            if token.type in OPENING:
+                depth += 1
+            elif token.type in CLOSING:
+                depth -= 1
+            if depth < 0 or (depth == 0 and token.type == closer):
+                segments.append(self.segment(region, region_start, base_line, current))
+                current = []
+                depth = 0
+                closer = None
+        if current:
+            segments.append(self.segment(region, region_start, base_line, current))
+            complete = False
+        return segments, complete
+
+    def segment(self, region, region_start, base_line, tokens):
+        head = tokens[0]
+        last = tokens[-1]
+        end = TokenizerRexi.TOKEN_PATTERN.match(region, last.offset).end()
+        return Segment(
+            region_start + head.offset,
+            region_start + end,
+            base_line + head.line - 1,
+            [(token.type, token.value, token.line - head.line, token.offset - head.offset)
+             for token in tokens],
+        )
+
+    def parse(self, segment):
+        """Parsed declaration of a segment, or None on a syntax error"""
+        self.stats['parsed'] += 1
+        lexer = SegmentLexer(segment)
+        if all(token[0] == 'ILLEGAL' for token in segment.tokens):
+            # Nothing to parse; report the characters as the parser would
+            lexer.token()
+            segment.errors = []
+            return None
+        program = self.session.parse_lexer(lexer)
+        segment.errors = [(token.lineno - segment.line, token.value)
+                          for token in lexer.syntax_errors]
+        # The parser may recover from an error and still return a program
+        if program is None and not segment.errors:
+            segment.errors.append((lexer.lineno - segment.line, None))
+        if segment.errors or len(program.declarations) != 1:
+            return None
+        return program.declarations[0]
+
+    def errors(self):
+        """Messages of the syntax errors of the document"""
+        messages = []
+        for segment in self.segments:
+            for line, value in segment.errors:
+                where = "end of declaration" if value is None else f"'{value}'"
+                messages.append(f"Syntax error at {where}, line {segment.line + line}")
+        return messages
+
+    def tree(self):
+        """Program node of the whole document, or None on syntax errors"""
+        if any(segment.errors for segment in self.segments):
+            return None
+        return CompilerRexi.Program(
+            [segment.node for segment in self.segments if segment.node is not None])
+
+    def compile(self, passes=(), typed=False):
+        """Compile the document like CompilerRexi.compile_code"""
+        errors = self.errors()
+        if errors:
+            return f"Compilation error: {'; '.join(errors)}"
+        try:
+            return CompilerRexi.compile_tree(self.tree(), passes, typed)
+        except Exception as e:
+            return f"Compilation error: {str(e)}"
@@ -1,196 +1,335 @@
+import operator
+import re
+import sys
+
+import TokenizerRexi
+from ArrayRexi import REDUCTIONS, TypedArray
+
+
 # Analyse Lexicale - Transforme le texte source en tokens
 class Token:
+    __slots__ = ('type', 'value')
+
     def __init__(self, type, value):
         self.type = type
         self.value = value
 
+# Mots-clés du langage Rexi
+KEYWORDS = {
+    'if': 'IF',
+    'then': 'THEN',
+    'else': 'ELSE',
+    'end': 'END',
+    'output': 'OUTPUT',
+    'while': 'WHILE',
+    'for': 'FOR',
+    'function': 'FUNCTION',
+    'return': 'RETURN',
+    'IN': 'TYPE',
+    'IR': 'TYPE',
+    'STR': 'TYPE',
+    'BINARY': 'TYPE',
+    'TAB': 'TYPE',
+}
+
+BOOLEANS = {
+    'YES': True,
+    'NO': False,
+}
+
+# Opérateurs et symboles
+PUNCTUATION = {
+    '{': 'LBRACE',
+    '}': 'RBRACE',
+    '[': 'LBRACKET',
+    ']': 'RBRACKET',
+    '+': 'PLUS',
+    '-': 'MINUS',
+    '*': 'MULTIPLY',
+    '/': 'DIVIDE',
+    '=': 'ASSIGN',
+    '==': 'EQUALS',
+    '>': 'GT',
+    '>=': 'GTE',
+    '<': 'LT',
+    '<=': 'LTE',
+    '(': 'LPAREN',
+    ')': 'RPAREN',
+    ';': 'SEMICOLON',
+    ',': 'COMMA',
+}
+
+# Expression maîtresse : les espaces en tête, puis une alternative nommée
+# par catégorie de token (la fin du texte ne correspond à aucun groupe)
+TOKEN_PATTERN = re.compile(r"""
+    \s*
+    (?:
+        (?P<ID>[^\W\d_]\w*)
+      | (?P<PUNCTUATION>==|>=|<=|[{}\[\]+\-*/=><();,])
+      | (?P<NUMBER>\d[\d.]*)
+      | (?P<STRING>"[^"]*"?)
+      | (?P<ERROR>.)
+      | \Z
+    )
+""", re.VERBOSE | re.DOTALL)
+
+# Tokens sans valeur variable, partagés entre toutes leurs occurrences
+RESERVED_TOKENS = {word: Token(type, word) for word, type in KEYWORDS.items()}
+RESERVED_TOKENS.update({word: Token('BOOLEAN', value) for word, value in BOOLEANS.items()})
+PUNCTUATION_TOKENS = {symbol: Token(type, symbol) for symbol, type in PUNCTUATION.items()}
+EOF_TOKEN = Token('EOF', None)
+
 class Lexer:
     def __init__(self, text):
         self.text = text
         self.pos = 0
-        self.current_char = self.text[0] if text else None
+        self.tokens = self.scan()
 
     def error(self):
         raise Exception('Caractère invalide')
 
-    def advance(self):
-        self.pos += 1
-        self.current_char = self.text[self.pos] if self.pos < len(self.text) else None
-
-    def skip_whitespace(self):
-        # Ignorer les espaces blancs
-        while self.current_char and self.current_char.isspace():
-            self.advance()
-
-    def get_number(self):
-        # Gérer les nombres entiers et réels
-        result = ''
-        is_float = False
-        while self.current_char and (self.current_char.isdigit() or self.current_char == '.'):
-            if self.current_char == '.':
-                is_float = True
-            result += self.current_char
-            self.advance()
-        return float(result) if is_float else int(result)
-
-    def get_identifier(self):
-        # Récupérer les identifiants et mots-clés
-        result = ''
-        while self.current_char and (self.current_char.isalnum() or self.current_char == '_'):
-            result += self.current_char
-            self.advance()
-        return result
+    def scan(self):
+        """Génère les tokens du texte à l'aide de l'expression maîtresse"""
+        for match in TOKEN_PATTERN.finditer(self.text):
+            kind = match.lastgroup
+            if kind == 'ID':
+                value = match.group(kind)
+                token = RESERVED_TOKENS.get(value)
+                yield Token('ID', value) if token is None else token
+            elif kind == 'PUNCTUATION':
+                yield PUNCTUATION_TOKENS[match.group(kind)]
+            elif kind == 'NUMBER':
+                value = match.group(kind)
+                yield Token('NUMBER', float(value) if '.' in value else int(value))
+            elif kind == 'STRING':
+                # Une chaîne non terminée s'étend jusqu'à la fin du texte
+                value = match.group(kind)
+                yield Token('STRING', value[1:-1] if len(value) > 1 and value[-1] == '"' else value[1:])
+            elif kind == 'ERROR':
+                self.pos = match.start(kind)
+                self.error()
+            else:
+                break
+        self.pos = len(self.text)
 
     def get_next_token(self):
-        while self.current_char:
-            if self.current_char.isspace():
-                self.skip_whitespace()
-                continue
-
-            if self.current_char.isdigit():
-                return Token('NUMBER', self.get_number())
-
-            if self.current_char.isalpha():
-                identifier = self.get_identifier()
-                # Mots-clés du langage Rexi
-                if identifier in ['YES', 'NO', '0', '1']:
-                    return Token('BOOLEAN', identifier in ['YES', '1'])
-                if identifier == 'if':
-                    return Token('IF', identifier)
-                if identifier == 'then':
-                    return Token('THEN', identifier)
-                if identifier == 'else':
-                    return Token('ELSE', identifier)
-                if identifier == 'end':
-                    return Token('END', identifier)
-                if identifier == 'output':
-                    return Token('OUTPUT', identifier)
-                if identifier in ['IN', 'IR', 'STR', 'BINARY', 'TAB']:
-                    return Token('TYPE', identifier)
-                return Token('ID', identifier)
-
-            # Opérateurs et symboles
-            if self.current_char == '"':
-                self.advance()
-                string = ''
-                while self.current_char and self.current_char != '"':
-                    string += self.current_char
-                    self.advance()
-                self.advance()  # Consommer le guillemet fermant
-                return Token('STRING', string)
-
-            if self.current_char == '{':
-                self.advance()
-                return Token('LBRACE', '{')
-            if self.current_char == '}':
-                self.advance()
-                return Token('RBRACE', '}')
-            if self.current_char == '[':
-                self.advance()
-                return Token('LBRACKET', '[')
-            if self.current_char == ']':
-                self.advance()
-                return Token('RBRACKET', ']')
-            if self.current_char == '+':
-                self.advance()
-                return Token('PLUS', '+')
-            if self.current_char == '-':
-                self.advance()
-                return Token('MINUS', '-')
-            if self.current_char == '*':
-                self.advance()
-                return Token('MULTIPLY', '*')
-            if self.current_char == '/':
-                self.advance()
-                return Token('DIVIDE', '/')
-            if self.current_char == '=':
-                self.advance()
-                if self.current_char == '=':
-                    self.advance()
-                    return Token('EQUALS', '==')
-                return Token('ASSIGN', '=')
-            if self.current_char == '>':
-                self.advance()
-                if self.current_char == '=':
-                    self.advance()
-                    return Token('GTE', '>=')
-                return Token('GT', '>')
-            if self.current_char == '<':
-                self.advance()
-                if self.current_char == '=':
-                    self.advance()
-                    return Token('LTE', '<=')
-                return Token('LT', '<')
-            if self.current_char == '(':
-                self.advance()
-                return Token('LPAREN', '(')
-            if self.current_char == ')':
-                self.advance()
-                return Token('RPAREN', ')')
-            if self.current_char == ';':
-                self.advance()
-                return Token('SEMICOLON', ';')
+        return next(self.tokens, EOF_TOKEN)
 
-            self.error()
 
-        return Token('EOF', None)
+class StreamLexer:
+    """Lexer alimenté par TokenizerRexi.tokenize, pour un texte ou un fichier"""
+
+    def __init__(self, source):
+        self.tokens = self.convert(TokenizerRexi.tokenize(source))
+
+    def error(self):
+        raise Exception('Caractère invalide')
+
+    def convert(self, tokens):
+        """Adapte les tokens du langage à ceux attendus par Parser"""
+        for token in tokens:
+            if token.type == 'ILLEGAL':
+                self.error()
+            if token.type == 'ID' or token.type in TokenizerRexi.RESERVED.values():
+                word = token.value
+                if word in BOOLEANS:
+                    token.type, token.value = 'BOOLEAN', BOOLEANS[word]
+                else:
+                    # Les mots-clés inconnus de l'interpréteur restent des identifiants
+                    token.type = KEYWORDS.get(word, 'ID')
+            yield token
+
+    def get_next_token(self):
+        return next(self.tokens, EOF_TOKEN)
 
 # Nœuds de l'arbre syntaxique abstrait
+# Les nœuds déclarent leurs attributs dans __slots__ : pas de __dict__ par
+# instance, ce qui compte sur les programmes générés de grande taille
 class AST:
-    pass
+    __slots__ = ()
 
 class Block(AST):
+    __slots__ = ('statements',)
+
     def __init__(self, statements):
         self.statements = statements
 
 class IfStatement(AST):
+    __slots__ = ('condition', 'if_block', 'else_block')
+
     def __init__(self, condition, if_block, else_block=None):
         self.condition = condition
         self.if_block = if_block
         self.else_block = else_block
 
+class WhileLoop(AST):
+    __slots__ = ('condition', 'body')
+
+    def __init__(self, condition, body):
+        self.condition = condition
+        self.body = body
+
+class ForLoop(AST):
+    __slots__ = ('init', 'condition', 'update', 'body')
+
+    def __init__(self, init, condition, update, body):
+        self.init = init
+        self.condition = condition
+        self.update = update
+        self.body = body
+
+class FunctionDecl(AST):
+    # frame_size : nombre d'emplacements du frame d'un appel, fixé par Resolver
+    # array_params : indices des paramètres TAB (un TAB<IN> passé pour un TAB<IR> est converti)
+    __slots__ = ('token', 'name', 'params', 'return_type', 'body', 'frame_size', 'array_params')
+
+    def __init__(self, token, params, return_type, body):
+        self.token = token
+        self.name = token.value
+        self.params = params
+        self.return_type = return_type
+        self.body = body
+        self.frame_size = len(params)
+        self.array_params = [
+            index for index, param in enumerate(params) if param.type_node.value.startswith('TAB')
+        ]
+
+class Param(AST):
+    __slots__ = ('type_node', 'var_node')
+
+    def __init__(self, type_node, var_node):
+        self.type_node = type_node
+        self.var_node = var_node
+
+class FunctionCall(AST):
+    __slots__ = ('token', 'name', 'args')
+
+    def __init__(self, token, args):
+        self.token = token
+        self.name = token.value
+        self.args = args
+
+class Return(AST):
+    # tail : return d'un appel dans une fonction, exécuté sans empiler de frame Python
+    __slots__ = ('value', 'tail')
+
+    def __init__(self, value):
+        self.value = value
+        self.tail = False
+
 class OutputStatement(AST):
+    __slots__ = ('expression',)
+
     def __init__(self, expression):
         self.expression = expression
 
+# Fonction Python associée à chaque type de token opérateur
+BINARY_OPERATORS = {
+    'PLUS': operator.add,
+    'MINUS': operator.sub,
+    'MULTIPLY': operator.mul,
+    'DIVIDE': operator.truediv,
+    'GT': operator.gt,
+    'LT': operator.lt,
+    'GTE': operator.ge,
+    'LTE': operator.le,
+    'EQUALS': operator.eq,
+}
+
 class BinOp(AST):
+    __slots__ = ('left', 'token', 'op', 'right', 'apply')
+
     def __init__(self, left, op, right):
         self.left = left
         self.token = self.op = op
         self.right = right
+        # Opérateur résolu une seule fois, à la construction du nœud
+        self.apply = BINARY_OPERATORS[op.type]
 
 class Num(AST):
+    __slots__ = ('token', 'value')
+
     def __init__(self, token):
         self.token = token
         self.value = token.value
 
 class String(AST):
+    __slots__ = ('token', 'value')
+
     def __init__(self, token):
         self.token = token
         self.value = token.value
 
 class Boolean(AST):
+    __slots__ = ('token', 'value')
+
     def __init__(self, token):
         self.token = token
         self.value = token.value
 
 class Variable(AST):
+    # depth et index : emplacement attribué par Resolver
+    __slots__ = ('token', 'value', 'depth', 'index')
+
     def __init__(self, token):
         self.token = token
         self.value = token.value
 
 class Declaration(AST):
+    __slots__ = ('type_node', 'var_node', 'value_node')
+
     def __init__(self, type_node, var_node, value_node):
         self.type_node = type_node
         self.var_node = var_node
         self.value_node = value_node
 
 class Assign(AST):
+    __slots__ = ('left', 'token', 'op', 'right')
+
     def __init__(self, left, op, right):
         self.left = left
         self.token = self.op = op
         self.right = right
 
+def element_type(type_name):
+    """Type des éléments d'un type TAB<élément>, ou None"""
+    if type_name.startswith('TAB<'):
+        return type_name[4:-1]
+    return None
+
+class ArrayDeclaration(AST):
+    # Tableau de taille donnée : TAB<IN> t[n]; ou IN t[n];
+    __slots__ = ('type_node', 'var_node', 'size_node', 'element_type')
+
+    def __init__(self, type_node, var_node, size_node):
+        self.type_node = type_node
+        self.var_node = var_node
+        self.size_node = size_node
+        self.element_type = element_type(type_node.value) or type_node.value
+
+class ArrayLiteral(AST):
+    # element_type : type déclaré des éléments, sinon déduit des valeurs
+    __slots__ = ('elements', 'element_type')
+
+    def __init__(self, elements):
+        self.elements = elements
+        self.element_type = None
+
+class ArrayAccess(AST):
+    __slots__ = ('array', 'index')
+
+    def __init__(self, array, index):
+        self.array = array
+        self.index = index
+
+class ArrayAssign(AST):
+    __slots__ = ('target', 'token', 'right')
+
+    def __init__(self, target, token, right):
+        self.target = target
+        self.token = token
+        self.right = right
+
 class Parser:
     def __init__(self, lexer):
         self.lexer = lexer
@@ -209,7 +348,11 @@ class Parser:
         """Point d'entrée du programme"""
         statements = []
         while self.current_token.type != 'EOF':
-            statements.append(self.statement())
+            # Les fonctions ne sont déclarées qu'au niveau global
+            if self.current_token.type == 'FUNCTION':
+                statements.append(self.function_declaration())
+            else:
+                statements.append(self.statement())
         return Block(statements)
 
     def statement(self):
@@ -220,6 +363,12 @@ class Parser:
             return self.if_statement()
         elif self.current_token.type == 'OUTPUT':
             return self.output_statement()
+        elif self.current_token.type == 'WHILE':
+            return self.while_statement()
+        elif self.current_token.type == 'FOR':
+            return self.for_statement()
+        elif self.current_token.type == 'RETURN':
+            return self.return_statement()
         elif self.current_token.type == 'ID':
             return self.assignment()
         else:
@@ -227,21 +376,52 @@ class Parser:
             self.eat('SEMICOLON')
             return node
 
-    def declaration(self):
-        """Analyse d'une déclaration de variable"""
-        type_token = self.current_token
+    def type_spec(self):
+        """Analyse d'un type : IN, IR, STR, BINARY, TAB ou TAB<type>"""
+        token = self.current_token
         self.eat('TYPE')
+        if token.value == 'TAB' and self.current_token.type == 'LT':
+            self.eat('LT')
+            element = self.current_token
+            self.eat('TYPE')
+            self.eat('GT')
+            token = Token('TYPE', f'TAB<{element.value}>')
+        return token
+
+    def declaration(self):
+        """Analyse d'une déclaration de variable (ou d'un tableau de taille donnée)"""
+        type_token = self.type_spec()
         var_token = self.current_token
         self.eat('ID')
+        if self.current_token.type == 'LBRACKET':
+            self.eat('LBRACKET')
+            size_node = self.expr()
+            self.eat('RBRACKET')
+            self.eat('SEMICOLON')
+            return ArrayDeclaration(type_token, Variable(var_token), size_node)
         self.eat('ASSIGN')
         value_node = self.expr()
         self.eat('SEMICOLON')
+        if type(value_node) is ArrayLiteral:
+            value_node.element_type = element_type(type_token.value)
         return Declaration(type_token, Variable(var_token), value_node)
 
     def assignment(self):
-        """Analyse d'une assignation"""
-        var = Variable(self.current_token)
+        """Analyse d'une assignation (ou d'un appel de fonction seul)"""
+        name = self.current_token
         self.eat('ID')
+        if self.current_token.type == 'LPAREN':
+            node = self.call(name)
+            self.eat('SEMICOLON')
+            return node
+        if self.current_token.type == 'LBRACKET':
+            target = self.subscript(Variable(name))
+            token = self.current_token
+            self.eat('ASSIGN')
+            expr = self.expr()
+            self.eat('SEMICOLON')
+            return ArrayAssign(target, token, expr)
+        var = Variable(name)
         token = self.current_token
         self.eat('ASSIGN')
         expr = self.expr()
@@ -269,6 +449,99 @@ class Parser:
         self.eat('END')
         return IfStatement(condition, if_block, else_block)
 
+    def block(self):
+        """Analyse d'un bloc d'instructions entre accolades"""
+        self.eat('LBRACE')
+        statements = []
+        while self.current_token.type != 'RBRACE':
+            statements.append(self.statement())
+        self.eat('RBRACE')
+        return Block(statements)
+
+    def while_statement(self):
+        """Analyse d'une boucle while : while condition { ... }"""
+        self.eat('WHILE')
+        condition = self.expr()
+        body = self.block()
+        return WhileLoop(condition, body)
+
+    def for_statement(self):
+        """Analyse d'une boucle for : for (init; condition; mise à jour;) { ... }"""
+        self.eat('FOR')
+        self.eat('LPAREN')
+        if self.current_token.type == 'TYPE':
+            init = self.declaration()
+        else:
+            init = self.assignment()
+        condition = self.expr()
+        self.eat('SEMICOLON')
+        update = self.assignment()
+        self.eat('RPAREN')
+        body = self.block()
+        return ForLoop(init, condition, update, body)
+
+    def function_declaration(self):
+        """Analyse d'une fonction : function nom(TYPE a, ...) TYPE { ... }"""
+        self.eat('FUNCTION')
+        name = self.current_token
+        self.eat('ID')
+        self.eat('LPAREN')
+        params = []
+        if self.current_token.type != 'RPAREN':
+            params.append(self.parameter())
+            while self.current_token.type == 'COMMA':
+                self.eat('COMMA')
+                params.append(self.parameter())
+        self.eat('RPAREN')
+        return_type = self.type_spec()
+        body = self.block()
+        return FunctionDecl(name, params, return_type, body)
+
+    def parameter(self):
+        """Analyse d'un paramètre : TYPE nom"""
+        type_token = self.type_spec()
+        var = Variable(self.current_token)
+        self.eat('ID')
+        return Param(type_token, var)
+
+    def call(self, name):
+        """Analyse des arguments d'un appel, après le nom de la fonction"""
+        self.eat('LPAREN')
+        args = []
+        if self.current_token.type != 'RPAREN':
+            args.append(self.expr())
+            while self.current_token.type == 'COMMA':
+                self.eat('COMMA')
+                args.append(self.expr())
+        self.eat('RPAREN')
+        return FunctionCall(name, args)
+
+    def subscript(self, array):
+        """Analyse d'un accès à un élément : tableau[indice]"""
+        self.eat('LBRACKET')
+        index = self.expr()
+        self.eat('RBRACKET')
+        return ArrayAccess(array, index)
+
+    def array_literal(self):
+        """Analyse d'un tableau littéral : [a, b, ...]"""
+        self.eat('LBRACKET')
+        elements = []
+        if self.current_token.type != 'RBRACKET':
+            elements.append(self.expr())
+            while self.current_token.type == 'COMMA':
+                self.eat('COMMA')
+                elements.append(self.expr())
+        self.eat('RBRACKET')
+        return ArrayLiteral(elements)
+
+    def return_statement(self):
+        """Analyse d'une instruction return"""
+        self.eat('RETURN')
+        expr = self.expr()
+        self.eat('SEMICOLON')
+        return Return(expr)
+
     def output_statement(self):
         """Analyse d'une instruction output"""
         self.eat('OUTPUT')
@@ -324,7 +597,13 @@ class Parser:
             return Boolean(token)
         elif token.type == 'ID':
             self.eat('ID')
+            if self.current_token.type == 'LPAREN':
+                return self.call(token)
+            if self.current_token.type == 'LBRACKET':
+                return self.subscript(Variable(token))
             return Variable(token)
+        elif token.type == 'LBRACKET':
+            return self.array_literal()
         elif token.type == 'LPAREN':
             self.eat('LPAREN')
             node = self.expr()
@@ -337,11 +616,540 @@ class Parser:
         return self.program()
 
 
+# Table de dispatch des visiteurs, construite une fois par classe
+class _DispatchTable(dict):
+    """Associe chaque type de nœud à la méthode visit_<Type> de la classe"""
+
+    def __init__(self, owner):
+        super().__init__()
+        self.owner = owner
+
+    def __missing__(self, node_type):
+        # Résolu au premier nœud de ce type, puis servi depuis le dictionnaire
+        method = getattr(self.owner, f'visit_{node_type.__name__}', self.owner.generic_visit)
+        self[node_type] = method
+        return method
+
+
+# Valeur d'un emplacement dont la variable n'est pas encore déclarée
+_UNSET = object()
+
+
+# Résolution des variables - Attribue un emplacement (profondeur, indice) à chaque variable
+class Resolver:
+    def __init__(self):
+        # Portées, de la globale (profondeur 0) à la plus interne : nom -> indice
+        self.scopes = [{}]
+        # Fonctions déclarées (remontées en tête du programme) : nom -> FunctionDecl
+        self.functions = {}
+        # Fonction en cours de résolution, ses appels et les fonctions à effets
+        self.function = None
+        self.calls = {}
+        self.impure = set()
+
+    def resolve(self, tree):
+        """Résout les variables de l'arbre et retourne les noms de la portée globale"""
+        self.visit(tree)
+        return self.names(self.scopes[0])
+
+    def names(self, scope):
+        """Noms d'une portée, dans l'ordre de leurs indices"""
+        return list(scope)
+
+    def enter_scope(self):
+        self.scopes.append({})
+
+    def exit_scope(self):
+        """Quitte la portée courante et retourne ses noms"""
+        return self.names(self.scopes.pop())
+
+    def bind(self, node, depth):
+        scope = self.scopes[depth]
+        index = scope.get(node.value)
+        if index is None:
+            index = scope[node.value] = len(scope)
+        node.depth = depth
+        node.index = index
+
+    def declare(self, node):
+        """Une déclaration crée la variable dans la portée courante"""
+        self.bind(node, len(self.scopes) - 1)
+
+    def pure_functions(self):
+        """Fonctions sans effet (ni output, ni accès aux globales) n'appelant que des fonctions pures"""
+        pure = set(self.functions) - self.impure
+        # Les réductions prédéfinies sont pures, sauf si une fonction les remplace
+        builtins = REDUCTIONS.keys() - self.functions.keys()
+        changed = True
+        while changed:
+            changed = False
+            for name in list(pure):
+                if not self.calls[name] <= pure | builtins:
+                    pure.discard(name)
+                    changed = True
+        return pure
+
+    def visit(self, node):
+        return self._dispatch[type(node)](self, node)
+
+    def generic_visit(self, node):
+        """Parcours générique des nœuds enfants"""
+        for name in type(node).__slots__:
+            child = getattr(node, name, None)
+            if isinstance(child, AST):
+                self.visit(child)
+            elif isinstance(child, list):
+                for item in child:
+                    self.visit(item)
+
+    def visit_Block(self, node):
+        for statement in node.statements:
+            self.visit(statement)
+
+    def visit_BinOp(self, node):
+        # Chaîne à gauche parcourue sans récursion
+        rights = []
+        while type(node) is BinOp:
+            rights.append(node.right)
+            node = node.left
+        self.visit(node)
+        for right in reversed(rights):
+            self.visit(right)
+
+    def visit_Num(self, node):
+        pass
+
+    visit_String = visit_Boolean = visit_Num
+
+    def visit_Variable(self, node):
+        # Recherche de la portée la plus interne vers la globale ; une
+        # variable jamais déclarée va dans la portée globale et l'erreur est
+        # levée à l'exécution
+        name = node.value
+        scopes = self.scopes
+        depth = len(scopes) - 1
+        while depth and name not in scopes[depth]:
+            depth -= 1
+        scope = scopes[depth]
+        index = scope.get(name)
+        if index is None:
+            index = scope[name] = len(scope)
+        node.depth = depth
+        node.index = index
+        if depth == 0 and self.function is not None:
+            # Lecture ou écriture d'une globale depuis une fonction
+            self.impure.add(self.function)
+
+    def visit_Declaration(self, node):
+        self.visit(node.value_node)
+        self.declare(node.var_node)
+
+    def visit_ArrayDeclaration(self, node):
+        self.visit(node.size_node)
+        self.declare(node.var_node)
+        self.allocates()
+
+    def visit_ArrayLiteral(self, node):
+        for element in node.elements:
+            self.visit(element)
+        self.allocates()
+
+    def visit_ArrayAssign(self, node):
+        # Modifie un tableau qui peut appartenir à l'appelant
+        if self.function is not None:
+            self.impure.add(self.function)
+        self.visit(node.right)
+        self.visit(node.target)
+
+    def allocates(self):
+        """Un tableau créé est un nouvel objet à chaque appel : pas de mémoïsation"""
+        if self.function is not None:
+            self.impure.add(self.function)
+
+    def visit_FunctionDecl(self, node):
+        if node.name in self.functions:
+            raise Exception(f'Fonction {node.name} déjà définie')
+        self.functions[node.name] = node
+        self.function = node.name
+        self.calls[node.name] = set()
+        self.enter_scope()
+        for param in node.params:
+            if param.var_node.value in self.scopes[-1]:
+                raise Exception(f'Paramètre {param.var_node.value} déjà défini')
+            self.declare(param.var_node)
+        self.visit(node.body)
+        node.frame_size = len(self.exit_scope())
+        self.function = None
+
+    def visit_FunctionCall(self, node):
+        if self.function is not None:
+            self.calls[self.function].add(node.name)
+        for arg in node.args:
+            self.visit(arg)
+
+    def visit_OutputStatement(self, node):
+        if self.function is not None:
+            self.impure.add(self.function)
+        self.visit(node.expression)
+
+    def visit_Return(self, node):
+        node.tail = self.function is not None and type(node.value) is FunctionCall
+        self.visit(node.value)
+
+    def visit_Assign(self, node):
+        self.visit(node.right)
+        self.visit(node.left)
+
+
+Resolver._dispatch = _DispatchTable(Resolver)
+
+
+# Vérifications de type des déclarations, identiques à visit_Declaration
+DECLARATION_TYPES = {
+    'IN': int,
+    'IR': (int, float),
+    'STR': str,
+    'BINARY': bool,
+}
+
+_CONSTANT_NODES = (Num, String, Boolean)
+
+
+def conform_array(type_name, value):
+    """Tableau accepté pour le type TAB<élément> déclaré, ou None"""
+    if not isinstance(value, TypedArray):
+        return None
+    element = element_type(type_name)
+    if element is None or value.element_type == element:
+        return value
+    if element == 'IR' and value.element_type == 'IN':
+        # Comme un IN pour un IR : converti en un TAB<IR>
+        return TypedArray.from_values('IR', value)
+    return None
+
+
+def reassigned_array(name, current, value):
+    """Tableau affecté à la variable TAB name : il garde le type TAB<élément>
+    de son tableau actuel, comme pour une déclaration"""
+    type_name = f'TAB<{current.element_type}>'
+    array = conform_array(type_name, value)
+    if array is None:
+        raise TypeError(f"La variable {name} doit être de type {type_name}")
+    return array
+
+
+# Chemin rapide des boucles - Condition et corps précompilés en fermetures
+class LoopCompiler:
+    """Compile une boucle en fermetures liées à un interpréteur"""
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.frames = interpreter.frames
+
+    def statement(self, node):
+        method = getattr(self, f'statement_{type(node).__name__}', None)
+        if method is None:
+            # Nœud sans version compilée : exécuté par le visiteur
+            visit = self.interpreter.visit
+            return lambda: visit(node)
+        return method(node)
+
+    def expression(self, node):
+        if isinstance(node, _CONSTANT_NODES):
+            value = node.value
+            return lambda: value
+        method = getattr(self, f'expression_{type(node).__name__}', None)
+        if method is None:
+            visit = self.interpreter.visit
+            return lambda: visit(node)
+        return method(node)
+
+    # --- Instructions --- #
+
+    def statement_Block(self, node):
+        statements = tuple(self.statement(statement) for statement in node.statements)
+        if len(statements) == 1:
+            return statements[0]
+
+        def block():
+            for statement in statements:
+                statement()
+        return block
+
+    def statement_Declaration(self, node):
+        var = node.var_node
+        value = self.expression(node.value_node)
+        frames, depth, index = self.frames, var.depth, var.index
+        type_name = node.type_node.value
+        expected = DECLARATION_TYPES.get(type_name)
+        message = f"La variable {var.value} doit être de type {type_name}"
+
+        if not self.interpreter.checked and not type_name.startswith('TAB'):
+            def unchecked_declaration():
+                frames[depth][index] = value()
+            return unchecked_declaration
+
+        if type_name.startswith('TAB'):
+            def array_declaration():
+                result = conform_array(type_name, value())
+                if result is None:
+                    raise TypeError(message)
+                frames[depth][index] = result
+            return array_declaration
+
+        def declaration():
+            result = value()
+            if expected is not None and not isinstance(result, expected):
+                raise TypeError(message)
+            frames[depth][index] = result
+        return declaration
+
+    def statement_Assign(self, node):
+        var = node.left
+        value = self.expression(node.right)
+        frames, depth, index = self.frames, var.depth, var.index
+        message = f'Variable {var.value} non déclarée'
+
+        def assign():
+            frame = frames[depth]
+            current = frame[index]
+            if current is _UNSET:
+                raise NameError(message)
+            if type(current) is TypedArray:
+                frame[index] = reassigned_array(var.value, current, value())
+            else:
+                frame[index] = value()
+        return assign
+
+    def statement_ArrayAssign(self, node):
+        array = self.expression(node.target.array)
+        index = self.expression(node.target.index)
+        value = self.expression(node.right)
+
+        def array_assign():
+            array()[index()] = value()
+        return array_assign
+
+    def statement_OutputStatement(self, node):
+        expression = self.expression(node.expression)
+        append = self.interpreter.output_buffer.append
+
+        def output_statement():
+            append(str(expression()))
+        return output_statement
+
+    def statement_IfStatement(self, node):
+        condition = self.expression(node.condition)
+        if_block = self.statement(node.if_block)
+        if node.else_block is None:
+            def if_only():
+                if condition():
+                    if_block()
+            return if_only
+
+        else_block = self.statement(node.else_block)
+
+        def if_else():
+            if condition():
+                if_block()
+            else:
+                else_block()
+        return if_else
+
+    def statement_WhileLoop(self, node):
+        condition = self.expression(node.condition)
+        body = self.statement(node.body)
+
+        if self.interpreter.max_steps is not None:
+            step = self.interpreter.step
+
+            def counted_while_loop():
+                while condition():
+                    step()
+                    body()
+            return counted_while_loop
+
+        def while_loop():
+            while condition():
+                body()
+        return while_loop
+
+    def statement_ForLoop(self, node):
+        init = self.statement(node.init)
+        condition = self.expression(node.condition)
+        update = self.statement(node.update)
+        body = self.statement(node.body)
+
+        if self.interpreter.max_steps is not None:
+            step = self.interpreter.step
+
+            def counted_for_loop():
+                init()
+                while condition():
+                    step()
+                    body()
+                    update()
+            return counted_for_loop
+
+        def for_loop():
+            init()
+            while condition():
+                body()
+                update()
+        return for_loop
+
+    # --- Expressions --- #
+
+    def expression_Variable(self, node):
+        frames, depth, index = self.frames, node.depth, node.index
+        message = f'Variable {node.value} non définie'
+
+        def variable():
+            value = frames[depth][index]
+            if value is _UNSET:
+                raise NameError(message)
+            return value
+        return variable
+
+    def expression_ArrayAccess(self, node):
+        array = self.expression(node.array)
+        index = self.expression(node.index)
+        return lambda: array()[index()]
+
+    def expression_BinOp(self, node):
+        apply = node.apply
+        # Opérande constant intégré directement dans la fermeture
+        if isinstance(node.right, _CONSTANT_NODES):
+            constant = node.right.value
+            left = self.expression(node.left)
+            return lambda: apply(left(), constant)
+        if isinstance(node.left, _CONSTANT_NODES):
+            constant = node.left.value
+            right = self.expression(node.right)
+            return lambda: apply(constant, right())
+        left = self.expression(node.left)
+        right = self.expression(node.right)
+        return lambda: apply(left(), right())
+
+
+# Taille par défaut du cache de chaque fonction pure (0 : pas de mémoïsation)
+DEFAULT_MEMO_SIZE = 1024
+
+# Profondeur d'appels de fonctions permise. Un appel non terminal occupe une
+# dizaine de frames Python : la limite de récursion est relevée en conséquence
+# pendant interpret(). Avant Python 3.11 chaque frame consomme aussi la pile C,
+# d'où une profondeur plus faible.
+FRAMES_PER_CALL = 12
+MAX_CALL_DEPTH = 20000 if sys.version_info >= (3, 11) else 1000
+
+
+class ReturnSignal(Exception):
+    """Levée par return, remonte jusqu'à l'appel de la fonction"""
+
+    def __init__(self, value):
+        self.value = value
+
+
+class TailCall(Exception):
+    """Levée par un return d'appel : l'appel en cours est remplacé par celui-ci"""
+
+    def __init__(self, function, args):
+        self.function = function
+        self.args = args
+
+
+class MemoCache:
+    """Cache LRU borné des résultats d'une fonction pure, indexé par ses arguments"""
+    __slots__ = ('results', 'max_size', 'hits', 'misses')
+
+    def __init__(self, max_size):
+        self.results = {}
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(args):
+        """Clé d'un appel : chaque argument accompagné de son type, car 1 == 1.0 == YES"""
+        return tuple([(type(arg), arg) for arg in args])
+
+    def get(self, args):
+        """Résultat en cache, ou _UNSET"""
+        results = self.results
+        args = self.key(args)
+        try:
+            value = results.pop(args)
+        except KeyError:
+            self.misses += 1
+            return _UNSET
+        except TypeError:
+            # Arguments non hachables : pas de mise en cache
+            return _UNSET
+        # Réinséré en dernier : le plus récemment utilisé
+        results[args] = value
+        self.hits += 1
+        return value
+
+    def put(self, args, value):
+        results = self.results
+        try:
+            results[self.key(args)] = value
+        except TypeError:
+            return
+        if len(results) > self.max_size:
+            # Les dictionnaires conservent l'ordre d'insertion : le premier est le moins récent
+            del results[next(iter(results))]
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.results)}
+
+
 # Interpréteur - Exécute l'arbre syntaxique
 class Interpreter:
-    def __init__(self):
-        self.variables = {}
-        self.output_buffer = []
+    # Types vérifiés à l'exécution (déclarations, paramètres, valeurs retournées)
+    checked = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = _DispatchTable(cls)
+
+    def __init__(self, memo_size=DEFAULT_MEMO_SIZE, max_steps=None, output=None,
+                 max_depth=MAX_CALL_DEPTH):
+        self.resolver = Resolver()
+        # Un frame (tableau de valeurs) par profondeur de portée : 0 pour les
+        # globales, 1 pour les locales de l'appel de fonction en cours
+        self.frames = [[], []]
+        self.names = []
+        # Destination des sorties : liste par défaut, ou un puits d'OutputRexi
+        self.output_buffer = [] if output is None else output
+        # Boucles déjà compilées par LoopCompiler
+        self.loops = {}
+        self.functions = {}
+        # Caches des fonctions pures : nom -> MemoCache
+        self.memo_size = memo_size
+        self.memo = {}
+        # Budget d'itérations de boucle et d'appels de fonction (None : illimité)
+        self.max_steps = max_steps
+        self.steps = 0
+        # Profondeur maximale des appels non terminaux
+        self.max_depth = max_depth
+
+    def step(self):
+        """Compte une itération de boucle ou un appel de fonction"""
+        self.steps += 1
+        if self.steps > self.max_steps:
+            raise RuntimeError(f"Limite de {self.max_steps} étapes dépassée")
+
+    def memo_stats(self):
+        """Statistiques des caches de mémoïsation, par fonction"""
+        return {name: cache.stats() for name, cache in self.memo.items()}
+
+    @property
+    def variables(self):
+        """Variables globales déclarées, reconstruites à partir du frame global"""
+        return {
+            name: value for name, value in zip(self.names, self.frames[0]) if value is not _UNSET
+        }
 
     def visit_Block(self, node):
         """Exécute un bloc d'instructions"""
@@ -364,10 +1172,36 @@ class Interpreter:
             raise TypeError(f"La variable {var_name} doit être de type STR")
         elif type_name == 'BINARY' and not isinstance(var_value, bool):
             raise TypeError(f"La variable {var_name} doit être de type BINARY")
+        elif type_name.startswith('TAB'):
+            array = conform_array(type_name, var_value)
+            if array is None:
+                raise TypeError(f"La variable {var_name} doit être de type {type_name}")
+            var_value = array
 
-        self.variables[var_name] = var_value
+        self.frames[node.var_node.depth][node.var_node.index] = var_value
         return var_value
 
+    def visit_ArrayDeclaration(self, node):
+        """Crée un tableau typé de taille donnée, rempli de la valeur par défaut du type"""
+        array = TypedArray.zeros(node.element_type, self.visit(node.size_node))
+        self.frames[node.var_node.depth][node.var_node.index] = array
+        return array
+
+    def visit_ArrayLiteral(self, node):
+        values = [self.visit(element) for element in node.elements]
+        if node.element_type is not None:
+            return TypedArray.from_values(node.element_type, values)
+        return TypedArray.from_literal(values)
+
+    def visit_ArrayAccess(self, node):
+        return self.visit(node.array)[self.visit(node.index)]
+
+    def visit_ArrayAssign(self, node):
+        array = self.visit(node.target.array)
+        index = self.visit(node.target.index)
+        value = array[index] = self.visit(node.right)
+        return value
+
     def visit_IfStatement(self, node):
         """Exécute une structure conditionnelle"""
         if self.visit(node.condition):
@@ -376,6 +1210,115 @@ class Interpreter:
             return self.visit(node.else_block)
         return None
 
+    def visit_WhileLoop(self, node):
+        """Exécute une boucle par le chemin rapide (fermetures précompilées)"""
+        loop = self.loops.get(node)
+        if loop is None:
+            loop = self.loops[node] = LoopCompiler(self).statement(node)
+        loop()
+        return None
+
+    visit_ForLoop = visit_WhileLoop
+
+    def visit_FunctionDecl(self, node):
+        # Les fonctions sont enregistrées avant l'exécution par Resolver
+        return None
+
+    def visit_Return(self, node):
+        if not node.tail or node.value.name not in self.functions:
+            raise ReturnSignal(self.visit(node.value))
+        # Appel terminal : exécuté par la boucle de call() de l'appel en cours
+        function, args = self.arguments(node.value)
+        cache = self.memo.get(function.name)
+        if cache is not None:
+            value = cache.get(args)
+            if value is not _UNSET:
+                raise ReturnSignal(value)
+        raise TailCall(function, args)
+
+    def arguments(self, node):
+        """Fonction appelée et valeurs de ses arguments"""
+        function = self.functions.get(node.name)
+        if function is None:
+            raise NameError(f'Fonction {node.name} non définie')
+        if len(node.args) != len(function.params):
+            raise TypeError(f'La fonction {node.name} attend {len(function.params)} '
+                            f'arguments, {len(node.args)} donnés')
+        return function, tuple([self.visit(arg) for arg in node.args])
+
+    def visit_FunctionCall(self, node):
+        """Exécute un appel de fonction, par le cache si la fonction est pure"""
+        if node.name not in self.functions and node.name in REDUCTIONS:
+            return self.builtin(node)
+        function, args = self.arguments(node)
+        cache = self.memo.get(node.name)
+        if cache is None:
+            return self.call(function, args)
+        value = cache.get(args)
+        if value is _UNSET:
+            value = self.call(function, args)
+            cache.put(args, value)
+        return value
+
+    def builtin(self, node):
+        """Appel d'une réduction prédéfinie (sum, min, max, len) sur un tableau"""
+        if len(node.args) != 1:
+            raise TypeError(f'La fonction {node.name} attend 1 argument, {len(node.args)} donnés')
+        return REDUCTIONS[node.name](self.visit(node.args[0]))
+
+    def frame(self, function, args):
+        """Nouveau frame d'un appel, paramètres vérifiés et placés en tête"""
+        frame = [_UNSET] * function.frame_size
+        for index, param in enumerate(function.params):
+            value = args[index]
+            type_name = param.type_node.value
+            expected = DECLARATION_TYPES.get(type_name)
+            if type_name.startswith('TAB'):
+                value = conform_array(type_name, value)
+            if value is None or expected is not None and not isinstance(value, expected):
+                raise TypeError(f"Le paramètre {param.var_node.value} de {function.name} "
+                                f"doit être de type {type_name}")
+            frame[index] = value
+        return frame
+
+    def call(self, function, args):
+        """Exécute une fonction ; les appels terminaux bouclent ici au lieu de s'empiler"""
+        frames = self.frames
+        caller = frames[1]
+        # Fonctions dont la valeur retournée est celle de cet appel
+        returning = [function]
+        try:
+            while True:
+                if self.max_steps is not None:
+                    self.step()
+                frames[1] = self.frame(function, args)
+                try:
+                    self.visit(function.body)
+                except TailCall as tail:
+                    function, args = tail.function, tail.args
+                    if function is not returning[-1]:
+                        returning.append(function)
+                    continue
+                except ReturnSignal as signal:
+                    value = signal.value
+                    break
+                return None
+        finally:
+            frames[1] = caller
+        return self.returned(returning, value)
+
+    def returned(self, returning, value):
+        """Valeur retournée, vérifiée du dernier appelé au premier comme si les appels s'étaient empilés"""
+        for function in reversed(returning):
+            type_name = function.return_type.value
+            expected = DECLARATION_TYPES.get(type_name)
+            if type_name.startswith('TAB'):
+                value = conform_array(type_name, value)
+            if value is None or expected is not None and not isinstance(value, expected):
+                raise TypeError(f"La fonction {function.name} doit retourner "
+                                f"une valeur de type {function.return_type.value}")
+        return value
+
     def visit_OutputStatement(self, node):
         """Exécute une instruction output"""
         value = self.visit(node.expression)
@@ -384,24 +1327,18 @@ class Interpreter:
 
     def visit_BinOp(self, node):
         """Exécute une opération binaire"""
-        if node.op.type == 'PLUS':
-            return self.visit(node.left) + self.visit(node.right)
-        elif node.op.type == 'MINUS':
-            return self.visit(node.left) - self.visit(node.right)
-        elif node.op.type == 'MULTIPLY':
-            return self.visit(node.left) * self.visit(node.right)
-        elif node.op.type == 'DIVIDE':
-            return self.visit(node.left) / self.visit(node.right)
-        elif node.op.type == 'GT':
-            return self.visit(node.left) > self.visit(node.right)
-        elif node.op.type == 'LT':
-            return self.visit(node.left) < self.visit(node.right)
-        elif node.op.type == 'GTE':
-            return self.visit(node.left) >= self.visit(node.right)
-        elif node.op.type == 'LTE':
-            return self.visit(node.left) <= self.visit(node.right)
-        elif node.op.type == 'EQUALS':
-            return self.visit(node.left) == self.visit(node.right)
+        left = node.left
+        if type(left) is not BinOp:
+            return node.apply(self.visit(left), self.visit(node.right))
+        # Chaîne à gauche (a + b + c + ...) évaluée sans récursion
+        chain = [node]
+        while type(left) is BinOp:
+            chain.append(left)
+            left = left.left
+        value = self.visit(left)
+        for operation in reversed(chain):
+            value = operation.apply(value, self.visit(operation.right))
+        return value
 
     def visit_Num(self, node):
         return node.value
@@ -413,37 +1350,88 @@ class Interpreter:
         return node.value
 
     def visit_Variable(self, node):
-        var_name = node.value
-        if var_name not in self.variables:
-            raise NameError(f'Variable {var_name} non définie')
-        return self.variables[var_name]
+        value = self.frames[node.depth][node.index]
+        if value is _UNSET:
+            raise NameError(f'Variable {node.value} non définie')
+        return value
 
     def visit_Assign(self, node):
-        var_name = node.left.value
-        if var_name not in self.variables:
-            raise NameError(f'Variable {var_name} non déclarée')
-        self.variables[var_name] = self.visit(node.right)
-        return self.variables[var_name]
+        var = node.left
+        frame = self.frames[var.depth]
+        current = frame[var.index]
+        if current is _UNSET:
+            raise NameError(f'Variable {var.value} non déclarée')
+        value = self.visit(node.right)
+        if type(current) is TypedArray:
+            value = reassigned_array(var.value, current, value)
+        frame[var.index] = value
+        return value
 
     def visit(self, node):
-        method_name = f'visit_{type(node).__name__}'
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
+        return self._dispatch[type(node)](self, node)
 
     def generic_visit(self, node):
         raise Exception(f'Pas de méthode visit_{type(node).__name__}')
 
     def interpret(self, tree):
         """Lance l'interprétation"""
-        return self.visit(tree)
+        self.names = self.resolver.resolve(tree)
+        # Nouvelles variables globales : emplacements ajoutés au frame global
+        self.frames[0].extend([_UNSET] * (len(self.names) - len(self.frames[0])))
+        self.functions = self.resolver.functions
+        if self.memo_size:
+            for name in self.resolver.pure_functions():
+                self.memo.setdefault(name, MemoCache(self.memo_size))
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, self.max_depth * FRAMES_PER_CALL))
+        try:
+            return self.visit(tree)
+        except ReturnSignal:
+            # return au niveau global : fin du programme
+            return None
+        finally:
+            sys.setrecursionlimit(limit)
+
+
+Interpreter._dispatch = _DispatchTable(Interpreter)
+
+
+class UncheckedInterpreter(Interpreter):
+    """Interpréteur sans vérification de type, pour les programmes validés
+    par TypeCheckRexi : seules les conversions de TAB<IN> en TAB<IR> restent"""
+    checked = False
+
+    def arguments(self, node):
+        # Fonction et nombre d'arguments déjà vérifiés par TypeCheckRexi
+        return self.functions[node.name], tuple([self.visit(arg) for arg in node.args])
+
+    def visit_Declaration(self, node):
+        var_value = self.visit(node.value_node)
+        if node.type_node.value.startswith('TAB'):
+            var_value = conform_array(node.type_node.value, var_value)
+        self.frames[node.var_node.depth][node.var_node.index] = var_value
+        return var_value
+
+    def frame(self, function, args):
+        frame = list(args)
+        frame.extend([_UNSET] * (function.frame_size - len(args)))
+        for index in function.array_params:
+            frame[index] = conform_array(function.params[index].type_node.value, frame[index])
+        return frame
+
+    def returned(self, returning, value):
+        for function in reversed(returning):
+            if function.return_type.value.startswith('TAB'):
+                value = conform_array(function.return_type.value, value)
+        return value
 
 
 # Fonction principale d'exécution
-def execute_rexi(source_code):
+def execute_rexi(source_code, max_steps=None, output=None):
     try:
         lexer = Lexer(source_code)
         parser = Parser(lexer)
-        interpreter = Interpreter()
+        interpreter = Interpreter(max_steps=max_steps, output=output)
 
         tree = parser.parse()
         interpreter.interpret(tree)
@@ -453,6 +1441,10 @@ def execute_rexi(source_code):
             'output': interpreter.output_buffer,
             'variables': interpreter.variables
         }
+    except RecursionError:
+        return {
+            'error': 'Profondeur de récursion maximale dépassée'
+        }
     except Exception as e:
         return {
             'error': str(e)
@@ -460,7 +1452,7 @@ def execute_rexi(source_code):
 
 
 # Exemple d'utilisation
-def Run (source_code) :
+def Run (source_code, max_steps=None) :
     # Programme de test
     program = """
     IN age = 25;
@@ -475,7 +1467,7 @@ def Run (source_code) :
     end
     """
 
-    result = execute_rexi(source_code)
+    result = execute_rexi(source_code, max_steps)
     if 'error' in result:
         out  = f"Erreur: {result['error']}\n"
     else:
@@ -0,0 +1,230 @@
+"""Optimization passes over the three-address code of CompilerRexi.
+
+The passes rely on a property of CodeGenerator output: every temporary is
+assigned exactly once, before its uses. They must therefore run before
+any pass that reuses temporaries (register allocation).
+
+- constant folding: binary operations on constant temporaries, and
+  conditional jumps on constant conditions
+- copy propagation: a LOAD of a variable whose value is already held by a
+  temporary of the same basic block is removed and its uses renamed
+- jump threading: jumps to jumps are retargeted, jumps to the next
+  instruction and unreachable instructions are removed, unused labels are
+  dropped (which merges basic blocks for the next round)
+- dead temporary elimination: constants that are no longer read
+"""
+from VMRexi import BINARY_OPERATORS
+
+COMPARISONS = {'>', '<', '>=', '<=', '==', '!='}
+
+# Instructions after which the value of a variable is no longer known
+BLOCK_BOUNDARIES = {'LABEL', 'JUMP', 'RETURN', 'CALL', 'FUNCTION', 'END_FUNCTION'}
+
+# Instructions that never continue to the next one
+UNCONDITIONAL = {'JUMP', 'RETURN'}
+
+# Fields (1 = arg1, 2 = arg2) of each instruction that read a temporary
+TEMP_READS = {
+    'ASSIGN': (1,),
+    'JUMPIF': (1,),
+    'RETURN': (1,),
+    'OUTPUT': (1,),
+    'ARRAY_ACCESS': (2,),
+    'ARRAY_STORE': (1, 2),
+}
+TEMP_READS.update({op: (1, 2) for op in BINARY_OPERATORS})
+
+# Instructions whose result field is a temporary
+TEMP_WRITES = {'LOAD_CONST', 'LOAD', 'CALL', 'ARRAY_ACCESS'} | set(BINARY_OPERATORS)
+
+
+def temp_reads(instruction):
+    """Temporaries read by an instruction"""
+    op = instruction[0]
+    if op == 'CALL':
+        return list(instruction[2])
+    return [instruction[field] for field in TEMP_READS.get(op, ()) if instruction[field] is not None]
+
+
+def temp_write(instruction):
+    """Temporary written by an instruction, or None"""
+    return instruction[3] if instruction[0] in TEMP_WRITES else None
+
+
+def rename_reads(instruction, renamed):
+    """Instruction with its temporary operands renamed"""
+    if not renamed:
+        return instruction
+    op = instruction[0]
+    if op == 'CALL':
+        args = [renamed.get(arg, arg) for arg in instruction[2]]
+        return (op, instruction[1], args, instruction[3])
+    fields = TEMP_READS.get(op)
+    if not fields:
+        return instruction
+    instruction = list(instruction)
+    for field in fields:
+        instruction[field] = renamed.get(instruction[field], instruction[field])
+    return tuple(instruction)
+
+
+def _foldable(op, left, right):
+    if op in COMPARISONS:
+        return True
+    return isinstance(left, (int, float)) and isinstance(right, (int, float))
+
+
+class Optimizer:
+    """Optimization pipeline stage; callable on a list of instructions"""
+
+    def __init__(self, max_rounds=10):
+        self.max_rounds = max_rounds
+        self.stats = {'before': 0, 'after': 0, 'rounds': 0}
+
+    @property
+    def cache_key(self):
+        """Identifies the pass and its settings in CacheRexi"""
+        return f"{__name__}.Optimizer(max_rounds={self.max_rounds})"
+
+    def __call__(self, code):
+        return self.optimize(code)
+
+    def optimize(self, code):
+        code = list(code)
+        self.stats['before'] = len(code)
+        rounds = 0
+        for rounds in range(1, self.max_rounds + 1):
+            optimized = self.fold_constants(code)
+            optimized = self.propagate_copies(optimized)
+            optimized = self.thread_jumps(optimized)
+            optimized = self.remove_dead_temps(optimized)
+            if optimized == code:
+                break
+            code = optimized
+        self.stats['after'] = len(code)
+        self.stats['rounds'] = rounds
+        return code
+
+    def report(self):
+        before, after = self.stats['before'], self.stats['after']
+        saved = 100.0 * (before - after) / before if before else 0.0
+        return f"{before} -> {after} instructions ({saved:.0f}% fewer)"
+
+    def fold_constants(self, code):
+        constants = {}
+        optimized = []
+        for instruction in code:
+            op, arg1, arg2, result = instruction
+            if op == 'LOAD_CONST':
+                constants[result] = arg1
+            elif op in BINARY_OPERATORS and arg1 in constants and arg2 in constants:
+                left, right = constants[arg1], constants[arg2]
+                if _foldable(op, left, right):
+                    try:
+                        value = BINARY_OPERATORS[op](left, right)
+                    except Exception:
+                        # Left in place so the error is raised at run time
+                        pass
+                    else:
+                        constants[result] = value
+                        instruction = ('LOAD_CONST', value, None, result)
+            elif op == 'JUMPIF' and arg1 in constants:
+                if constants[arg1]:
+                    # The condition holds: always fall through
+                    continue
+                instruction = ('JUMP', arg2, None, None)
+            optimized.append(instruction)
+        return optimized
+
+    def propagate_copies(self, code):
+        # Variable -> temporary holding its current value in this basic block
+        known = {}
+        renamed = {}
+        optimized = []
+        for instruction in code:
+            instruction = rename_reads(instruction, renamed)
+            op = instruction[0]
+            if op == 'LOAD':
+                name, temp = instruction[1], instruction[3]
+                if name in known:
+                    renamed[temp] = known[name]
+                    continue
+                known[name] = temp
+            elif op == 'ASSIGN':
+                known[instruction[3]] = instruction[1]
+            elif op == 'DECLARE':
+                known.pop(instruction[1], None)
+            elif op == 'NEW_ARRAY':
+                known.pop(instruction[3], None)
+            elif op in BLOCK_BOUNDARIES:
+                known.clear()
+            optimized.append(instruction)
+        return optimized
+
+    def thread_jumps(self, code):
+        # Label -> first instruction executed after it
+        following = {}
+        for index, instruction in enumerate(code):
+            if instruction[0] == 'LABEL':
+                position = index
+                while position < len(code) and code[position][0] == 'LABEL':
+                    position += 1
+                following[instruction[1]] = code[position] if position < len(code) else None
+
+        def final_target(label):
+            seen = {label}
+            target = following.get(label)
+            while target is not None and target[0] == 'JUMP' and target[1] not in seen:
+                label = target[1]
+                seen.add(label)
+                target = following.get(label)
+            return label
+
+        threaded = []
+        reachable = True
+        for index, instruction in enumerate(code):
+            op = instruction[0]
+            if op in ('LABEL', 'FUNCTION', 'END_FUNCTION'):
+                reachable = True
+            elif not reachable:
+                continue
+            if op in ('JUMP', 'JUMPIF'):
+                label = final_target(instruction[1] if op == 'JUMP' else instruction[2])
+                if self.falls_into(code, index + 1, label):
+                    continue
+                if op == 'JUMP':
+                    instruction = ('JUMP', label, None, None)
+                else:
+                    instruction = ('JUMPIF', instruction[1], label, None)
+            threaded.append(instruction)
+            if op in UNCONDITIONAL:
+                reachable = False
+
+        used = {instruction[1] for instruction in threaded if instruction[0] == 'JUMP'}
+        used.update(instruction[2] for instruction in threaded if instruction[0] == 'JUMPIF')
+        return [
+            instruction for instruction in threaded
+            if instruction[0] != 'LABEL' or instruction[1] in used
+        ]
+
+    def falls_into(self, code, position, label):
+        """Whether execution from position reaches label without executing anything"""
+        while position < len(code) and code[position][0] == 'LABEL':
+            if code[position][1] == label:
+                return True
+            position += 1
+        return False
+
+    def remove_dead_temps(self, code):
+        read = set()
+        for instruction in code:
+            read.update(temp_reads(instruction))
+        return [
+            instruction for instruction in code
+            if instruction[0] != 'LOAD_CONST' or instruction[3] in read
+        ]
+
+
+def optimize(code):
+    """Optimize a list of instructions"""
+    return Optimizer().optimize(code)
@@ -0,0 +1,84 @@
+"""Output sinks: where the output statements of a program go.
+
+Every engine writes each output line with output.append(text), so any
+object with an append() method is a sink. A plain list, the default,
+keeps all the lines until the end of the run. The sinks below stream the
+lines as they are produced, in constant memory:
+
+    CallbackSink(function)      calls function(line) for each line
+    FileSink(file)              writes each line to a file-like object
+    RingBuffer(max_lines)       keeps only the last max_lines lines
+    BatchSink(function)         calls function(text) with lines joined in batches
+
+    InterpreterRexi.execute_rexi(source_code, output=FileSink(sys.stdout))
+
+Sinks that hold lines back (BatchSink) or write through a buffer have a
+flush() method, to call once the run is over.
+"""
+import collections
+import time
+
+
+class CallbackSink:
+    """Calls function(line) for each output line"""
+
+    __slots__ = ('append',)
+
+    def __init__(self, function):
+        # Engines call append directly: no wrapper call per line
+        self.append = function
+
+    def flush(self):
+        pass
+
+
+class FileSink:
+    """Writes each output line, with a newline, to a file-like object"""
+
+    __slots__ = ('file',)
+
+    def __init__(self, file):
+        self.file = file
+
+    def append(self, text):
+        self.file.write(text + '\n')
+
+    def flush(self):
+        self.file.flush()
+
+
+class RingBuffer(collections.deque):
+    """Last max_lines output lines; older lines are dropped"""
+
+    def __init__(self, max_lines):
+        super().__init__(maxlen=max_lines)
+
+    def flush(self):
+        pass
+
+
+class BatchSink:
+    """Hands lines to function(text), joined, every max_lines lines or interval seconds.
+
+    Meant for consumers with a per-call cost, such as a queue to another
+    process: a million lines become a thousand calls.
+    """
+
+    def __init__(self, function, max_lines=1000, interval=0.1):
+        self.function = function
+        self.max_lines = max_lines
+        self.interval = interval
+        self.lines = []
+        self.sent = time.monotonic()
+
+    def append(self, text):
+        lines = self.lines
+        lines.append(text)
+        if len(lines) >= self.max_lines or time.monotonic() - self.sent >= self.interval:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            self.function('\n'.join(self.lines) + '\n')
+            self.lines = []
+        self.sent = time.monotonic()
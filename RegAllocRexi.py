@@ -0,0 +1,182 @@
+"""Linear-scan register allocation for the temporaries of CompilerRexi code.
+
+CodeGenerator never reuses a temporary, so a long program names tens of
+thousands of them. This pass computes their liveness over the control
+flow graph of the top level and of each function, turns it into live
+intervals, and maps the intervals onto a small register file (r0, r1...)
+reused as soon as a value is dead. Registers are numbered per function,
+so the frame of every call stays small.
+
+The pass reuses names, so it must run after OptimizerRexi.
+"""
+import heapq
+
+from OptimizerRexi import temp_reads, temp_write, rename_reads
+
+
+def _regions(code):
+    """Split instruction indices into the top level and one list per function"""
+    top_level = []
+    regions = [top_level]
+    current = top_level
+    for index, instruction in enumerate(code):
+        op = instruction[0]
+        if op == 'FUNCTION':
+            current = []
+            regions.append(current)
+        current.append(index)
+        if op == 'END_FUNCTION':
+            current = top_level
+    return regions
+
+
+class RegisterAllocator:
+    """Register allocation pipeline stage; callable on a list of instructions"""
+
+    def __init__(self):
+        self.stats = {'temps': 0, 'registers': 0}
+
+    @property
+    def cache_key(self):
+        """Identifies the pass in CacheRexi"""
+        return f"{__name__}.RegisterAllocator()"
+
+    def __call__(self, code):
+        return self.allocate(code)
+
+    def allocate(self, code):
+        code = list(code)
+        self.stats = {'temps': 0, 'registers': 0}
+        for region in _regions(code):
+            instructions = [code[index] for index in region]
+            mapping = self.allocate_region(instructions)
+            for index in region:
+                code[index] = self.rename(code[index], mapping)
+        return code
+
+    def report(self):
+        return f"{self.stats['temps']} temporaries -> {self.stats['registers']} registers"
+
+    def rename(self, instruction, mapping):
+        instruction = rename_reads(instruction, mapping)
+        written = temp_write(instruction)
+        if written is not None:
+            instruction = instruction[:3] + (mapping[written],)
+        return instruction
+
+    def allocate_region(self, instructions):
+        intervals = self.live_intervals(instructions)
+        self.stats['temps'] += len(intervals)
+
+        mapping = {}
+        free = []
+        used = 0
+        # (end, register) of the intervals currently holding a register
+        active = []
+        for start, end, temp in sorted((start, end, temp) for temp, (start, end) in intervals.items()):
+            # A register read and written by the same instruction can be shared
+            while active and active[0][0] <= start:
+                heapq.heappush(free, heapq.heappop(active)[1])
+            if free:
+                register = heapq.heappop(free)
+            else:
+                register = used
+                used += 1
+            mapping[temp] = f"r{register}"
+            heapq.heappush(active, (end, register))
+        self.stats['registers'] = max(self.stats['registers'], used)
+        return mapping
+
+    def live_intervals(self, instructions):
+        """Temporary -> (first, last) instruction index where it is live"""
+        blocks = self.basic_blocks(instructions)
+        labels = {}
+        for block, (first, last) in enumerate(blocks):
+            if instructions[first][0] == 'LABEL':
+                labels[instructions[first][1]] = block
+
+        # Positions of every read and write; upward-exposed reads per block
+        intervals = {}
+        uses = []
+        defs = []
+        successors = []
+        for block, (first, last) in enumerate(blocks):
+            used = set()
+            defined = set()
+            for index in range(first, last + 1):
+                instruction = instructions[index]
+                for temp in temp_reads(instruction):
+                    self.extend(intervals, temp, index)
+                    if temp not in defined:
+                        used.add(temp)
+                written = temp_write(instruction)
+                if written is not None:
+                    self.extend(intervals, written, index)
+                    defined.add(written)
+            uses.append(used)
+            defs.append(defined)
+
+            instruction = instructions[last]
+            op = instruction[0]
+            following = [block + 1] if block + 1 < len(blocks) else []
+            if op == 'JUMP':
+                successors.append([labels[instruction[1]]])
+            elif op == 'JUMPIF':
+                successors.append(following + [labels[instruction[2]]])
+            elif op in ('RETURN', 'END_FUNCTION'):
+                successors.append([])
+            else:
+                successors.append(following)
+
+        # Backward dataflow over the blocks, repeated until loops are stable
+        live_in = [set(used) for used in uses]
+        live_out = [set() for _ in blocks]
+        changed = True
+        while changed:
+            changed = False
+            for block in range(len(blocks) - 1, -1, -1):
+                out = set()
+                for successor in successors[block]:
+                    out |= live_in[successor]
+                if out != live_out[block]:
+                    live_out[block] = out
+                    live_in[block] = uses[block] | (out - defs[block])
+                    changed = True
+
+        # A temporary live across a block boundary covers the boundary
+        for block, (first, last) in enumerate(blocks):
+            for temp in live_in[block]:
+                self.extend(intervals, temp, first)
+            for temp in live_out[block]:
+                self.extend(intervals, temp, last)
+        return intervals
+
+    def basic_blocks(self, instructions):
+        """(first, last) instruction index of each basic block"""
+        blocks = []
+        first = 0
+        for index, instruction in enumerate(instructions):
+            op = instruction[0]
+            if op == 'LABEL' and index > first:
+                blocks.append((first, index - 1))
+                first = index
+            if op in ('JUMP', 'JUMPIF', 'RETURN'):
+                blocks.append((first, index))
+                first = index + 1
+        if first < len(instructions):
+            blocks.append((first, len(instructions) - 1))
+        return blocks
+
+    def extend(self, intervals, temp, index):
+        interval = intervals.get(temp)
+        if interval is None:
+            intervals[temp] = (index, index)
+        elif index < interval[0]:
+            intervals[temp] = (index, interval[1])
+        elif index > interval[1]:
+            intervals[temp] = (interval[0], index)
+
+
+def allocate_registers(code):
+    """Allocate registers for the temporaries of a list of instructions"""
+    return RegisterAllocator().allocate(code)
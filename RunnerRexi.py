@@ -0,0 +1,171 @@
+"""Runs Rexi programs in worker processes, so that the IDE stays responsive.
+
+An ExecutionPool keeps worker processes ready. submit() hands a job to a
+worker and returns at once; the job reports through a queue that the
+caller drains with poll(), from a Tk after() callback for instance.
+Messages are (kind, text) pairs:
+
+    ('output', text)     lines output by the program, as it runs
+    ('done', text)       the job finished; text is its result
+    ('error', text)      the job raised an exception
+    ('stopped', text)    the job ran out of time
+
+A running program cannot be interrupted from the outside, so stop() and
+the wall-clock limit terminate the workers and start fresh ones. The
+interpreter also takes an instruction budget (max_steps: loop iterations
+and function calls), which ends a runaway program without losing the
+worker.
+
+The output of a program is streamed in batches of lines. The queue is
+bounded: a worker that outputs faster than the caller polls waits for it,
+so memory stays constant however much the program outputs.
+"""
+import itertools
+import multiprocessing
+import queue
+import time
+
+import CompilerRexi
+import IncrementalRexi
+import InterpreterRexi
+import OutputRexi
+
+DEFAULT_TIME_LIMIT = 10.0
+DEFAULT_MAX_STEPS = 10_000_000
+FINAL = frozenset(('done', 'error', 'stopped'))
+# Messages waiting in the queue before a worker blocks
+QUEUE_SIZE = 64
+
+# Set in each worker process by _initialize
+_queue = None
+# Job running in this worker, set by _execute
+_job = None
+# Text of the last program compiled by this worker, parsed incrementally
+_document = None
+
+
+def _initialize(messages):
+    global _queue
+    _queue = messages
+
+
+def _execute(job, function, args):
+    global _job
+    _job = job
+    try:
+        result = function(*args)
+    except Exception as e:
+        _queue.put((job, 'error', f"{type(e).__name__}: {e}"))
+    else:
+        _queue.put((job, 'done', result))
+
+
+def _send_output(text):
+    _queue.put((_job, 'output', text))
+
+
+def interpret(source_code, max_steps=None):
+    """Interpreter mode: streams the outputs and returns the variables, or the error"""
+    output = OutputRexi.BatchSink(_send_output)
+    result = InterpreterRexi.execute_rexi(source_code, max_steps, output)
+    # Lines output before an error are shown too
+    output.flush()
+    if 'error' in result:
+        return f"Erreur: {result['error']}\n"
+    return f"Variables:{result['variables']}\n"
+
+
+def compile_document(source_code):
+    """Compiler mode: listing of the code; only the edited declarations are parsed again"""
+    global _document
+    if _document is None:
+        _document = IncrementalRexi.Document()
+    _document.update(source_code)
+    return CompilerRexi.listing(_document.compile())
+
+
+class ExecutionPool:
+    """Worker processes running one job at a time"""
+
+    def __init__(self, processes=1, time_limit=DEFAULT_TIME_LIMIT):
+        self.processes = processes
+        self.time_limit = time_limit
+        self.context = multiprocessing.get_context()
+        self.jobs = itertools.count(1)
+        self.job = None
+        self.result = None
+        # Wall-clock limit of the running job, and the time it ends at
+        self.limit = None
+        self.deadline = None
+        self.pool = None
+        self.queue = None
+        self.start()
+
+    def start(self):
+        # A worker killed while writing may leave the queue broken: use a new one
+        self.queue = self.context.Queue(QUEUE_SIZE)
+        self.pool = self.context.Pool(self.processes, _initialize, (self.queue,))
+
+    @property
+    def running(self):
+        return self.job is not None
+
+    def submit(self, function, *args, time_limit=None):
+        """Run function(*args) in a worker; function must be defined at module level"""
+        if self.running:
+            raise RuntimeError("A program is already running")
+        self.job = next(self.jobs)
+        self.result = self.pool.apply_async(_execute, (self.job, function, args))
+        self.limit = self.time_limit if time_limit is None else time_limit
+        self.deadline = time.monotonic() + self.limit if self.limit else None
+        return self.job
+
+    def poll(self):
+        """Messages of the running job received since the last call"""
+        messages = []
+        # A queue's worth at most: a program outputting without pause would keep it filled
+        for _ in range(QUEUE_SIZE):
+            if not self.running:
+                break
+            try:
+                job, kind, text = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            # Left over by a stopped job
+            if job != self.job:
+                continue
+            messages.append((kind, text))
+            if kind in FINAL:
+                self.job = None
+        if not self.running:
+            return messages
+        if self.result.ready() and not self.result.successful():
+            # The job could not reach the worker (arguments that cannot be pickled...)
+            try:
+                self.result.get()
+            except Exception as e:
+                messages.append(('error', f"{type(e).__name__}: {e}"))
+            self.job = None
+        elif self.deadline is not None and time.monotonic() > self.deadline:
+            self.kill()
+            messages.append(('stopped', f"Time limit exceeded ({self.limit:g} s)"))
+        return messages
+
+    def stop(self):
+        """Stop the running job; returns whether there was one"""
+        if not self.running:
+            return False
+        self.kill()
+        return True
+
+    def kill(self):
+        self.pool.terminate()
+        self.pool.join()
+        self.queue.close()
+        self.job = None
+        self.start()
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+        self.queue.close()
@@ -0,0 +1,147 @@
+"""Streaming tokenizer for Rexi source code.
+
+tokenize() accepts a source string or a text file object and yields
+compact Token objects carrying their line, column and absolute offset. A
+file is read in fixed-size chunks and only the unconsumed tail of the
+current chunk is kept, so memory stays constant whatever the file size.
+The token rules match the PLY lexer of CompilerRexi.
+"""
+import re
+
+# Keywords and type names
+RESERVED = {
+    'if': 'IF',
+    'then': 'THEN',
+    'else': 'ELSE',
+    'end': 'END',
+    'while': 'WHILE',
+    'for': 'FOR',
+    'function': 'FUNCTION',
+    'return': 'RETURN',
+    'output': 'OUTPUT',
+    'IN': 'TYPE',
+    'IR': 'TYPE',
+    'STR': 'TYPE',
+    'BINARY': 'TYPE',
+    'TAB': 'TYPE',
+}
+
+OPERATORS = {
+    '+': 'PLUS',
+    '-': 'MINUS',
+    '*': 'MULTIPLY',
+    '/': 'DIVIDE',
+    '=': 'ASSIGN',
+    '>': 'GT',
+    '<': 'LT',
+    '>=': 'GTE',
+    '<=': 'LTE',
+    '==': 'EQUALS',
+    '!=': 'NOTEQUALS',
+    '(': 'LPAREN',
+    ')': 'RPAREN',
+    '{': 'LBRACE',
+    '}': 'RBRACE',
+    '[': 'LBRACKET',
+    ']': 'RBRACKET',
+    ';': 'SEMICOLON',
+    ',': 'COMMA',
+}
+
+TOKEN_PATTERN = re.compile(r"""
+    (?P<NEWLINE>\n+)
+  | (?P<SPACE>[ \t\r]+)
+  | (?P<COMMENT>//[^\n]*)
+  | (?P<ID>[a-zA-Z_][a-zA-Z0-9_]*)
+  | (?P<NUMBER>\d*\.?\d+)
+  | (?P<STRING>"(?:[^"\\]|\\.)*")
+  | (?P<OPERATOR>==|!=|>=|<=|[-+*/=<>(){}\[\];,])
+  | (?P<ILLEGAL>.)
+""", re.VERBOSE)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class Token:
+    """A token with its position; ILLEGAL tokens hold an unexpected character"""
+
+    __slots__ = ('type', 'value', 'line', 'column', 'offset')
+
+    def __init__(self, type, value, line, column, offset):
+        self.type = type
+        self.value = value
+        self.line = line
+        self.column = column
+        self.offset = offset
+
+    def __repr__(self):
+        return f"Token({self.type}, {self.value!r}, {self.line}:{self.column})"
+
+
+def _chunks(source, chunk_size):
+    if isinstance(source, str):
+        yield source
+        return
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def tokenize(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the tokens of a source string or of a text file object"""
+    buffer = ""
+    # Absolute offset of buffer[0], and of the first character of the current line
+    base = 0
+    line = 1
+    line_start = 0
+    chunks = _chunks(source, chunk_size)
+    eof = False
+    while not eof:
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+        else:
+            buffer += chunk
+        size = len(buffer)
+        pos = 0
+        for match in TOKEN_PATTERN.finditer(buffer):
+            kind = match.lastgroup
+            start, end = match.span()
+            # A token touching the end of the buffer may continue in the next chunk
+            if not eof and (end + 1 >= size or (kind == 'ILLEGAL' and match.group() == '"')):
+                break
+            pos = end
+            if kind == 'NEWLINE':
+                line += end - start
+                line_start = base + end
+                continue
+            if kind == 'SPACE' or kind == 'COMMENT':
+                continue
+            text = match.group()
+            offset = base + start
+            column = offset - line_start + 1
+            if kind == 'ID':
+                yield Token(RESERVED.get(text, 'ID'), text, line, column, offset)
+            elif kind == 'OPERATOR':
+                yield Token(OPERATORS[text], text, line, column, offset)
+            elif kind == 'NUMBER':
+                value = float(text) if '.' in text else int(text)
+                yield Token('NUMBER', value, line, column, offset)
+            elif kind == 'STRING':
+                yield Token('STRING', text[1:-1], line, column, offset)
+                newlines = text.count('\n')
+                if newlines:
+                    line += newlines
+                    line_start = offset + text.rindex('\n') + 1
+            else:
+                yield Token('ILLEGAL', text, line, column, offset)
+        buffer = buffer[pos:]
+        base += pos
+
+
+def tokenize_file(path, chunk_size=DEFAULT_CHUNK_SIZE, encoding="utf-8"):
+    """Yield the tokens of a file without loading it into memory"""
+    with open(path, "r", encoding=encoding) as file:
+        yield from tokenize(file, chunk_size)
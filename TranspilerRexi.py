@@ -0,0 +1,266 @@
+"""Rexi to Python transpiler.
+
+The CompilerRexi AST is lowered to Python source, compiled once with the
+built-in compile() and the resulting code object is cached under a hash of
+the Rexi source. Rexi names are prefixed (v_ for variables, f_ for
+functions) so they never clash with Python keywords or with the runtime
+helpers. The IN/IR/STR/BINARY checks of declarations, parameters and
+return values are kept as generated guards.
+"""
+import hashlib
+
+import CompilerRexi
+from ArrayRexi import REDUCTIONS, TypedArray
+
+# isinstance() targets of the generated type guards
+TYPE_GUARDS = {
+    'IN': 'int',
+    'IR': '(int, float)',
+    'STR': 'str',
+    'BINARY': 'bool',
+}
+
+_code_cache = {}
+
+
+class _Halt(Exception):
+    """Raised by a top-level return to stop the program"""
+
+
+def _type_error(name, type_name):
+    raise TypeError(f"'{name}' must be of type {type_name}")
+
+
+def variable_name(name):
+    return f"v_{name}"
+
+
+def function_name(name):
+    return f"f_{name}"
+
+
+class Transpiler:
+    """Generates Python source from a CompilerRexi Program"""
+
+    def __init__(self):
+        self.lines = []
+        self.indent = 0
+        self.global_names = set()
+        self.function = None
+
+    def line(self, text):
+        self.lines.append("    " * self.indent + text)
+
+    def transpile(self, program):
+        # Every variable assigned outside the functions, nested blocks included,
+        # as the VM collects its global slots
+        self.global_names = set()
+        self.collect_assigned(
+            [decl for decl in program.declarations if not isinstance(decl, CompilerRexi.Function)],
+            self.global_names)
+        # Functions are hoisted so they can be called before their definition
+        for decl in program.declarations:
+            if isinstance(decl, CompilerRexi.Function):
+                self.statement(decl)
+        for decl in program.declarations:
+            if not isinstance(decl, CompilerRexi.Function):
+                self.statement(decl)
+        return "\n".join(self.lines) + "\n"
+
+    def block(self, statements):
+        self.indent += 1
+        if not statements:
+            self.line("pass")
+        for stmt in statements:
+            self.statement(stmt)
+        self.indent -= 1
+
+    def statement(self, node):
+        method = getattr(self, f'statement_{type(node).__name__.lower()}', None)
+        if method is None:
+            # Expression used as a statement (function call)
+            self.line(self.expression(node))
+        else:
+            method(node)
+
+    def expression(self, node):
+        method = getattr(self, f'expression_{type(node).__name__.lower()}', None)
+        if method is None:
+            raise Exception(f"No visitor for {type(node).__name__}")
+        return method(node)
+
+    def guard(self, target, type_name, name):
+        python_type = TYPE_GUARDS.get(type_name)
+        if python_type is not None:
+            self.line(f"if not isinstance({target}, {python_type}): "
+                      f"_type_error({name!r}, {type_name!r})")
+
+    # --- Statements --- #
+
+    def statement_function(self, node):
+        self.function = node
+        params = [variable_name(name) for _, name in node.params]
+        self.line(f"def {function_name(node.name)}({', '.join(params)}):")
+        self.indent += 1
+        assigned = set()
+        self.collect_assigned(node.body, assigned)
+        shared = sorted((assigned & self.global_names) - {name for _, name in node.params})
+        if shared:
+            self.line(f"global {', '.join(variable_name(name) for name in shared)}")
+        for type_name, name in node.params:
+            self.guard(variable_name(name), type_name, name)
+        self.indent -= 1
+        self.block(node.body)
+        self.function = None
+
+    def collect_assigned(self, statements, assigned):
+        for stmt in statements:
+            if isinstance(stmt, (CompilerRexi.VarDeclaration, CompilerRexi.ArrayDecl)):
+                assigned.add(stmt.name)
+            elif isinstance(stmt, CompilerRexi.Assignment) and isinstance(stmt.name, str):
+                assigned.add(stmt.name)
+            elif isinstance(stmt, CompilerRexi.IfStatement):
+                self.collect_assigned(stmt.if_body, assigned)
+                self.collect_assigned(stmt.else_body or [], assigned)
+            elif isinstance(stmt, CompilerRexi.WhileLoop):
+                self.collect_assigned(stmt.body, assigned)
+            elif isinstance(stmt, CompilerRexi.ForLoop):
+                self.collect_assigned([stmt.init, stmt.update], assigned)
+                self.collect_assigned(stmt.body, assigned)
+
+    def statement_vardeclaration(self, node):
+        target = variable_name(node.name)
+        self.line(f"{target} = {self.expression(node.value)}")
+        self.guard(target, node.type_node, node.name)
+
+    def statement_arraydecl(self, node):
+        self.line(f"{variable_name(node.name)} = _TypedArray.zeros({node.type_node!r}, {node.size!r})")
+
+    def statement_assignment(self, node):
+        if isinstance(node.name, CompilerRexi.ArrayAccess):
+            target = self.expression(node.name)
+        else:
+            target = variable_name(node.name)
+        self.line(f"{target} = {self.expression(node.value)}")
+
+    def statement_ifstatement(self, node):
+        self.line(f"if {self.expression(node.condition)}:")
+        self.block(node.if_body)
+        if node.else_body:
+            self.line("else:")
+            self.block(node.else_body)
+
+    def statement_whileloop(self, node):
+        self.line(f"while {self.expression(node.condition)}:")
+        self.block(node.body)
+
+    def statement_forloop(self, node):
+        self.statement(node.init)
+        self.line(f"while {self.expression(node.condition)}:")
+        self.block(node.body + [node.update])
+
+    def statement_return(self, node):
+        if self.function is None:
+            self.line("raise _Halt()")
+            return
+        if node.value is None:
+            self.line("return None")
+            return
+        self.line(f"_result = {self.expression(node.value)}")
+        self.guard("_result", self.function.return_type, self.function.name)
+        self.line("return _result")
+
+    def statement_output(self, node):
+        self.line(f"_output.append(str({self.expression(node.value)}))")
+
+    # --- Expressions --- #
+
+    def expression_binop(self, node):
+        return f"({self.expression(node.left)} {node.op} {self.expression(node.right)})"
+
+    def expression_number(self, node):
+        return repr(node.value)
+
+    def expression_string(self, node):
+        return repr(node.value)
+
+    def expression_boolean(self, node):
+        return repr(bool(node.value))
+
+    def expression_identifier(self, node):
+        return variable_name(node.name)
+
+    def expression_arrayaccess(self, node):
+        return f"{variable_name(node.array_name)}[{self.expression(node.index)}]"
+
+    def expression_functioncall(self, node):
+        args = ", ".join(self.expression(arg) for arg in node.args)
+        return f"{function_name(node.name)}({args})"
+
+
+def transpile(source_code):
+    """Translate Rexi source code to Python source code"""
+    ast = CompilerRexi.get_session().parse(source_code)
+    if not ast:
+        raise Exception("Parsing failed to produce an AST")
+    return Transpiler().transpile(ast)
+
+
+def compile_rexi(source_code):
+    """Return the cached Python code object for Rexi source code"""
+    key = hashlib.sha256(source_code.encode("utf-8")).hexdigest()
+    code = _code_cache.get(key)
+    if code is None:
+        code = _code_cache[key] = compile(transpile(source_code), "<rexi>", "exec")
+    return code
+
+
+def clear_cache():
+    _code_cache.clear()
+
+
+def run_code(code, output=None):
+    """Execute a code object from compile_rexi and collect its results"""
+    if output is None:
+        output = []
+    namespace = {'_output': output, '_type_error': _type_error, '_Halt': _Halt,
+                 '_TypedArray': TypedArray}
+    # Builtins under their Rexi function names: a Rexi function of the same name replaces them
+    namespace.update({function_name(name): function for name, function in REDUCTIONS.items()})
+    try:
+        exec(code, namespace)
+    except _Halt:
+        pass
+    except NameError as e:
+        name = e.name or ""
+        if name.startswith("v_"):
+            raise NameError(f"Variable '{name[2:]}' is not defined") from None
+        if name.startswith("f_"):
+            raise NameError(f"Function '{name[2:]}' is not defined") from None
+        raise
+    return {
+        'output': output,
+        'variables': {
+            name[2:]: value for name, value in namespace.items() if name.startswith("v_")
+        },
+    }
+
+
+def execute(source_code, output=None):
+    """Compile source code to Python and run it"""
+    try:
+        return run_code(compile_rexi(source_code), output)
+    except Exception as e:
+        return {
+            'error': str(e)
+        }
+
+
+def Run(source_code):
+    result = execute(source_code)
+    if 'error' in result:
+        out = f"Error: {result['error']}\n"
+    else:
+        out = f"Output:{result['output']}\n"
+        out += f"Variables:{result['variables']}\n"
+    return out
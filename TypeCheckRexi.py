@@ -0,0 +1,382 @@
+"""Vérification statique des types d'un programme de InterpreterRexi.
+
+Avant l'exécution, chaque expression reçoit un type (IN, IR, STR, BINARY
+ou TAB<élément>) déduit des déclarations, enregistrées dans une
+CompilerRexi.SymbolTable. Les erreurs de type sont toutes signalées sans
+rien exécuter. Un programme accepté s'exécute avec UncheckedInterpreter,
+sans les vérifications de type de chaque déclaration, appel et retour.
+
+Les règles sont plus strictes que l'exécution vérifiée : une variable
+garde son type (les affectations sont vérifiées), les conditions sont des
+BINARY et une fonction dont le résultat est utilisé doit toujours
+retourner une valeur. Comme un IN dans un IR, un TAB<IN> est accepté pour
+un TAB<IR> : l'exécution, même sans vérification, le convertit en un
+nouveau TAB<IR> à la déclaration, à l'affectation, à l'appel et au retour.
+"""
+import ArrayRexi
+import InterpreterRexi
+from CompilerRexi import SymbolTable
+
+SCALAR_TYPES = ('IN', 'IR', 'STR', 'BINARY')
+NUMERIC_TYPES = ('IN', 'IR')
+
+# Symbole de l'opérateur de chaque type de token
+OPERATOR_SYMBOLS = {
+    'PLUS': '+',
+    'MINUS': '-',
+    'MULTIPLY': '*',
+    'DIVIDE': '/',
+    'GT': '>',
+    'LT': '<',
+    'GTE': '>=',
+    'LTE': '<=',
+    'EQUALS': '==',
+}
+
+
+def is_array(type_name):
+    return type_name is not None and type_name.startswith('TAB<')
+
+
+def assignable(target, source):
+    """Une valeur de type source peut-elle être rangée dans une variable de type target"""
+    if source is None or target is None:
+        # Type inconnu : l'erreur qui l'a produit est déjà signalée
+        return True
+    if target == source:
+        return True
+    return (target, source) in (('IR', 'IN'), ('TAB<IR>', 'TAB<IN>'))
+
+
+def always_returns(statements):
+    """Le bloc se termine-t-il par un return sur tous les chemins"""
+    for statement in statements:
+        if type(statement) is InterpreterRexi.Return:
+            return True
+        if (type(statement) is InterpreterRexi.IfStatement and statement.else_block is not None
+                and always_returns(statement.if_block.statements)
+                and always_returns(statement.else_block.statements)):
+            return True
+    return False
+
+
+class TypeChecker:
+    def __init__(self):
+        self.symbols = SymbolTable()
+        self.functions = {}
+        # Fonctions pouvant se terminer sans return
+        self.incomplete = set()
+        # Fonction dont le corps est en cours de vérification
+        self.function = None
+        self.errors = []
+
+    def error(self, message):
+        self.errors.append(message)
+        return None
+
+    def check(self, tree):
+        """Vérifie un programme et retourne la liste de ses erreurs de type"""
+        # Les fonctions peuvent être appelées avant leur déclaration
+        for statement in tree.statements:
+            if type(statement) is InterpreterRexi.FunctionDecl:
+                self.signature(statement)
+        self.visit(tree)
+        # Corps vérifiés une fois toutes les globales déclarées, comme à l'appel
+        for function in self.functions.values():
+            self.check_function(function)
+        return self.errors
+
+    def signature(self, node):
+        if node.name in self.functions:
+            self.error(f'Fonction {node.name} déjà définie')
+            return
+        self.functions[node.name] = node
+        for param in node.params:
+            self.valid_type(param.type_node.value)
+        self.valid_type(node.return_type.value)
+        if not always_returns(node.body.statements):
+            self.incomplete.add(node.name)
+
+    def check_function(self, node):
+        self.function = node
+        self.symbols.enter_scope()
+        for param in node.params:
+            self.declare(param.var_node.value, self.valid_type(param.type_node.value))
+        self.visit(node.body)
+        self.symbols.exit_scope()
+        self.function = None
+
+    def valid_type(self, type_name):
+        """Le type s'il est connu, sinon None après avoir signalé l'erreur"""
+        if type_name in SCALAR_TYPES:
+            return type_name
+        if type_name == 'TAB':
+            return self.error("Type TAB sans type d'éléments (TAB<IN>, TAB<IR>, ...)")
+        if is_array(type_name) and InterpreterRexi.element_type(type_name) in SCALAR_TYPES:
+            return type_name
+        return self.error(f'Type {type_name} inconnu')
+
+    def declare(self, name, type_name):
+        scope = self.symbols.get_current_scope()
+        if name not in scope:
+            self.symbols.declare(name, type_name)
+        elif scope[name] != type_name and None not in (scope[name], type_name):
+            # Redéclarer avec le même type est permis (déclaration dans une boucle)
+            self.error(f'La variable {name} est déjà déclarée de type {scope[name]}')
+
+    def visit(self, node):
+        method = getattr(self, f'visit_{type(node).__name__}', self.generic_visit)
+        return method(node)
+
+    def generic_visit(self, node):
+        return self.error(f'Pas de vérification de type pour {type(node).__name__}')
+
+    # --- Instructions --- #
+
+    def visit_Block(self, node):
+        for statement in node.statements:
+            if type(statement) is InterpreterRexi.FunctionCall:
+                # Appel seul : sa valeur n'est pas utilisée
+                self.call(statement, used=False)
+            else:
+                self.visit(statement)
+
+    def visit_FunctionDecl(self, node):
+        # Corps vérifié par check() après les instructions globales
+        pass
+
+    def visit_Declaration(self, node):
+        name = node.var_node.value
+        declared = self.valid_type(node.type_node.value)
+        value = self.visit(node.value_node)
+        if not assignable(declared, value):
+            self.error(f'La variable {name} doit être de type {declared}, pas {value}')
+        self.declare(name, declared)
+
+    def visit_ArrayDeclaration(self, node):
+        name = node.var_node.value
+        if node.element_type not in SCALAR_TYPES:
+            self.error(f"Type d'éléments {node.element_type} inconnu pour le tableau {name}")
+            declared = None
+        else:
+            declared = f'TAB<{node.element_type}>'
+        size = self.visit(node.size_node)
+        if size is not None and size != 'IN':
+            self.error(f'La taille du tableau {name} doit être de type IN')
+        self.declare(name, declared)
+
+    def visit_Assign(self, node):
+        name = node.left.value
+        declared = self.visit(node.left)
+        value = self.visit(node.right)
+        if not assignable(declared, value):
+            self.error(f'La variable {name} est de type {declared}, pas {value}')
+
+    def visit_ArrayAssign(self, node):
+        element = self.element(node.target, store=True)
+        value = self.visit(node.right)
+        if not assignable(element, value):
+            self.error(f'Les éléments de {self.describe(node.target.array)} sont de type '
+                       f'{element}, pas {value}')
+
+    def visit_IfStatement(self, node):
+        self.condition(node.condition, 'if')
+        self.visit(node.if_block)
+        if node.else_block is not None:
+            self.visit(node.else_block)
+
+    def visit_WhileLoop(self, node):
+        self.condition(node.condition, 'while')
+        self.visit(node.body)
+
+    def visit_ForLoop(self, node):
+        self.visit(node.init)
+        self.condition(node.condition, 'for')
+        self.visit(node.update)
+        self.visit(node.body)
+
+    def condition(self, node, statement):
+        condition = self.visit(node)
+        if condition is not None and condition != 'BINARY':
+            self.error(f'La condition de {statement} doit être de type BINARY, pas {condition}')
+
+    def visit_OutputStatement(self, node):
+        self.visit(node.expression)
+
+    def visit_Return(self, node):
+        value = self.visit(node.value)
+        if self.function is not None:
+            expected = self.function.return_type.value
+            if not assignable(expected, value):
+                self.error(f'La fonction {self.function.name} doit retourner une valeur '
+                           f'de type {expected}, pas {value}')
+
+    # --- Expressions --- #
+
+    def visit_Num(self, node):
+        return 'IR' if isinstance(node.value, float) else 'IN'
+
+    def visit_String(self, node):
+        return 'STR'
+
+    def visit_Boolean(self, node):
+        return 'BINARY'
+
+    def visit_Variable(self, node):
+        if node.value not in self.symbols.index:
+            return self.error(f'Variable {node.value} non définie')
+        return self.symbols.lookup(node.value)
+
+    def visit_BinOp(self, node):
+        # Chaîne à gauche parcourue sans récursion
+        chain = []
+        while type(node) is InterpreterRexi.BinOp:
+            chain.append(node)
+            node = node.left
+        left = self.visit(node)
+        for operation in reversed(chain):
+            left = self.binary(OPERATOR_SYMBOLS[operation.op.type], left,
+                               self.visit(operation.right))
+        return left
+
+    def binary(self, symbol, left, right):
+        if left is None or right is None:
+            return None
+        if is_array(left) or is_array(right):
+            try:
+                element = ArrayRexi.result_type(symbol, InterpreterRexi.element_type(left) or left,
+                                                InterpreterRexi.element_type(right) or right)
+            except TypeError:
+                return self.error(f'Opérateur {symbol} non applicable aux types {left} et {right}')
+            return f'TAB<{element}>'
+        if symbol in ('+', '-', '*', '/'):
+            if left in NUMERIC_TYPES and right in NUMERIC_TYPES:
+                return 'IR' if symbol == '/' or 'IR' in (left, right) else 'IN'
+            if symbol == '+' and left == right == 'STR':
+                return 'STR'
+            if symbol == '*' and {left, right} == {'STR', 'IN'}:
+                return 'STR'
+        elif left in NUMERIC_TYPES and right in NUMERIC_TYPES:
+            return 'BINARY'
+        elif left == right and (symbol == '==' or left == 'STR'):
+            return 'BINARY'
+        return self.error(f'Opérateur {symbol} non applicable aux types {left} et {right}')
+
+    def visit_ArrayLiteral(self, node):
+        elements = [self.visit(element) for element in node.elements]
+        if None in elements:
+            return None
+        if node.element_type is not None:
+            # Type des éléments donné par la déclaration
+            for element in elements:
+                if not assignable(node.element_type, element):
+                    return self.error(f'Les éléments du tableau doivent être de type '
+                                      f'{node.element_type}, pas {element}')
+            return f'TAB<{node.element_type}>'
+        kinds = set(elements)
+        if not kinds:
+            return 'TAB<IN>'
+        if len(kinds) == 1 and not is_array(elements[0]):
+            return f'TAB<{elements[0]}>'
+        if kinds == {'IN', 'IR'}:
+            return 'TAB<IR>'
+        return self.error("Les éléments d'un tableau doivent avoir le même type")
+
+    def visit_ArrayAccess(self, node):
+        return self.element(node)
+
+    def element(self, node, store=False):
+        """Type de l'élément désigné par tableau[indice]"""
+        array = self.visit(node.array)
+        index = self.visit(node.index)
+        if index is not None and index != 'IN':
+            self.error(f"L'indice de {self.describe(node.array)} doit être de type IN, pas {index}")
+        if array is None:
+            return None
+        if is_array(array):
+            return InterpreterRexi.element_type(array)
+        if array == 'STR' and not store:
+            # Caractère d'une chaîne
+            return 'STR'
+        return self.error(f"{self.describe(node.array)} de type {array} n'est pas un tableau")
+
+    def describe(self, node):
+        return node.value if type(node) is InterpreterRexi.Variable else "l'expression"
+
+    def visit_FunctionCall(self, node):
+        return self.call(node, used=True)
+
+    def call(self, node, used):
+        args = [self.visit(arg) for arg in node.args]
+        function = self.functions.get(node.name)
+        if function is None:
+            if node.name in ArrayRexi.REDUCTIONS:
+                return self.reduction(node.name, args)
+            return self.error(f'Fonction {node.name} non définie')
+        if len(args) != len(function.params):
+            return self.error(f'La fonction {node.name} attend {len(function.params)} '
+                              f'arguments, {len(args)} donnés')
+        for param, arg in zip(function.params, args):
+            if not assignable(param.type_node.value, arg):
+                self.error(f'Le paramètre {param.var_node.value} de {node.name} doit être '
+                           f'de type {param.type_node.value}, pas {arg}')
+        if used and node.name in self.incomplete:
+            return self.error(f'La fonction {node.name} peut se terminer sans retourner de valeur')
+        return function.return_type.value
+
+    def reduction(self, name, args):
+        """Type du résultat de sum, min, max ou len"""
+        if len(args) != 1:
+            return self.error(f'La fonction {name} attend 1 argument, {len(args)} donnés')
+        arg = args[0]
+        if arg is None:
+            return None
+        if name == 'len':
+            if is_array(arg) or arg == 'STR':
+                return 'IN'
+            return self.error(f'La fonction len attend un TAB ou un STR, pas {arg}')
+        element = InterpreterRexi.element_type(arg) if is_array(arg) else None
+        if element not in ('IN', 'IR', 'BINARY'):
+            return self.error(f'La fonction {name} attend un TAB numérique, pas {arg}')
+        if name == 'sum':
+            return 'IR' if element == 'IR' else 'IN'
+        return element
+
+
+def check_tree(tree):
+    """Erreurs de type d'un arbre produit par InterpreterRexi.Parser"""
+    return TypeChecker().check(tree)
+
+
+def check_source(source_code):
+    """Analyse un programme Rexi et retourne ses erreurs de type"""
+    lexer = InterpreterRexi.Lexer(source_code)
+    parser = InterpreterRexi.Parser(lexer)
+    return check_tree(parser.parse())
+
+
+def execute(source_code, output=None):
+    """Vérifie les types puis exécute sans vérification à l'exécution"""
+    try:
+        lexer = InterpreterRexi.Lexer(source_code)
+        parser = InterpreterRexi.Parser(lexer)
+        tree = parser.parse()
+        errors = check_tree(tree)
+        if errors:
+            return {
+                'error': '\n'.join(errors)
+            }
+        interpreter = InterpreterRexi.UncheckedInterpreter(output=output)
+        interpreter.interpret(tree)
+        return {
+            'output': interpreter.output_buffer,
+            'variables': interpreter.variables
+        }
+    except RecursionError:
+        return {
+            'error': 'Profondeur de récursion maximale dépassée'
+        }
+    except Exception as e:
+        return {
+            'error': str(e)
+        }
@@ -0,0 +1,532 @@
+"""Register-based virtual machine for the three-address code of CompilerRexi.
+
+CodeGenerator produces a list of (op, arg1, arg2, result) tuples. load()
+decodes that list once into a Program: labels are resolved to instruction
+offsets, temporaries and local variables become indices into a flat
+register array per call frame, and global variables become indices into a
+shared array. VM.run() then executes the decoded instructions.
+
+Calls push onto the VM's own frame stack, not Python's, so recursion depth
+is bounded by memory only. A call whose result is immediately returned
+(`return f(...)` in a function) is decoded as TAILCALL, which reuses the
+current frame.
+
+Typed instructions (ADD_INT, LT_FLOAT... from CodeGenerator(typed=True))
+decode to one opcode per operator, ADD, LT..., whose branch of run()
+computes regs[a] + regs[b] inline instead of calling an operator function.
+The IN and IR forms share that opcode: Python's + is the same code for
+ints and floats. Because their operands are numbers, the loader also
+fuses them with their neighbours, which saves whole dispatches:
+- a constant operand loaded just before (x * 3) is read from a register
+  preloaded in every frame, and its LOAD_CONST is dropped
+- a comparison tested by the next JUMPIF becomes one compare-and-branch
+  instruction (JUMPIF_LT...)
+Both rely on a property of CodeGenerator output, kept by OptimizerRexi
+and RegAllocRexi: a constant or a condition temporary is read once, by
+the instruction that follows it. Results are the same as with the generic
+instructions.
+
+Even fused, a loop iteration is several dispatches of run(): the VM beats
+the tree-walking visitor on straight-line code, but runs loops 3 to 6
+times slower than the closures of InterpreterRexi.LoopCompiler.
+"""
+import operator
+
+import CompilerRexi
+from ArrayRexi import REDUCTIONS, TypedArray
+
+# --- Decoded opcodes --- #
+LOAD_CONST = 0
+LOAD_LOCAL = 1
+LOAD_GLOBAL = 2
+STORE_LOCAL = 3
+STORE_GLOBAL = 4
+BINOP = 5
+JUMP = 6
+JUMPIF = 7
+CALL = 8
+RETURN = 9
+OUTPUT = 10
+ARRAY_LOAD = 11
+ERROR = 12
+TAILCALL = 13
+NEW_ARRAY = 14
+ARRAY_STORE = 15
+BUILTIN = 16
+# Typed operators, numbered last: run() tests op >= ADD once for all of them
+ADD = 17
+SUB = 18
+MUL = 19
+DIV = 20
+LT = 21
+GT = 22
+LE = 23
+GE = 24
+EQ = 25
+NE = 26
+# JUMPIF on a typed comparison: jumps when the comparison does not hold
+JUMPIF_LT = 27
+JUMPIF_GT = 28
+JUMPIF_LE = 29
+JUMPIF_GE = 30
+JUMPIF_EQ = 31
+JUMPIF_NE = 32
+
+BINARY_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '>': operator.gt,
+    '<': operator.lt,
+    '>=': operator.ge,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+# Decoded opcode of each operator of a typed instruction
+OPERATOR_OPCODES = {
+    '+': ADD, '-': SUB, '*': MUL, '/': DIV, '<': LT,
+    '>': GT, '<=': LE, '>=': GE, '==': EQ, '!=': NE,
+}
+
+# Typed instruction -> decoded opcode, the same for IN and IR operands
+TYPED_OPCODES = {
+    typed_op: OPERATOR_OPCODES[op] for (op, _), typed_op in CompilerRexi.TYPED_OPERATIONS.items()
+}
+
+# Typed comparison -> compare-and-branch opcode
+BRANCH_OPCODES = {
+    LT: JUMPIF_LT, GT: JUMPIF_GT, LE: JUMPIF_LE, GE: JUMPIF_GE, EQ: JUMPIF_EQ, NE: JUMPIF_NE,
+}
+
+# Typed instructions are binary operators for the optimizer and the allocator
+BINARY_OPERATORS.update({
+    typed_op: BINARY_OPERATORS[op] for (op, _), typed_op in CompilerRexi.TYPED_OPERATIONS.items()
+})
+
+# Value of a register or variable that has not been assigned yet
+_UNDEFINED = object()
+
+
+class Function:
+    """A Rexi function after loading: entry offset and frame layout"""
+
+    def __init__(self, name, params):
+        self.name = name
+        self.params = params
+        self.entry = None
+        self.frame_size = 0
+        self.padding = []
+
+
+class Program:
+    """Decoded instructions ready to be executed by the VM"""
+
+    def __init__(self, code, functions, global_names, frame_size, registers=None):
+        self.code = code
+        self.functions = functions
+        self.global_names = global_names
+        self.frame_size = frame_size
+        # Initial top-level registers, holding the preloaded constants
+        self.registers = [_UNDEFINED] * frame_size if registers is None else registers
+
+
+class _Region:
+    """Register assignment for the top level or for one function body"""
+
+    def __init__(self, local_names=None):
+        self.registers = {}
+        self.is_function = local_names is not None
+        self.local_names = set(local_names or ())
+        # Register -> constant preloaded in it
+        self.constants = {}
+
+    def temp(self, name):
+        return self._register(('temp', name))
+
+    def constant(self, value):
+        # Keyed on the type too: 1 == 1.0 == True
+        register = self._register(('const', type(value), value))
+        self.constants[register] = value
+        return register
+
+    def initial_registers(self, size):
+        """Registers of a new frame past its first size ones, constants preloaded"""
+        registers = [_UNDEFINED] * (len(self.registers) - size)
+        for register, value in self.constants.items():
+            registers[register - size] = value
+        return registers
+
+    def local(self, name):
+        return self._register(('var', name))
+
+    def _register(self, key):
+        register = self.registers.get(key)
+        if register is None:
+            register = self.registers[key] = len(self.registers)
+        return register
+
+
+class Loader:
+    """Decodes three-address code into a Program"""
+
+    def __init__(self, code):
+        self.code = code
+        self.functions = {}
+        self.global_slots = {}
+        self.labels = {}
+        self.decoded = []
+        # (instruction index, label name) pairs patched once labels are known
+        self.pending_jumps = []
+        # Offset of the last label: instructions are never fused across it
+        self.label_offset = None
+
+    def load(self):
+        self.collect_symbols()
+        top_level = _Region()
+        region = top_level
+        function = None
+        for position, instruction in enumerate(self.code):
+            self.position = position
+            op = instruction[0]
+            if op == 'FUNCTION':
+                function = self.functions[instruction[1]]
+                # Straight-line execution skips over function bodies
+                self.emit_jump(JUMP, None, ('end', function.name))
+                region = _Region(self.function_locals[function.name])
+                for param in function.params:
+                    region.local(param)
+                function.entry = len(self.decoded)
+            elif op == 'END_FUNCTION':
+                self.finish_function(function, region)
+                self.labels[('end', function.name)] = self.label_offset = len(self.decoded)
+                function = None
+                region = top_level
+            else:
+                self.decode(instruction, region)
+
+        for index, label in self.pending_jumps:
+            if label not in self.labels:
+                raise Exception(f"Undefined label '{label}'")
+            instruction = self.decoded[index]
+            self.decoded[index] = instruction[:-1] + (self.labels[label],)
+
+        global_names = [None] * len(self.global_slots)
+        for name, slot in self.global_slots.items():
+            global_names[slot] = name
+        return Program(self.decoded, self.functions, global_names, len(top_level.registers),
+                       top_level.initial_registers(0))
+
+    def collect_symbols(self):
+        """Find functions, their local variables and the global variables"""
+        self.function_locals = {}
+        assigned = None
+        for op, arg1, arg2, result in self.code:
+            if op == 'FUNCTION':
+                self.functions[arg1] = Function(arg1, list(arg2 or []))
+                assigned = self.function_locals[arg1] = set(arg2 or [])
+            elif op == 'END_FUNCTION':
+                assigned = None
+            elif op in ('ASSIGN', 'DECLARE', 'NEW_ARRAY'):
+                name = arg1 if op == 'DECLARE' else result
+                if assigned is None:
+                    self.global_slot(name)
+                else:
+                    assigned.add(name)
+        # Inside a function, assigning a global updates the global
+        for name, local_names in self.function_locals.items():
+            params = set(self.functions[name].params)
+            self.function_locals[name] = {
+                var for var in local_names if var in params or var not in self.global_slots
+            }
+
+    def finish_function(self, function, region):
+        function.frame_size = len(region.registers)
+        function.padding = region.initial_registers(len(function.params))
+
+    def global_slot(self, name):
+        slot = self.global_slots.get(name)
+        if slot is None:
+            slot = self.global_slots[name] = len(self.global_slots)
+        return slot
+
+    def emit_jump(self, opcode, condition, label):
+        self.pending_jumps.append((len(self.decoded), label))
+        if condition is None:
+            self.decoded.append((opcode, None))
+        else:
+            self.decoded.append((opcode, condition, None))
+
+    def load_variable(self, name, region, dst):
+        if name in region.local_names:
+            return (LOAD_LOCAL, region.local(name), dst, name)
+        return (LOAD_GLOBAL, self.global_slot(name), dst)
+
+    def store_variable(self, src, name, region):
+        if name in region.local_names:
+            return (STORE_LOCAL, src, region.local(name))
+        return (STORE_GLOBAL, src, self.global_slot(name))
+
+    def decode(self, instruction, region):
+        op, arg1, arg2, result = instruction
+        emit = self.decoded.append
+        if op in TYPED_OPCODES:
+            self.decode_typed(TYPED_OPCODES[op], arg1, arg2, result, region)
+        elif op in BINARY_OPERATORS:
+            emit((BINOP, BINARY_OPERATORS[op], region.temp(arg1), region.temp(arg2),
+                  region.temp(result)))
+        elif op == 'LOAD_CONST':
+            emit((LOAD_CONST, arg1, region.temp(result)))
+        elif op == 'LOAD':
+            emit(self.load_variable(arg1, region, region.temp(result)))
+        elif op == 'ASSIGN':
+            emit(self.store_variable(region.temp(arg1), result, region))
+        elif op == 'DECLARE':
+            dst = region.temp(('declare', arg1))
+            emit((LOAD_CONST, None, dst))
+            emit(self.store_variable(dst, arg1, region))
+        elif op == 'LABEL':
+            self.labels[arg1] = self.label_offset = len(self.decoded)
+        elif op == 'JUMP':
+            self.emit_jump(JUMP, None, arg1)
+        elif op == 'JUMPIF':
+            previous = self.fusable()
+            if previous is not None and previous[0] in BRANCH_OPCODES \
+                    and previous[3] == region.temp(arg1):
+                # Compare and branch in one instruction
+                self.decoded.pop()
+                self.pending_jumps.append((len(self.decoded), arg2))
+                self.decoded.append((BRANCH_OPCODES[previous[0]], previous[1], previous[2], None))
+            else:
+                self.emit_jump(JUMPIF, region.temp(arg1), arg2)
+        elif op == 'CALL':
+            function = self.functions.get(arg1)
+            if function is None and arg1 in REDUCTIONS:
+                if len(arg2) != 1:
+                    emit((ERROR, f"Function '{arg1}' expects 1 argument, got {len(arg2)}"))
+                else:
+                    emit((BUILTIN, REDUCTIONS[arg1], region.temp(arg2[0]), region.temp(result)))
+            elif function is None:
+                emit((ERROR, f"Function '{arg1}' is not defined"))
+            elif len(arg2) != len(function.params):
+                emit((ERROR, f"Function '{arg1}' expects {len(function.params)} "
+                             f"arguments, got {len(arg2)}"))
+            elif self.is_tail_call(region, result):
+                emit((TAILCALL, function, tuple(region.temp(arg) for arg in arg2)))
+            else:
+                emit((CALL, function, tuple(region.temp(arg) for arg in arg2),
+                      region.temp(result)))
+        elif op == 'RETURN':
+            emit((RETURN, None if arg1 is None else region.temp(arg1)))
+        elif op == 'OUTPUT':
+            emit((OUTPUT, region.temp(arg1)))
+        elif op == 'ARRAY_ACCESS':
+            if arg1 in region.local_names:
+                emit((ARRAY_LOAD, False, region.local(arg1), region.temp(arg2),
+                      region.temp(result)))
+            else:
+                emit((ARRAY_LOAD, True, self.global_slot(arg1), region.temp(arg2),
+                      region.temp(result)))
+        elif op == 'NEW_ARRAY':
+            dst = region.temp(('array', result))
+            emit((NEW_ARRAY, arg1, arg2, dst))
+            emit(self.store_variable(dst, result, region))
+        elif op == 'ARRAY_STORE':
+            if result in region.local_names:
+                emit((ARRAY_STORE, False, region.local(result), region.temp(arg2),
+                      region.temp(arg1)))
+            else:
+                emit((ARRAY_STORE, True, self.global_slot(result), region.temp(arg2),
+                      region.temp(arg1)))
+        else:
+            raise Exception(f"Unknown instruction {op}")
+
+
+    def fusable(self):
+        """Last decoded instruction if the next one may be fused with it, or None"""
+        if not self.decoded or self.label_offset == len(self.decoded):
+            return None
+        return self.decoded[-1]
+
+    def decode_typed(self, opcode, left, right, result, region):
+        left, right = region.temp(left), region.temp(right)
+        previous = self.fusable()
+        if previous is not None and previous[0] == LOAD_CONST and previous[2] == right \
+                and left != right:
+            # The constant is read from its preloaded register instead
+            self.decoded.pop()
+            right = region.constant(previous[1])
+        self.decoded.append((opcode, left, right, region.temp(result)))
+
+    def is_tail_call(self, region, result):
+        """Whether the instruction after a call inside a function returns its result"""
+        position = self.position + 1
+        if not region.is_function or position >= len(self.code):
+            return False
+        following = self.code[position]
+        return following[0] == 'RETURN' and following[1] == result
+
+
+def load(code):
+    """Decode three-address code into an executable Program"""
+    return Loader(code).load()
+
+
+class VM:
+    """Executes a loaded Program"""
+
+    def __init__(self, program, output=None):
+        self.program = program
+        self.globals = [_UNDEFINED] * len(program.global_names)
+        # Any object with an append() method, see OutputRexi
+        self.output_buffer = [] if output is None else output
+
+    def undefined(self, name):
+        return NameError(f"Variable '{name}' is not defined")
+
+    def run(self):
+        code = self.program.code
+        globals_ = self.globals
+        output = self.output_buffer
+        regs = list(self.program.registers)
+        # Call stack of (return offset, caller registers, result register)
+        frames = []
+        pc = 0
+        end = len(code)
+        while pc < end:
+            instruction = code[pc]
+            op = instruction[0]
+            pc += 1
+            if op == BINOP:
+                regs[instruction[4]] = instruction[1](regs[instruction[2]], regs[instruction[3]])
+            elif op >= ADD:
+                # Typed operators: operands are IN or IR, applied inline
+                if op == ADD:
+                    regs[instruction[3]] = regs[instruction[1]] + regs[instruction[2]]
+                elif op == SUB:
+                    regs[instruction[3]] = regs[instruction[1]] - regs[instruction[2]]
+                elif op == MUL:
+                    regs[instruction[3]] = regs[instruction[1]] * regs[instruction[2]]
+                elif op == JUMPIF_LT:
+                    if not regs[instruction[1]] < regs[instruction[2]]:
+                        pc = instruction[3]
+                elif op == DIV:
+                    regs[instruction[3]] = regs[instruction[1]] / regs[instruction[2]]
+                elif op == JUMPIF_LE:
+                    if not regs[instruction[1]] <= regs[instruction[2]]:
+                        pc = instruction[3]
+                elif op == JUMPIF_GT:
+                    if not regs[instruction[1]] > regs[instruction[2]]:
+                        pc = instruction[3]
+                elif op == JUMPIF_GE:
+                    if not regs[instruction[1]] >= regs[instruction[2]]:
+                        pc = instruction[3]
+                elif op == JUMPIF_EQ:
+                    if regs[instruction[1]] != regs[instruction[2]]:
+                        pc = instruction[3]
+                elif op == JUMPIF_NE:
+                    if regs[instruction[1]] == regs[instruction[2]]:
+                        pc = instruction[3]
+                elif op == LT:
+                    regs[instruction[3]] = regs[instruction[1]] < regs[instruction[2]]
+                elif op == LE:
+                    regs[instruction[3]] = regs[instruction[1]] <= regs[instruction[2]]
+                elif op == GT:
+                    regs[instruction[3]] = regs[instruction[1]] > regs[instruction[2]]
+                elif op == GE:
+                    regs[instruction[3]] = regs[instruction[1]] >= regs[instruction[2]]
+                elif op == EQ:
+                    regs[instruction[3]] = regs[instruction[1]] == regs[instruction[2]]
+                else:
+                    regs[instruction[3]] = regs[instruction[1]] != regs[instruction[2]]
+            elif op == LOAD_CONST:
+                regs[instruction[2]] = instruction[1]
+            elif op == LOAD_LOCAL:
+                value = regs[instruction[1]]
+                if value is _UNDEFINED:
+                    raise self.undefined(instruction[3])
+                regs[instruction[2]] = value
+            elif op == LOAD_GLOBAL:
+                value = globals_[instruction[1]]
+                if value is _UNDEFINED:
+                    raise self.undefined(self.program.global_names[instruction[1]])
+                regs[instruction[2]] = value
+            elif op == STORE_LOCAL:
+                regs[instruction[2]] = regs[instruction[1]]
+            elif op == STORE_GLOBAL:
+                globals_[instruction[2]] = regs[instruction[1]]
+            elif op == JUMPIF:
+                # Jump when the condition does not hold
+                if not regs[instruction[1]]:
+                    pc = instruction[2]
+            elif op == JUMP:
+                pc = instruction[1]
+            elif op == CALL:
+                function = instruction[1]
+                frames.append((pc, regs, instruction[3]))
+                regs = [regs[arg] for arg in instruction[2]]
+                regs.extend(function.padding)
+                pc = function.entry
+            elif op == TAILCALL:
+                # The callee returns directly to our caller: no frame is pushed
+                function = instruction[1]
+                regs = [regs[arg] for arg in instruction[2]]
+                regs.extend(function.padding)
+                pc = function.entry
+            elif op == RETURN:
+                value = None if instruction[1] is None else regs[instruction[1]]
+                if not frames:
+                    break
+                pc, regs, dst = frames.pop()
+                regs[dst] = value
+            elif op == OUTPUT:
+                output.append(str(regs[instruction[1]]))
+            elif op == ARRAY_LOAD:
+                array = globals_[instruction[2]] if instruction[1] else regs[instruction[2]]
+                regs[instruction[4]] = array[regs[instruction[3]]]
+            elif op == ARRAY_STORE:
+                array = globals_[instruction[2]] if instruction[1] else regs[instruction[2]]
+                array[regs[instruction[3]]] = regs[instruction[4]]
+            elif op == BUILTIN:
+                regs[instruction[3]] = instruction[1](regs[instruction[2]])
+            elif op == NEW_ARRAY:
+                regs[instruction[3]] = TypedArray.zeros(instruction[1], instruction[2])
+            elif op == ERROR:
+                raise Exception(instruction[1])
+        return {
+            'output': self.output_buffer,
+            'variables': self.variables(),
+        }
+
+    def variables(self):
+        """Final values of the global variables"""
+        return {
+            name: value
+            for name, value in zip(self.program.global_names, self.globals)
+            if value is not _UNDEFINED
+        }
+
+
+def execute(source_code, passes=(), typed=False, output=None):
+    """Compile source code and run it on the VM; output is a sink (see OutputRexi)"""
+    try:
+        code = CompilerRexi.compile_code(source_code, passes, typed)
+        if isinstance(code, str):
+            return {'error': code}
+        return VM(load(code), output).run()
+    except Exception as e:
+        return {
+            'error': str(e)
+        }
+
+
+def Run(source_code):
+    result = execute(source_code)
+    if 'error' in result:
+        out = f"Error: {result['error']}\n"
+    else:
+        out = f"Output:{result['output']}\n"
+        out += f"Variables:{result['variables']}\n"
+    return out
@@ -0,0 +1,99 @@
+"""Bytes per AST node on a generated program of about one million nodes.
+
+Each statement `IN xI = xJ * 3 + I;` gives 7 interpreter nodes and 6
+compiler nodes. The trees are built directly (no parsing) under
+tracemalloc, so the figure covers nodes, tokens and their values. For
+comparison, the size the same nodes would have with a per-instance
+__dict__ is computed from equivalent plain classes.
+
+    python benchmarks/bench_ast_memory.py [nodes]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import CompilerRexi  # noqa: E402
+import InterpreterRexi as I  # noqa: E402
+
+
+def interpreter_program(statements):
+    plus = I.Token('PLUS', '+')
+    times = I.Token('MULTIPLY', '*')
+    type_token = I.Token('TYPE', 'IN')
+    body = []
+    for i in range(statements):
+        target = I.Variable(I.Token('ID', f"x{i}"))
+        source = I.Variable(I.Token('ID', f"x{i // 2}"))
+        product = I.BinOp(source, times, I.Num(I.Token('NUMBER', 3)))
+        value = I.BinOp(product, plus, I.Num(I.Token('NUMBER', i)))
+        body.append(I.Declaration(type_token, target, value))
+    return I.Block(body)
+
+
+def compiler_program(statements):
+    C = CompilerRexi
+    body = []
+    for i in range(statements):
+        product = C.BinOp(C.Identifier(f"x{i // 2}"), '*', C.Number(3))
+        body.append(C.VarDeclaration('IN', f"x{i}", C.BinOp(product, '+', C.Number(i))))
+    return C.Program(body)
+
+
+def walk(node):
+    """Yield every node of a tree (iteratively, trees can be wide)"""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        for name in type(node).__slots__:
+            child = getattr(node, name, None)
+            if isinstance(child, (I.AST, CompilerRexi.Node)):
+                stack.append(child)
+            elif isinstance(child, list):
+                stack.extend(child)
+
+
+_plain_classes = {}
+
+
+def dict_based_size(node):
+    """Size of the same node if its class had no __slots__"""
+    node_type = type(node)
+    if node_type not in _plain_classes:
+        _plain_classes[node_type] = type(node_type.__name__, (), {})
+    plain = _plain_classes[node_type]()
+    for name in type(node).__slots__:
+        setattr(plain, name, getattr(node, name, None))
+    return sys.getsizeof(plain) + sys.getsizeof(plain.__dict__)
+
+
+def measure(label, build, statements):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tree = build(statements)
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    nodes = 0
+    slotted = 0
+    plain = 0
+    for node in walk(tree):
+        nodes += 1
+        slotted += sys.getsizeof(node)
+        plain += dict_based_size(node)
+    print(f"{label}: {nodes} nodes")
+    print(f"  allocated while building:  {allocated / nodes:7.1f} bytes/node (with tokens and values)")
+    print(f"  node objects, __slots__:   {slotted / nodes:7.1f} bytes/node")
+    print(f"  node objects, __dict__:    {plain / nodes:7.1f} bytes/node")
+
+
+def main():
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    measure("InterpreterRexi", interpreter_program, nodes // 7)
+    measure("CompilerRexi", compiler_program, nodes // 6)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Startup cost: compiling a script from source versus loading its .rexic.
+
+    python benchmarks/bench_bytecode.py [statements]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import BytecodeRexi  # noqa: E402
+import CompilerRexi  # noqa: E402
+import VMRexi  # noqa: E402
+
+
+def generate(statements):
+    lines = ["IN x0 = 1;"]
+    for i in range(1, statements):
+        lines.append(f"IN x{i} = x{i - 1} + {i} * 2;")
+        if i % 10 == 0:
+            lines.append(f"if x{i} > {i} then {{ output x{i}; }} else {{ output {i}; }} end")
+    return "\n".join(lines)
+
+
+def best_of(repetitions, function):
+    best = None
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    source_code = generate(statements)
+    path = os.path.join(tempfile.mkdtemp(), "bench.rexic")
+    size = BytecodeRexi.write(CompilerRexi.compile_code(source_code), path)
+    text = CompilerRexi.Run(source_code)
+
+    compile_time, code = best_of(3, lambda: CompilerRexi.compile_code(source_code))
+    load_time, loaded = best_of(3, lambda: BytecodeRexi.read(path))
+    assert loaded == code
+    assert VMRexi.VM(VMRexi.load(loaded)).run() == VMRexi.VM(VMRexi.load(code)).run()
+
+    print(f"{len(code)} instructions; .rexic {size / 1024:.0f} KB, IR as text {len(text) / 1024:.0f} KB")
+    print(f"compile from source: {compile_time * 1e3:8.1f} ms")
+    print(f"load .rexic (mmap):  {load_time * 1e3:8.1f} ms  ({compile_time / load_time:.1f}x faster)")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
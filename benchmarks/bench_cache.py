@@ -0,0 +1,54 @@
+"""Cold versus warm compilation through the on-disk cache.
+
+    python benchmarks/bench_cache.py [scripts] [statements per script]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import CacheRexi  # noqa: E402
+import CompilerRexi  # noqa: E402
+
+
+def generate(seed, statements):
+    lines = [f"IN x0 = {seed};"]
+    for i in range(1, statements):
+        lines.append(f"IN x{i} = x{i - 1} * 2 + {i};")
+        if i % 10 == 0:
+            lines.append(f"while x{i} > 100 {{ x{i} = x{i} - 100; }}")
+    lines.append(f"output x{statements - 1};")
+    return "\n".join(lines)
+
+
+def timed(function, scripts):
+    start = time.perf_counter()
+    results = [function(source_code) for source_code in scripts]
+    return time.perf_counter() - start, results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    statements = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    scripts = [generate(seed, statements) for seed in range(count)]
+    directory = tempfile.mkdtemp()
+    try:
+        cache = CacheRexi.CompilationCache(directory)
+        plain_time, plain = timed(CompilerRexi.compile_code, scripts)
+        cold_time, cold = timed(cache.compile, scripts)
+        warm_time, warm = timed(cache.compile, scripts)
+        assert plain == cold == warm
+        print(f"{count} scripts of {statements} statements, cache {cache.size() / 1024:.0f} KB")
+        print(f"no cache:     {plain_time * 1e3:8.1f} ms")
+        print(f"cold cache:   {cold_time * 1e3:8.1f} ms  (compile + write)")
+        print(f"warm cache:   {warm_time * 1e3:8.1f} ms  ({plain_time / warm_time:.1f}x faster)")
+        print(cache.report())
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
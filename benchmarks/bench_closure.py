@@ -0,0 +1,57 @@
+"""Repeated runs of one program: tree-walking interpreter vs closure compiler.
+
+The program is parsed once. The interpreter re-walks the tree on every
+run; the closure compiler translates it once and then only calls the
+compiled closures.
+
+    python benchmarks/bench_closure.py [statements] [runs]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import ClosureRexi  # noqa: E402
+import InterpreterRexi  # noqa: E402
+
+
+def make_program(statements):
+    lines = ["IN x0 = 1;", "IN total = 0;"]
+    for i in range(1, statements):
+        lines.append(f"IN x{i} = x{i - 1} * 3 + {i} - x{i - 1} * 2;")
+        lines.append(f"if x{i} > {i * 10} then total = total + 1; else total = total - 1; end")
+    lines.append("output total;")
+    return "\n".join(lines)
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    source_code = make_program(statements)
+    tree = InterpreterRexi.Parser(InterpreterRexi.Lexer(source_code)).parse()
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        interpreter = InterpreterRexi.Interpreter()
+        interpreter.interpret(tree)
+    interpreted = time.perf_counter() - start
+    expected = {'output': interpreter.output_buffer, 'variables': interpreter.variables}
+
+    start = time.perf_counter()
+    program = ClosureRexi.compile_tree(tree)
+    compile_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = program.run()
+    compiled = time.perf_counter() - start
+    assert result == expected
+
+    print(f"interpreter:      {interpreted / runs * 1e3:8.3f} ms/run")
+    print(f"closure compile:  {compile_time * 1e3:8.3f} ms (once)")
+    print(f"closure run:      {compiled / runs * 1e3:8.3f} ms/run")
+    print(f"speedup:          {interpreted / compiled:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
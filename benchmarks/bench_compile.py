@@ -0,0 +1,58 @@
+"""Cold vs warm compile latency for CompilerRexi.compile_code.
+
+Cold: lex.lex() and yacc.yacc() run for every compilation, as the
+previous compile_code did. Warm: the process-wide session is built once
+and reused. The committed parsetab.py must match the grammar, otherwise
+every process rebuilds the LALR tables.
+
+    python benchmarks/bench_compile.py [repetitions]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ply import lex, yacc  # noqa: E402
+
+import CompilerRexi  # noqa: E402
+
+
+def compile_cold(source_code):
+    # The previous compile_code, with CompilerRexi's rules passed explicitly
+    lexer = lex.lex(module=CompilerRexi)
+    parser = yacc.yacc(module=CompilerRexi)
+    ast = parser.parse(source_code, lexer=lexer)
+    return CompilerRexi.CodeGenerator().generate_code(ast)
+
+
+def compile_warm(source_code):
+    return CompilerRexi.compile_code(source_code)
+
+
+def measure(func, source_code, repetitions):
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        func(source_code)
+    return (time.perf_counter() - start) / repetitions
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    source_code = CompilerRexi.test_program
+    assert CompilerRexi.parse_tables_current(), "parsetab.py is stale, regenerate it"
+
+    start = time.perf_counter()
+    # Build the shared session outside the timed region
+    CompilerRexi.get_session()
+    print(f"session:      {(time.perf_counter() - start) * 1e3:8.3f} ms (once per process)")
+
+    cold = measure(compile_cold, source_code, repetitions)
+    warm = measure(compile_warm, source_code, repetitions)
+    print(f"cold compile: {cold * 1e3:8.3f} ms/call")
+    print(f"warm compile: {warm * 1e3:8.3f} ms/call")
+    print(f"speedup:      {cold / warm:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
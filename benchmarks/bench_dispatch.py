@@ -0,0 +1,75 @@
+"""Visitor dispatch throughput on deep expression trees.
+
+Compares the type-keyed dispatch tables of Interpreter.visit and
+CodeGenerator.generate_code with the previous getattr + f-string lookup,
+in nodes visited per second.
+
+    python benchmarks/bench_dispatch.py [depth] [repetitions]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import CompilerRexi  # noqa: E402
+import InterpreterRexi  # noqa: E402
+
+
+class LegacyInterpreter(InterpreterRexi.Interpreter):
+    def visit(self, node):
+        method_name = f'visit_{type(node).__name__}'
+        visitor = getattr(self, method_name, self.generic_visit)
+        return visitor(node)
+
+
+class LegacyCodeGenerator(CompilerRexi.CodeGenerator):
+    def generate_code(self, node):
+        method_name = f'generate_{type(node).__name__.lower()}'
+        if hasattr(self, method_name):
+            return getattr(self, method_name)(node)
+        raise Exception(f"No visitor for {type(node).__name__}")
+
+
+def interpreter_tree(depth):
+    """Balanced tree of additions with 2**depth leaves"""
+    if depth == 0:
+        return InterpreterRexi.Num(InterpreterRexi.Token('NUMBER', 1))
+    plus = InterpreterRexi.Token('PLUS', '+')
+    return InterpreterRexi.BinOp(interpreter_tree(depth - 1), plus, interpreter_tree(depth - 1))
+
+
+def compiler_tree(depth):
+    """Balanced tree of additions with 2**depth leaves"""
+    if depth == 0:
+        return CompilerRexi.Number(1)
+    return CompilerRexi.BinOp(compiler_tree(depth - 1), '+', compiler_tree(depth - 1))
+
+
+def nodes_per_second(run, nodes, repetitions):
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        run()
+    return nodes * repetitions / (time.perf_counter() - start)
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 14
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    nodes = 2 ** (depth + 1) - 1
+
+    tree = interpreter_tree(depth)
+    for label, interpreter_class in (("before", LegacyInterpreter),
+                                     ("after", InterpreterRexi.Interpreter)):
+        rate = nodes_per_second(lambda: interpreter_class().visit(tree), nodes, repetitions)
+        print(f"Interpreter.visit         {label:6}: {rate / 1e6:6.2f} M nodes/s")
+
+    tree = compiler_tree(depth)
+    for label, generator_class in (("before", LegacyCodeGenerator),
+                                   ("after", CompilerRexi.CodeGenerator)):
+        rate = nodes_per_second(lambda: generator_class().generate_code(tree), nodes, repetitions)
+        print(f"CodeGenerator.generate    {label:6}: {rate / 1e6:6.2f} M nodes/s")
+
+
+if __name__ == "__main__":
+    main()
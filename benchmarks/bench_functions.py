@@ -0,0 +1,69 @@
+"""Recursive functions in the interpreter, with and without memoization of
+pure functions. Both runs must print the same output, including for calls
+with equal IN, IR and BINARY arguments (1, 1.0, YES).
+
+    python benchmarks/bench_functions.py [fib n] [ackermann n]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import InterpreterRexi  # noqa: E402
+
+FIB = """
+function fib(IN n) IN {
+    if n < 2 then return n; end
+    return fib(n - 1) + fib(n - 2);
+}
+output fib({n});
+"""
+
+ACKERMANN = """
+function ack(IN m, IN n) IN {
+    if m == 0 then return n + 1; end
+    if n == 0 then return ack(m - 1, 1); end
+    return ack(m - 1, ack(m, n - 1));
+}
+output ack(2, {n});
+"""
+
+# 1 == 1.0 == YES : le cache ne doit pas confondre ces appels
+MIXED = """
+function twice(IR x) IR { return x * 2; }
+output twice(1.0);
+output twice(1);
+output twice(YES);
+output twice(1.0);
+"""
+
+
+def run(source_code, memo_size):
+    tree = InterpreterRexi.Parser(InterpreterRexi.Lexer(source_code)).parse()
+    interpreter = InterpreterRexi.Interpreter(memo_size=memo_size)
+    start = time.perf_counter()
+    interpreter.interpret(tree)
+    return time.perf_counter() - start, interpreter
+
+
+def main():
+    fib_n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    ack_n = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    programs = [
+        (f"fib({fib_n})", FIB.replace("{n}", str(fib_n))),
+        (f"ack(2, {ack_n})", ACKERMANN.replace("{n}", str(ack_n))),
+        ("twice(1/1.0)", MIXED),
+    ]
+    for name, source_code in programs:
+        plain_time, plain = run(source_code, 0)
+        memo_time, memo = run(source_code, InterpreterRexi.DEFAULT_MEMO_SIZE)
+        assert plain.output_buffer == memo.output_buffer, (plain.output_buffer, memo.output_buffer)
+        stats = next(iter(memo.memo_stats().values()))
+        print(f"{name:12} = {plain.output_buffer[0]:>6}  plain {plain_time * 1e3:9.1f} ms  "
+              f"memoized {memo_time * 1e3:7.2f} ms  "
+              f"({stats['hits']} hits, {stats['misses']} misses, {stats['size']} cached)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Full reparse against incremental reparse after a one-character edit.
+
+The script has a few thousand lines of functions and statements. A
+Document parses it once, then each edit only lexes and parses the
+declaration it touches. update() is the path of an editor that only
+hands over its whole text: it first finds the changed range.
+
+    python benchmarks/bench_incremental.py [functions] [edits]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import CompilerRexi  # noqa: E402
+import IncrementalRexi  # noqa: E402
+
+
+def generate(functions):
+    parts = []
+    for index in range(functions):
+        parts.append(f"""function f{index}(IN x, IR y) IR {{
+    IR total = y;
+    while x > 0 {{
+        total = total + x * 2;
+        x = x - 1;
+    }}
+    if total > 100 then {{ return total / 2; }} end
+    return total;
+}}
+IR r{index} = f{index}({index}, 1.5);
+output r{index};
+""")
+    return "".join(parts)
+
+
+def best(function, repeats=5):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    edits = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    source_code = generate(functions)
+    session = CompilerRexi.get_session()
+    print(f"{source_code.count(chr(10))} lines, {len(source_code)} characters")
+
+    full = best(lambda: session.parse(source_code))
+    document = IncrementalRexi.Document(source_code)
+    print(f"{'full parse':22} {full * 1e3:>9.2f} ms")
+
+    # Alternately change one digit in a function body in the middle of the script
+    position = source_code.index("x * 2", len(source_code) // 2) + 4
+    start = time.perf_counter()
+    for edit in range(edits):
+        document.edit(position, position + 1, "3" if edit % 2 == 0 else "2")
+    incremental = (time.perf_counter() - start) / edits
+    print(f"{'incremental edit':22} {incremental * 1e3:>9.2f} ms  ({full / incremental:.0f}x faster)")
+
+    texts = [source_code[:position] + digit + source_code[position + 1:] for digit in "32"]
+    start = time.perf_counter()
+    for edit in range(edits):
+        document.update(texts[edit % 2])
+    updated = (time.perf_counter() - start) / edits
+    print(f"{'update(text)':22} {updated * 1e3:>9.2f} ms  ({full / updated:.0f}x faster)")
+
+    # The last update() used texts[(edits - 1) % 2]
+    expected = CompilerRexi.compile_code(texts[(edits - 1) % 2])
+    assert document.compile() == expected
+    print(f"segments {len(document.segments)}, stats {document.stats}")
+
+
+if __name__ == "__main__":
+    main()
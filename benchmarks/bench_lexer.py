@@ -0,0 +1,52 @@
+"""Tokens per second of InterpreterRexi.Lexer on generated sources.
+
+    python benchmarks/bench_lexer.py [megabytes]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import InterpreterRexi  # noqa: E402
+
+LINES = (
+    'IN total_{i} = (x{i} + 3.25) * 17 - y / 4;\n',
+    'STR message_{i} = "chaine numero {i}";\n',
+    'if total_{i} >= 17 then output "ok"; else output total_{i}; end\n',
+    'BINARY drapeau_{i} = YES;\n',
+)
+
+
+def make_source(megabytes):
+    target = int(megabytes * 1024 * 1024)
+    parts = []
+    size = 0
+    i = 0
+    while size < target:
+        line = LINES[i % len(LINES)].format(i=i)
+        parts.append(line)
+        size += len(line)
+        i += 1
+    return "".join(parts)
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+    source_code = make_source(megabytes)
+
+    start = time.perf_counter()
+    lexer = InterpreterRexi.Lexer(source_code)
+    count = 0
+    while lexer.get_next_token().type != 'EOF':
+        count += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"source:  {len(source_code) / 1e6:8.2f} MB, {count} tokens")
+    print(f"time:    {elapsed:8.3f} s")
+    print(f"rate:    {count / elapsed / 1e6:8.3f} M tokens/s, "
+          f"{len(source_code) / elapsed / 1e6:6.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""IR size and VM execution time with and without the optimizer.
+
+    python benchmarks/bench_optimizer.py [repetitions]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import CompilerRexi  # noqa: E402
+import OptimizerRexi  # noqa: E402
+import VMRexi  # noqa: E402
+
+CORPUS = {
+    "constants": "\n".join(
+        f"IN c{i} = {i} * 60 * 60 + 24 * 7 - {i} / 2 * 2;" for i in range(300)
+    ) + "\noutput c299;",
+    "summing loop": """
+        IN i = 0;
+        IN total = 0;
+        while i < 20000 {
+            total = total + i * 2 + i;
+            i = i + 1;
+        }
+        output total;
+    """,
+    "nested loops": """
+        IN i = 0;
+        IN count = 0;
+        while i < 150 {
+            IN j = 0;
+            while j < 150 {
+                if i + j > 150 then { count = count + 1; } end
+                j = j + 1;
+            }
+            i = i + 1;
+        }
+        output count;
+    """,
+    "fib": """
+        function fib(IN n) IN {
+            if n < 2 then { return n; } end
+            return fib(n - 1) + fib(n - 2);
+        }
+        output fib(18);
+    """,
+}
+
+
+def run_time(program, repetitions):
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        result = VMRexi.VM(program).run()
+    return (time.perf_counter() - start) / repetitions, result
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'program':14} {'IR before':>10} {'IR after':>9} {'run before':>12} {'run after':>11}")
+    for name, source_code in CORPUS.items():
+        optimizer = OptimizerRexi.Optimizer()
+        plain = CompilerRexi.compile_code(source_code)
+        optimized = CompilerRexi.compile_code(source_code, [optimizer])
+        plain_time, plain_result = run_time(VMRexi.load(plain), repetitions)
+        optimized_time, optimized_result = run_time(VMRexi.load(optimized), repetitions)
+        assert plain_result == optimized_result, name
+        print(f"{name:14} {len(plain):>10} {len(optimized):>9} "
+              f"{plain_time * 1e3:>9.2f} ms {optimized_time * 1e3:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
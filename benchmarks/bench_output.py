@@ -0,0 +1,79 @@
+"""Memory and time of a program printing many lines, by output sink.
+
+The default list keeps every line until the end of the run; the sinks of
+OutputRexi stream them and keep memory constant. Peak memory is measured
+with tracemalloc in a first pass, and times, best of several interleaved
+runs, in a second one without it.
+
+    python benchmarks/bench_output.py [lines] [repeats]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import InterpreterRexi  # noqa: E402
+import OutputRexi  # noqa: E402
+
+
+def program(lines):
+    return f"""
+IN i = 0;
+while i < {lines} {{
+    output i * 7;
+    i = i + 1;
+}}
+"""
+
+
+def sinks(devnull):
+    return [
+        ("list", lambda: None),
+        ("ring buffer (100)", lambda: OutputRexi.RingBuffer(100)),
+        ("file (devnull)", lambda: OutputRexi.FileSink(devnull)),
+        ("callback", lambda: OutputRexi.CallbackSink(lambda line: None)),
+        ("batches of 1000", lambda: OutputRexi.BatchSink(lambda text: None)),
+    ]
+
+
+def run(source_code, output):
+    result = InterpreterRexi.execute_rexi(source_code, output=output)
+    assert 'error' not in result, result['error']
+    if output is not None:
+        output.flush()
+    return result
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    source_code = program(lines)
+
+    with open(os.devnull, "w") as devnull:
+        variants = sinks(devnull)
+        peak = {}
+        for name, make in variants:
+            tracemalloc.start()
+            result = run(source_code, make())
+            peak[name] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            del result
+
+        best = {name: float("inf") for name, _ in variants}
+        # Interleave the runs so that machine noise hits every variant alike
+        for _ in range(repeats):
+            for name, make in variants:
+                output = make()
+                start = time.perf_counter()
+                run(source_code, output)
+                best[name] = min(best[name], time.perf_counter() - start)
+
+    print(f"{lines} output lines, best of {repeats}")
+    for name, _ in variants:
+        print(f"{name:20} {best[name]:>7.3f} s  peak {peak[name] / 1e6:>7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Parse time of CompilerRexi as the number of statements grows.
+
+Parses programs of 10k, 100k and 1M top-level statements, then a function
+body of the same size, and checks that the time per statement stays
+roughly constant (linear total time).
+
+    python benchmarks/bench_parse_scaling.py [sizes...]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import CompilerRexi  # noqa: E402
+
+# Largest accepted ratio between the per-statement times of two sizes
+MAX_RATIO = 3.0
+
+
+def top_level_program(statements):
+    return "".join(f"IN x{i} = x{i // 2} + {i};\n" for i in range(statements))
+
+
+def function_program(statements):
+    return "function f() IN {\n" + top_level_program(statements) + "return 0;\n}\n"
+
+
+def parse_time(session, source_code):
+    start = time.perf_counter()
+    ast = session.parse(source_code)
+    elapsed = time.perf_counter() - start
+    assert ast is not None
+    return elapsed
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    session = CompilerRexi.get_session()
+    for label, make_program in (("top level", top_level_program),
+                                ("function body", function_program)):
+        per_statement = []
+        for statements in sizes:
+            elapsed = parse_time(session, make_program(statements))
+            per_statement.append(elapsed / statements)
+            print(f"{label:14} {statements:>9} statements: {elapsed:8.2f} s, "
+                  f"{elapsed / statements * 1e6:6.2f} us/statement")
+        ratio = max(per_statement) / min(per_statement)
+        assert ratio < MAX_RATIO, f"{label}: per-statement time grew {ratio:.1f}x"
+    print("parse time is linear in the number of statements")
+
+
+if __name__ == "__main__":
+    main()
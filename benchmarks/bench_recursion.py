@@ -0,0 +1,91 @@
+"""Deep recursion stress test.
+
+- VM, non-tail recursion: sum(n) = n + sum(n - 1) on the VM frame stack
+- VM, tail recursion: loop(n, acc) through TAILCALL (constant stack)
+- interpreter, tail recursion: the same loop through the call() trampoline
+- interpreter, non-tail recursion: sum(n) on Python's stack, whose limit
+  interpret() raises for InterpreterRexi.MAX_CALL_DEPTH calls; measured at
+  that depth at most
+- deep expressions: 1 + 1 + ... compiled and interpreted without recursion
+
+Each case is far beyond Python's recursion limit. Times include
+compilation or parsing.
+
+    python benchmarks/bench_recursion.py [depth]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import InterpreterRexi  # noqa: E402
+import OptimizerRexi  # noqa: E402
+import RegAllocRexi  # noqa: E402
+import VMRexi  # noqa: E402
+
+SUM = """
+function sum(IN n) IN {
+    if n == 0 then { return 0; } end
+    return n + sum(n - 1);
+}
+output sum({n});
+"""
+
+LOOP_COMPILED = """
+function loop(IN n, IN acc) IN {
+    if n == 0 then { return acc; } end
+    return loop(n - 1, acc + n);
+}
+output loop({n}, 0);
+"""
+
+# Les blocs if de l'interpréteur n'ont pas d'accolades
+SUM_INTERPRETED = """
+function sum(IN n) IN {
+    if n == 0 then return 0; end
+    return n + sum(n - 1);
+}
+output sum({n});
+"""
+
+LOOP_INTERPRETED = """
+function loop(IN n, IN acc) IN {
+    if n == 0 then return acc; end
+    return loop(n - 1, acc + n);
+}
+output loop({n}, 0);
+"""
+
+
+def measure(name, depth, run):
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    assert 'error' not in result, (name, result)
+    expected = str(depth * (depth + 1) // 2) if "expression" not in name else str(depth)
+    assert result['output'] == [expected], (name, result['output'])
+    print(f"{name:31} depth {depth:>9,}  {elapsed:7.2f} s  ({depth / elapsed:,.0f} levels/s)")
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    print(f"Python recursion limit: {sys.getrecursionlimit()}")
+    passes = [OptimizerRexi.Optimizer(), RegAllocRexi.RegisterAllocator()]
+    measure("VM, non-tail recursion", depth,
+            lambda: VMRexi.execute(SUM.replace("{n}", str(depth)), passes))
+    measure("VM, tail recursion", depth,
+            lambda: VMRexi.execute(LOOP_COMPILED.replace("{n}", str(depth)), passes))
+    measure("interpreter, tail recursion", depth,
+            lambda: InterpreterRexi.execute_rexi(LOOP_INTERPRETED.replace("{n}", str(depth))))
+    interpreted_depth = min(depth, InterpreterRexi.MAX_CALL_DEPTH - 1)
+    measure("interpreter, non-tail recursion", interpreted_depth,
+            lambda: InterpreterRexi.execute_rexi(SUM_INTERPRETED.replace("{n}", str(interpreted_depth))))
+    expression = "output " + " + ".join(["1"] * depth) + ";"
+    measure("VM, deep expression", depth, lambda: VMRexi.execute(expression))
+    measure("interpreter, deep expression", depth,
+            lambda: InterpreterRexi.execute_rexi(expression))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Frame sizes and VM execution time with and without register allocation.
+
+The generated program is compiled without the optimizer, which would fold
+it to constants.
+
+    python benchmarks/bench_regalloc.py [statements]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import CompilerRexi  # noqa: E402
+import RegAllocRexi  # noqa: E402
+import VMRexi  # noqa: E402
+
+
+def generate(statements):
+    lines = ["IN x0 = 1;"]
+    for i in range(1, statements):
+        lines.append(f"IN x{i} = x{i - 1} * 3 - x{i // 2} * 2 + {i % 7};")
+    lines.append(f"output x{statements - 1} > 0;")
+    return "\n".join(lines)
+
+
+def run(program):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = VMRexi.VM(program).run()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    source_code = generate(statements)
+    allocator = RegAllocRexi.RegisterAllocator()
+    plain = VMRexi.load(CompilerRexi.compile_code(source_code))
+    start = time.perf_counter()
+    allocated = VMRexi.load(CompilerRexi.compile_code(source_code, [allocator]))
+    print(f"{statements} statements, {allocator.report()} "
+          f"(compile with allocation: {time.perf_counter() - start:.2f} s)")
+
+    plain_time, plain_peak, plain_result = run(plain)
+    allocated_time, allocated_peak, allocated_result = run(allocated)
+    assert plain_result == allocated_result
+    print(f"{'':12} {'frame size':>10} {'run':>10} {'peak memory':>12}")
+    print(f"{'temps':12} {plain.frame_size:>10} {plain_time * 1e3:>7.2f} ms {plain_peak / 1024:>9.1f} KB")
+    print(f"{'registers':12} {allocated.frame_size:>10} {allocated_time * 1e3:>7.2f} ms "
+          f"{allocated_peak / 1024:>9.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Variable access through resolved slots and symbol lookup at depth.
+
+- interpreter: statements per second on variable-heavy code, after the
+  one-time Resolver pass
+- SymbolTable.lookup of a global name under 1 to 1000 nested scopes,
+  which no longer depends on the depth
+
+    python benchmarks/bench_scopes.py [statements]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import CompilerRexi  # noqa: E402
+import InterpreterRexi  # noqa: E402
+
+
+def interpreter_throughput(statements):
+    lines = ["IN a = 1;", "IN b = 2;"]
+    lines += [f"IN v{i % 50} = a + b * {i} - a + b;" for i in range(50)]
+    lines += [f"v{i % 50} = v{(i + 1) % 50} + a - b;" for i in range(statements)]
+    tree = InterpreterRexi.Parser(InterpreterRexi.Lexer("\n".join(lines))).parse()
+
+    start = time.perf_counter()
+    names = InterpreterRexi.Resolver().resolve(tree)
+    resolve_time = time.perf_counter() - start
+
+    best = None
+    for _ in range(5):
+        interpreter = InterpreterRexi.Interpreter()
+        interpreter.interpret(tree)
+        start = time.perf_counter()
+        interpreter.visit(tree)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"interpreter: {len(names)} globals, resolve {resolve_time * 1e3:.1f} ms, "
+          f"{statements / best:,.0f} statements/s")
+
+
+def lookup_time(depth, lookups=200000):
+    table = CompilerRexi.SymbolTable()
+    table.declare("counter", "IN")
+    for level in range(depth):
+        table.enter_scope()
+        table.declare(f"local{level}", "IN")
+    start = time.perf_counter()
+    for _ in range(lookups):
+        table.lookup("counter")
+    return (time.perf_counter() - start) / lookups
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    interpreter_throughput(statements)
+    for depth in (1, 10, 100, 1000):
+        print(f"SymbolTable.lookup at depth {depth:>4}: {lookup_time(depth) * 1e9:6.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
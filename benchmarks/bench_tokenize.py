@@ -0,0 +1,70 @@
+"""Streaming tokenization of a large generated .rexi file.
+
+Reports tokens per second, then the peak memory allocated while scanning
+files of two sizes: it stays at the size of a few chunks whatever the
+size of the file.
+
+    python benchmarks/bench_tokenize.py [megabytes]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import TokenizerRexi  # noqa: E402
+
+LINES = (
+    'IN total_{i} = (x{i} + 3.25) * 17 - y / 4;\n',
+    'STR message_{i} = "chaine numero {i}"; // commentaire\n',
+    'while total_{i} >= 17 {{ total_{i} = total_{i} - 1; }}\n',
+    'output calcul(total_{i}, {i});\n',
+)
+
+
+def write_source(path, megabytes):
+    target = int(megabytes * 1024 * 1024)
+    size = 0
+    i = 0
+    with open(path, "w", encoding="utf-8") as file:
+        while size < target:
+            line = LINES[i % len(LINES)].format(i=i)
+            file.write(line)
+            size += len(line)
+            i += 1
+    return size
+
+
+def peak_memory(path):
+    """Peak traced allocation while tokenizing a file"""
+    tracemalloc.start()
+    for _ in TokenizerRexi.tokenize_file(path):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 16
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "generated.rexi")
+        size = write_source(path, megabytes)
+        start = time.perf_counter()
+        count = 0
+        for _ in TokenizerRexi.tokenize_file(path):
+            count += 1
+        elapsed = time.perf_counter() - start
+        print(f"file:         {size / 1e6:8.2f} MB, {count} tokens")
+        print(f"rate:         {count / elapsed / 1e6:8.3f} M tokens/s")
+
+        # Tracing slows allocation down a lot: measure memory on smaller files
+        for small in (0.5, 2):
+            write_source(path, small)
+            print(f"peak memory:  {peak_memory(path) / 1024:8.1f} KiB for a {small} MB file")
+
+
+if __name__ == "__main__":
+    main()
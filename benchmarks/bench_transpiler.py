@@ -0,0 +1,66 @@
+"""Recursive fib on the VM and as transpiled Python.
+
+Also reports the cost of a compile_rexi call that hits the code cache, and
+first checks that a function updates a global declared in a nested block.
+
+    python benchmarks/bench_transpiler.py [n]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import CompilerRexi  # noqa: E402
+import TranspilerRexi  # noqa: E402
+import VMRexi  # noqa: E402
+
+PROGRAM = """
+function fib(IN n) IN {
+    if n < 2 then { return n; } end
+    return fib(n - 1) + fib(n - 2);
+}
+output fib(%d);
+"""
+
+# x is a global declared inside an if: bump() must update it, not a local
+NESTED_GLOBAL = """
+function bump(IN d) IN { x = x + d; return x; }
+if 1 < 2 then { IN x = 10; } end
+output bump(5);
+"""
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 22
+    source_code = PROGRAM % n
+    nested = TranspilerRexi.execute(NESTED_GLOBAL)
+    assert nested == VMRexi.execute(NESTED_GLOBAL) == {'output': ['15'], 'variables': {'x': 15}}, nested
+
+    program = VMRexi.load(CompilerRexi.compile_code(source_code))
+    start = time.perf_counter()
+    vm_result = VMRexi.VM(program).run()
+    vm_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    code = TranspilerRexi.compile_rexi(source_code)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    TranspilerRexi.compile_rexi(source_code)
+    warm = time.perf_counter() - start
+
+    start = time.perf_counter()
+    python_result = TranspilerRexi.run_code(code)
+    python_time = time.perf_counter() - start
+    assert vm_result == python_result, (vm_result, python_result)
+
+    print(f"fib({n}) = {python_result['output'][0]}")
+    print(f"vm:                 {vm_time * 1e3:9.2f} ms")
+    print(f"transpiled python:  {python_time * 1e3:9.2f} ms")
+    print(f"speedup:            {vm_time / python_time:9.1f}x")
+    print(f"compile_rexi cold:  {cold * 1e3:9.3f} ms")
+    print(f"compile_rexi cached:{warm * 1e6:9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Elementwise TAB expressions against the same operations written in Python.
+
+The Rexi program runs each operator once over whole arrays, so its time
+should stay close to the reference: the same calls made directly on NumPy
+arrays (or with map() over array.array when NumPy is missing). The plain
+Python loop shows what an element loop costs.
+
+    python benchmarks/bench_vectorized.py [elements]
+"""
+import array
+import operator
+import os
+import sys
+import time
+from itertools import repeat
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import ArrayRexi  # noqa: E402
+import InterpreterRexi  # noqa: E402
+import VMRexi  # noqa: E402
+
+numpy = ArrayRexi.numpy
+
+
+def program(elements):
+    # Sized declarations and assignments: the syntax shared by both front ends
+    return f"""
+IR a[{elements}];
+IR b[{elements}];
+IR c[{elements}];
+b = a + 1.5;
+c = a * 2.0 + b / 3.0 - 1.0;
+output sum(c);
+output max(c > 0.0);
+"""
+
+
+def reference(elements):
+    """Same operations as the Rexi program, called from Python"""
+    if numpy is not None:
+        a = numpy.zeros(elements)
+        b = a + 1.5
+        c = a * 2.0 + b / 3.0 - 1.0
+        return [str(float(c.sum())), str(bool((c > 0.0).max()))]
+    a = array.array('d', [0.0]) * elements
+    b = array.array('d', map(operator.add, a, repeat(1.5)))
+    c = array.array('d', map(operator.mul, a, repeat(2.0)))
+    c = array.array('d', map(operator.add, c, array.array('d', map(operator.truediv, b, repeat(3.0)))))
+    c = array.array('d', map(operator.sub, c, repeat(1.0)))
+    return [str(sum(c)), str(bool(max(array.array('b', map(operator.gt, c, repeat(0.0))))))]
+
+
+def python_loop(elements):
+    """Element-by-element loop over Python lists"""
+    a = [0.0] * elements
+    b = [x + 1.5 for x in a]
+    c = [a[i] * 2.0 + b[i] / 3.0 - 1.0 for i in range(elements)]
+    return [str(sum(c)), str(max(x > 0.0 for x in c))]
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main():
+    elements = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    source_code = program(elements)
+    backend = "numpy" if numpy is not None else "array"
+    print(f"{elements} elements, {backend} backend")
+
+    reference_time, expected = timed(lambda: reference(elements))
+    print(f"{'reference':14} {reference_time:>8.3f} s")
+    for name, run in [
+        ("interpreter", lambda: InterpreterRexi.execute_rexi(source_code)['output']),
+        ("VM", lambda: VMRexi.execute(source_code)['output']),
+        ("python loop", lambda: python_loop(elements)),
+    ]:
+        elapsed, output = timed(run)
+        assert output == expected, output
+        print(f"{name:14} {elapsed:>8.3f} s  ({elapsed / reference_time:.2f}x reference)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ from cx_Freeze import setup, Executable
 
 
 # Inclure les fichiers supplémentaires (comme reponces.txt et icone.ico)
-files = ['CompilerRexi.py', 'InterpreterRexi.py' , 'parser.out' ,'parsetab.py']  # Ajouter ici les fichiers nécessaires
+files = ['CompilerRexi.py', 'InterpreterRexi.py', 'TokenizerRexi.py', 'ArrayRexi.py', 'IncrementalRexi.py', 'RunnerRexi.py', 'OutputRexi.py', 'parser.out' ,'parsetab.py']  # Ajouter ici les fichiers nécessaires
 
 setup(
     name="Rexi IDE",
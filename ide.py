@@ -1,23 +1,17 @@
 import os
+import multiprocessing
 import customtkinter as ctk
 from tkinter import filedialog, Listbox, END
 from PIL import Image
 from customtkinter import CTkImage
-import InterpreterRexi
-import CompilerRexi
+import RunnerRexi
 
-# Initialize CustomTkinter
-ctk.set_appearance_mode("dark")  # Modes: "dark", "light"
-ctk.set_default_color_theme("blue")  # Themes: "blue", "green", "dark-blue"
-
-# Create the main application window
-app = ctk.CTk()
-app.title("Rexi Language Editor")
-app.geometry("1000x600")
+# Intervalle de lecture des résultats de l'exécution en cours (ms)
+POLL_INTERVAL = 50
+# Lignes gardées dans la console : les plus anciennes sont effacées
+MAX_CONSOLE_LINES = 5000
 
 current_directory = ""
-switch_var = ctk.BooleanVar(value=False)  # False = désactivé par défaut
-dynamic_text = ctk.StringVar(value="Interpreter Mode")
 # Functions
 def open_file():
     file_path = filedialog.askopenfilename(filetypes=[("Rexi Files", "*.rexi"), ("All Files", "*.*")])
@@ -44,17 +38,65 @@ def save_file():
 
 def run_code():
     source_code = text_editor.get("1.0", END).strip()  # Get all text from the editor
-    console.insert(END, "Running Rexi code...\n\n")  # Log to console
-    if source_code:
-        if not switch_var.get() :
-            out = InterpreterRexi.Run(source_code)  # Appel pour le mode interpréteur
-        else:  # Mode compilateur
-            out = CompilerRexi.Run(source_code)  # Exemple d'appel pour le compilateur
-        console.insert(END, f"Code output:\n{out}")
+    if runner.running:
+        console.insert(END, "A program is already running.\n")
+        return
+    if not source_code:
+        console.insert(END, "No code to run.")
+        console.yview_moveto(1.0)
+        return
+    try:
+        time_limit = float(time_limit_var.get() or 0)
+        max_steps = int(max_steps_var.get()) if max_steps_var.get() else None
+    except ValueError:
+        console.insert(END, "Invalid time or step limit.\n")
+        return
+    console.insert(END, "Running Rexi code...\n\nCode output:\n")  # Log to console
+    # Exécution dans un processus de travail : l'éditeur reste utilisable
+    if not switch_var.get():
+        job = runner.submit(RunnerRexi.interpret, source_code, max_steps, time_limit=time_limit)
+    else:  # Mode compilateur ; ne réanalyse que les déclarations modifiées
+        job = runner.submit(RunnerRexi.compile_document, source_code, time_limit=time_limit)
+    run_button.configure(state="disabled")
+    stop_button.configure(state="normal")
+    app.after(POLL_INTERVAL, poll_execution, job)
+
+def poll_execution(job):
+    if job != runner.job:  # Exécution arrêtée entre-temps
+        return
+    messages = runner.poll()
+    # Les sorties arrivent par lots pendant l'exécution
+    for kind, text in messages:
+        if kind in ('output', 'done'):
+            console.insert(END, text)
+        else:
+            console.insert(END, f"{text}\n")
+    if messages:
+        trim_console()
         console.yview_moveto(1.0)
+    if runner.running:
+        app.after(POLL_INTERVAL, poll_execution, job)
     else:
-        console.insert(END, "No code to run.")
+        execution_finished()
+
+def trim_console():
+    lines = int(console.index("end-1c").split(".")[0])
+    if lines > MAX_CONSOLE_LINES:
+        console.delete("1.0", f"{lines - MAX_CONSOLE_LINES + 1}.0")
+
+def stop_code():
+    if runner.stop():
+        console.insert(END, "Execution stopped.\n")
         console.yview_moveto(1.0)
+    execution_finished()
+
+def execution_finished():
+    run_button.configure(state="normal")
+    stop_button.configure(state="disabled")
+
+def close_app():
+    runner.close()
+    app.destroy()
 
 def load_directory():
     global current_directory
@@ -98,60 +140,95 @@ def open_selected_file():
         console.insert(END, f"Error: {e}\n")
 
 
-# Buttons
-button_frame = ctk.CTkFrame(app, corner_radius=10 )
-button_frame.pack( fill="x" ,padx=20, pady=5 )
+# Les processus de travail réimportent ce module : la fenêtre n'est créée que dans le processus principal
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+
+    # Initialize CustomTkinter
+    ctk.set_appearance_mode("dark")  # Modes: "dark", "light"
+    ctk.set_default_color_theme("blue")  # Themes: "blue", "green", "dark-blue"
+
+    # Create the main application window
+    app = ctk.CTk()
+    app.title("Rexi Language Editor")
+    app.geometry("1000x600")
+
+    switch_var = ctk.BooleanVar(value=False)  # False = désactivé par défaut
+    dynamic_text = ctk.StringVar(value="Interpreter Mode")
+    time_limit_var = ctk.StringVar(value=f"{RunnerRexi.DEFAULT_TIME_LIMIT:g}")
+    max_steps_var = ctk.StringVar(value=str(RunnerRexi.DEFAULT_MAX_STEPS))
+    # Processus de travail qui exécutent les programmes
+    runner = RunnerRexi.ExecutionPool()
+
+    # Buttons
+    button_frame = ctk.CTkFrame(app, corner_radius=10 )
+    button_frame.pack( fill="x" ,padx=20, pady=5 )
+
+    mode_switch = ctk.CTkSwitch(button_frame,text = "", variable=switch_var, onvalue=True, offvalue=False, command=toggle_mode)
+    mode_switch.pack(side="left", padx=0)
+    on = ctk.CTkLabel(button_frame, textvariable = dynamic_text)
+    on.pack(side = "left" , padx=0)
+
+    # Budget d'une exécution : durée maximale (s) et étapes (itérations et appels) de l'interpréteur
+    time_limit_label = ctk.CTkLabel(button_frame, text="Time (s)")
+    time_limit_label.pack(side="left", padx=(15, 2))
+    time_limit_entry = ctk.CTkEntry(button_frame, textvariable=time_limit_var, width=50, height=20)
+    time_limit_entry.pack(side="left")
+    max_steps_label = ctk.CTkLabel(button_frame, text="Steps")
+    max_steps_label.pack(side="left", padx=(10, 2))
+    max_steps_entry = ctk.CTkEntry(button_frame, textvariable=max_steps_var, width=90, height=20)
+    max_steps_entry.pack(side="left")
+
+    stop_button = ctk.CTkButton(button_frame, text="Stop", command=stop_code ,width=20 , height= 20, state="disabled")
+    stop_button.pack(side="right", padx=5)
 
-mode_switch = ctk.CTkSwitch(button_frame,text = "", variable=switch_var, onvalue=True, offvalue=False, command=toggle_mode)
-mode_switch.pack(side="left", padx=0)
-on = ctk.CTkLabel(button_frame, textvariable = dynamic_text)
-on.pack(side = "left" , padx=0)
-run_button = ctk.CTkButton(button_frame, text="Run Code", command=run_code ,width=20 , height= 20)
-run_button.pack(side="right", padx=5)
+    run_button = ctk.CTkButton(button_frame, text="Run Code", command=run_code ,width=20 , height= 20)
+    run_button.pack(side="right", padx=5)
 
-save_button = ctk.CTkButton(button_frame, text="Save File", command=save_file ,width=20 , height= 20)
-save_button.pack(side="right", padx=5)
+    save_button = ctk.CTkButton(button_frame, text="Save File", command=save_file ,width=20 , height= 20)
+    save_button.pack(side="right", padx=5)
 
-open_button = ctk.CTkButton(button_frame, text="Open File", command=open_file ,width=20 , height= 20)
-open_button.pack(side="right", padx=5)
+    open_button = ctk.CTkButton(button_frame, text="Open File", command=open_file ,width=20 , height= 20)
+    open_button.pack(side="right", padx=5)
 
-# Layout
-# Sidebar for File Explorer
-sidebar = ctk.CTkFrame(app, width=200, corner_radius=10)
-sidebar.pack(side="left", fill="y")
+    # Layout
+    # Sidebar for File Explorer
+    sidebar = ctk.CTkFrame(app, width=200, corner_radius=10)
+    sidebar.pack(side="left", fill="y")
 
 
-file_list_label = ctk.CTkLabel(sidebar, text="File Explorer" )
-file_list_label.pack(pady=2)
+    file_list_label = ctk.CTkLabel(sidebar, text="File Explorer" )
+    file_list_label.pack(pady=2)
 
-file_list = Listbox(sidebar, height=35, width=40, bg="#333333", fg="white", selectbackground="#555555", highlightbackground="#444444",border = 0)
-file_list.pack(pady=10, padx=5)
+    file_list = Listbox(sidebar, height=35, width=40, bg="#333333", fg="white", selectbackground="#555555", highlightbackground="#444444",border = 0)
+    file_list.pack(pady=10, padx=5)
 
 
-open_file_button = ctk.CTkButton(sidebar, text="Open selected", command=open_selected_file ,width=20 , height= 20)
-open_file_button.pack(pady=3, padx=10)
+    open_file_button = ctk.CTkButton(sidebar, text="Open selected", command=open_selected_file ,width=20 , height= 20)
+    open_file_button.pack(pady=3, padx=10)
 
-load_dir_button = ctk.CTkButton(sidebar, text="Load directory", command=load_directory ,width=20 , height= 20)
-load_dir_button.pack(pady=3, padx=10)
+    load_dir_button = ctk.CTkButton(sidebar, text="Load directory", command=load_directory ,width=20 , height= 20)
+    load_dir_button.pack(pady=3, padx=10)
 
-logo_image = Image.open(r"C:\Users\othma\Pictures\logoo.jpg")
-logo_photo = CTkImage(logo_image ,size=(100, 100))
-logo_label = ctk.CTkLabel(sidebar, image=logo_photo, text="")
-logo_label.image = logo_photo  # Keep a reference to avoid garbage collection
-logo_label.pack(padx=10)
+    logo_image = Image.open(r"C:\Users\othma\Pictures\logoo.jpg")
+    logo_photo = CTkImage(logo_image ,size=(100, 100))
+    logo_label = ctk.CTkLabel(sidebar, image=logo_photo, text="")
+    logo_label.image = logo_photo  # Keep a reference to avoid garbage collection
+    logo_label.pack(padx=10)
 
-# Main Text Editor
-text_editor = ctk.CTkTextbox(app, width=550, height=390, corner_radius=10)
-text_editor.pack(pady=10, padx=20, side="top", expand=True, fill="both")
+    # Main Text Editor
+    text_editor = ctk.CTkTextbox(app, width=550, height=390, corner_radius=10)
+    text_editor.pack(pady=10, padx=20, side="top", expand=True, fill="both")
 
-# Console/Output Area
-console_label = ctk.CTkLabel(app, text="Console Output")
-console_label.pack(anchor="w", padx=20)
+    # Console/Output Area
+    console_label = ctk.CTkLabel(app, text="Console Output")
+    console_label.pack(anchor="w", padx=20)
 
-console = ctk.CTkTextbox(app, width=600, height=120, corner_radius=10, state="normal")
-console.pack(pady=5, padx=20)
+    console = ctk.CTkTextbox(app, width=600, height=120, corner_radius=10, state="normal")
+    console.pack(pady=5, padx=20)
 
 
 
-# Run the application
-app.mainloop()
+    # Run the application
+    app.protocol("WM_DELETE_WINDOW", close_app)
+    app.mainloop()